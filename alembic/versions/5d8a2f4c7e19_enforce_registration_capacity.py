@@ -0,0 +1,52 @@
+"""enforce registration capacity
+
+Revision ID: 5d8a2f4c7e19
+Revises: c4a81f5e6d27
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5d8a2f4c7e19"
+down_revision: Union[str, Sequence[str], None] = "c4a81f5e6d27"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("ALTER TYPE jobkind ADD VALUE IF NOT EXISTS 'RECONCILE_REGISTERED_COUNTS'")
+    op.execute(
+        """
+        DELETE FROM event_registrations AS duplicate
+        USING event_registrations AS original
+        WHERE duplicate.event_id = original.event_id
+          AND duplicate.user_id = original.user_id
+          AND (duplicate.created_at, duplicate.id) > (original.created_at, original.id)
+        """
+    )
+    op.create_unique_constraint(
+        "uq_event_registrations_event_id_user_id",
+        "event_registrations",
+        ["event_id", "user_id"],
+    )
+    op.execute(
+        """
+        UPDATE events
+        SET registered_count = (
+            SELECT count(*) FROM event_registrations WHERE event_registrations.event_id = events.id
+        )
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Значение из enum в PostgreSQL не удаляется; оставшиеся задачи сверки просто удаляем.
+    op.execute("DELETE FROM jobs WHERE kind = 'RECONCILE_REGISTERED_COUNTS'")
+    op.drop_constraint("uq_event_registrations_event_id_user_id", "event_registrations", type_="unique")
@@ -0,0 +1,71 @@
+"""prevent room double booking
+
+Revision ID: 6a3e9c2d8f15
+Revises: 2c7f5a9e1b36
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "6a3e9c2d8f15"
+down_revision: Union[str, Sequence[str], None] = "2c7f5a9e1b36"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # btree_gist даёт GiST-классы операторов для равенства по uuid рядом с пересечением интервалов.
+    op.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")
+    op.add_column(
+        "events",
+        sa.Column(
+            "booked_during",
+            postgresql.TSRANGE(),
+            sa.Computed("tsrange(event_date + start_time, event_date + end_time, '[)')", persisted=True),
+            nullable=False,
+        ),
+    )
+    # Уже пересекающиеся брони автоматически не разрешить: миграция остановится и перечислит их для ручного разбора.
+    op.execute(
+        """
+        DO $$
+        DECLARE
+            conflicts text;
+        BEGIN
+            SELECT string_agg(first_event.id || ' / ' || second_event.id, ', ')
+            INTO conflicts
+            FROM events AS first_event
+            JOIN events AS second_event
+              ON second_event.room_id = first_event.room_id
+             AND second_event.id > first_event.id
+             AND second_event.booked_during && first_event.booked_during
+            WHERE first_event.status NOT IN ('REJECTED', 'CANCELLED')
+              AND second_event.status NOT IN ('REJECTED', 'CANCELLED');
+            IF conflicts IS NOT NULL THEN
+                RAISE EXCEPTION 'Overlapping room bookings must be resolved first: %', conflicts;
+            END IF;
+        END
+        $$
+        """
+    )
+    op.create_exclude_constraint(
+        "ex_events_room_id_booked_during",
+        "events",
+        ("room_id", "="),
+        ("booked_during", "&&"),
+        using="gist",
+        where="room_id IS NOT NULL AND status NOT IN ('REJECTED', 'CANCELLED')",
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint("ex_events_room_id_booked_during", "events", type_="exclude")
+    op.drop_column("events", "booked_during")
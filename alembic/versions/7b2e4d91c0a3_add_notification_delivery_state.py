@@ -0,0 +1,53 @@
+"""add telegram delivery state to notifications
+
+Revision ID: 7b2e4d91c0a3
+Revises: 3f1c9e7a2b54
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "7b2e4d91c0a3"
+down_revision: Union[str, Sequence[str], None] = "3f1c9e7a2b54"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+delivery_status_enum = sa.Enum("PENDING", "SENT", "FAILED", "SKIPPED", name="notificationdeliverystatus")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    delivery_status_enum.create(op.get_bind(), checkfirst=True)
+    op.add_column(
+        "notifications",
+        sa.Column("delivery_status", delivery_status_enum, server_default="PENDING", nullable=False),
+    )
+    op.add_column(
+        "notifications",
+        sa.Column("delivery_attempts", sa.Integer(), server_default="0", nullable=False),
+    )
+    op.add_column("notifications", sa.Column("delivered_at", sa.DateTime(timezone=True), nullable=True))
+    # Уведомления, созданные до появления доставки, в Telegram не отправляем.
+    op.execute("UPDATE notifications SET delivery_status = 'SKIPPED'")
+    op.create_index(
+        "ix_notifications_pending_delivery",
+        "notifications",
+        ["created_at"],
+        unique=False,
+        postgresql_where=sa.text("delivery_status = 'PENDING'"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_notifications_pending_delivery", table_name="notifications")
+    op.drop_column("notifications", "delivered_at")
+    op.drop_column("notifications", "delivery_attempts")
+    op.drop_column("notifications", "delivery_status")
+    delivery_status_enum.drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,41 @@
+"""unique event applications
+
+Revision ID: 8e6b3d1a9f42
+Revises: 5d8a2f4c7e19
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "8e6b3d1a9f42"
+down_revision: Union[str, Sequence[str], None] = "5d8a2f4c7e19"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(
+        """
+        DELETE FROM event_applications AS duplicate
+        USING event_applications AS original
+        WHERE duplicate.event_id = original.event_id
+          AND duplicate.applicant_id = original.applicant_id
+          AND (duplicate.created_at, duplicate.id) > (original.created_at, original.id)
+        """
+    )
+    op.create_unique_constraint(
+        "uq_event_applications_event_id_applicant_id",
+        "event_applications",
+        ["event_id", "applicant_id"],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint("uq_event_applications_event_id_applicant_id", "event_applications", type_="unique")
@@ -0,0 +1,52 @@
+"""room equipment jsonb
+
+Revision ID: 9b4d1e7c3a58
+Revises: 6a3e9c2d8f15
+Create Date: 2026-10-18 19:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "9b4d1e7c3a58"
+down_revision: Union[str, Sequence[str], None] = "6a3e9c2d8f15"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.alter_column(
+        "rooms",
+        "equipment",
+        existing_type=sa.JSON(),
+        type_=postgresql.JSONB(astext_type=sa.Text()),
+        existing_nullable=True,
+        postgresql_using="equipment::jsonb",
+    )
+    op.create_index(
+        "ix_rooms_equipment",
+        "rooms",
+        ["equipment"],
+        unique=False,
+        postgresql_using="gin",
+        postgresql_ops={"equipment": "jsonb_path_ops"},
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_rooms_equipment", table_name="rooms", postgresql_using="gin")
+    op.alter_column(
+        "rooms",
+        "equipment",
+        existing_type=postgresql.JSONB(astext_type=sa.Text()),
+        type_=sa.JSON(),
+        existing_nullable=True,
+        postgresql_using="equipment::json",
+    )
@@ -0,0 +1,81 @@
+"""add workload composite indexes
+
+Revision ID: a7e2c5d3f918
+Revises: f1a6d4c9b837
+Create Date: 2026-10-18 23:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a7e2c5d3f918"
+down_revision: Union[str, Sequence[str], None] = "f1a6d4c9b837"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index("ix_events_status_created_at_id", "events", ["status", "created_at", "id"], unique=False)
+    op.create_index("ix_events_status_event_date", "events", ["status", "event_date"], unique=False)
+    op.drop_index(op.f("ix_events_status"), table_name="events")
+
+    op.create_index(
+        "ix_notifications_user_id_unread",
+        "notifications",
+        ["user_id", "created_at", "id"],
+        unique=False,
+        postgresql_where=sa.text("is_read = false"),
+    )
+    # user_id покрыт префиксом (user_id, created_at, id), а по одному is_read индекс почти не избирателен.
+    op.drop_index(op.f("ix_notifications_user_id"), table_name="notifications")
+    op.drop_index(op.f("ix_notifications_is_read"), table_name="notifications")
+
+    op.create_index(
+        "ix_event_registrations_user_id_created_at_id",
+        "event_registrations",
+        ["user_id", "created_at", "id"],
+        unique=False,
+    )
+    # event_id покрыт префиксом уникальной пары (event_id, user_id).
+    op.drop_index(op.f("ix_event_registrations_user_id"), table_name="event_registrations")
+    op.drop_index(op.f("ix_event_registrations_event_id"), table_name="event_registrations")
+
+    op.create_index(
+        "ix_event_moderation_history_event_id_action_created_at",
+        "event_moderation_history",
+        ["event_id", "action", "created_at"],
+        unique=False,
+    )
+    op.drop_index(op.f("ix_event_moderation_history_event_id"), table_name="event_moderation_history")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index(
+        op.f("ix_event_moderation_history_event_id"),
+        "event_moderation_history",
+        ["event_id"],
+        unique=False,
+    )
+    op.drop_index("ix_event_moderation_history_event_id_action_created_at", table_name="event_moderation_history")
+
+    op.create_index(op.f("ix_event_registrations_event_id"), "event_registrations", ["event_id"], unique=False)
+    op.create_index(op.f("ix_event_registrations_user_id"), "event_registrations", ["user_id"], unique=False)
+    op.drop_index("ix_event_registrations_user_id_created_at_id", table_name="event_registrations")
+
+    op.create_index(op.f("ix_notifications_is_read"), "notifications", ["is_read"], unique=False)
+    op.create_index(op.f("ix_notifications_user_id"), "notifications", ["user_id"], unique=False)
+    op.drop_index(
+        "ix_notifications_user_id_unread",
+        table_name="notifications",
+        postgresql_where=sa.text("is_read = false"),
+    )
+
+    op.create_index(op.f("ix_events_status"), "events", ["status"], unique=False)
+    op.drop_index("ix_events_status_event_date", table_name="events")
+    op.drop_index("ix_events_status_created_at_id", table_name="events")
@@ -0,0 +1,51 @@
+"""add notification counters
+
+Revision ID: b3d8f2e6a147
+Revises: a7e2c5d3f918
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b3d8f2e6a147"
+down_revision: Union[str, Sequence[str], None] = "a7e2c5d3f918"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("ALTER TYPE jobkind ADD VALUE IF NOT EXISTS 'RECONCILE_NOTIFICATION_COUNTERS'")
+    op.create_table(
+        "notification_counters",
+        sa.Column("user_id", sa.Uuid(), nullable=False),
+        sa.Column("unread_count", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("id", sa.Uuid(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=True),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("user_id"),
+    )
+    # Начальные значения считаем по частичному индексу непрочитанных; дальше счётчики ведёт приложение.
+    op.execute(
+        """
+        INSERT INTO notification_counters (id, user_id, unread_count)
+        SELECT gen_random_uuid(), user_id, count(*)
+        FROM notifications
+        WHERE is_read = false
+        GROUP BY user_id
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("notification_counters")
+    # Значение из enum в PostgreSQL не удаляется; оставшиеся задачи сверки просто удаляем.
+    op.execute("DELETE FROM jobs WHERE kind = 'RECONCILE_NOTIFICATION_COUNTERS'")
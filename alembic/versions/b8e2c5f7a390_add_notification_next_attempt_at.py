@@ -0,0 +1,62 @@
+"""add next_attempt_at to telegram delivery state
+
+Revision ID: b8e2c5f7a390
+Revises: d4f9b2a7e615
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b8e2c5f7a390"
+down_revision: Union[str, Sequence[str], None] = "d4f9b2a7e615"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+PENDING_INDEXES = (
+    ("ix_notifications_pending_delivery", "notifications"),
+    ("ix_broadcast_notifications_pending_delivery", "broadcast_notifications"),
+    ("ix_broadcast_notification_receipts_pending_delivery", "broadcast_notification_receipts"),
+)
+
+
+def _create_pending_indexes(column_name: str) -> None:
+    for index_name, table_name in PENDING_INDEXES:
+        op.create_index(
+            index_name,
+            table_name,
+            [column_name],
+            unique=False,
+            postgresql_where=sa.text("delivery_status = 'PENDING'"),
+        )
+
+
+def _drop_pending_indexes() -> None:
+    for index_name, table_name in PENDING_INDEXES:
+        op.drop_index(index_name, table_name=table_name)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    _drop_pending_indexes()
+    # now() стабильна в пределах транзакции, поэтому PostgreSQL не переписывает таблицы: значение хранится как
+    # значение по умолчанию, а ожидающие доставки строки сразу доступны для отправки.
+    for _index_name, table_name in PENDING_INDEXES:
+        op.add_column(
+            table_name,
+            sa.Column("next_attempt_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        )
+    _create_pending_indexes("next_attempt_at")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _drop_pending_indexes()
+    for _index_name, table_name in PENDING_INDEXES:
+        op.drop_column(table_name, "next_attempt_at")
+    _create_pending_indexes("created_at")
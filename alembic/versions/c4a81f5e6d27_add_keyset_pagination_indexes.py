@@ -0,0 +1,35 @@
+"""add keyset pagination indexes
+
+Revision ID: c4a81f5e6d27
+Revises: 7b2e4d91c0a3
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c4a81f5e6d27"
+down_revision: Union[str, Sequence[str], None] = "7b2e4d91c0a3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index("ix_events_created_at_id", "events", ["created_at", "id"], unique=False)
+    op.create_index(
+        "ix_notifications_user_id_created_at_id",
+        "notifications",
+        ["user_id", "created_at", "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_notifications_user_id_created_at_id", table_name="notifications")
+    op.drop_index("ix_events_created_at_id", table_name="events")
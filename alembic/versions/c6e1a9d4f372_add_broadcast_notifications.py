@@ -0,0 +1,200 @@
+"""add broadcast notifications
+
+Revision ID: c6e1a9d4f372
+Revises: b3d8f2e6a147
+Create Date: 2026-10-19 01:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c6e1a9d4f372"
+down_revision: Union[str, Sequence[str], None] = "b3d8f2e6a147"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+NOTIFICATION_TYPE = postgresql.ENUM(name="notificationtype", create_type=False)
+USER_ROLE = postgresql.ENUM(name="userrole", create_type=False)
+DELIVERY_STATUS = postgresql.ENUM(name="notificationdeliverystatus", create_type=False)
+
+RECOUNT_UNREAD_COUNTERS = """
+    UPDATE notification_counters
+    SET unread_count = (
+        SELECT count(*) FROM notifications
+        WHERE notifications.user_id = notification_counters.user_id AND notifications.is_read = false
+    )
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "notification_counters",
+        sa.Column("broadcast_read_until", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_table(
+        "broadcast_notifications",
+        sa.Column("type", NOTIFICATION_TYPE, nullable=False),
+        sa.Column("title", sa.String(length=500), nullable=False),
+        sa.Column("message", sa.Text(), nullable=False),
+        sa.Column("related_event_id", sa.Uuid(), nullable=True),
+        sa.Column("audience_role", USER_ROLE, nullable=False),
+        sa.Column("delivery_status", DELIVERY_STATUS, server_default="PENDING", nullable=False),
+        sa.Column("delivery_cursor", sa.Uuid(), nullable=True),
+        sa.Column("delivered_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("id", sa.Uuid(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=True),
+        sa.ForeignKeyConstraint(["related_event_id"], ["events.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_broadcast_notifications_audience_role_created_at",
+        "broadcast_notifications",
+        ["audience_role", "created_at"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_broadcast_notifications_pending_delivery",
+        "broadcast_notifications",
+        ["created_at"],
+        unique=False,
+        postgresql_where=sa.text("delivery_status = 'PENDING'"),
+    )
+    op.create_table(
+        "broadcast_notification_receipts",
+        sa.Column("broadcast_id", sa.Uuid(), nullable=False),
+        sa.Column("user_id", sa.Uuid(), nullable=False),
+        sa.Column("is_read", sa.Boolean(), server_default="false", nullable=False),
+        sa.Column("is_deleted", sa.Boolean(), server_default="false", nullable=False),
+        sa.Column("delivery_status", DELIVERY_STATUS, nullable=True),
+        sa.Column("delivery_attempts", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("id", sa.Uuid(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=True),
+        sa.ForeignKeyConstraint(["broadcast_id"], ["broadcast_notifications.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("broadcast_id", "user_id", name="uq_broadcast_notification_receipts_broadcast_id_user_id"),
+    )
+    op.create_index(
+        op.f("ix_broadcast_notification_receipts_user_id"),
+        "broadcast_notification_receipts",
+        ["user_id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_broadcast_notification_receipts_pending_delivery",
+        "broadcast_notification_receipts",
+        ["created_at"],
+        unique=False,
+        postgresql_where=sa.text("delivery_status = 'PENDING'"),
+    )
+    # Копии одной рассылки вставлялись одним запросом и делят created_at (время начала транзакции),
+    # поэтому каждая рассылка сворачивается в одну строку с тем же created_at.
+    op.execute(
+        """
+        INSERT INTO broadcast_notifications (
+            id, type, title, message, related_event_id, audience_role, delivery_status, delivered_at,
+            created_at, updated_at
+        )
+        SELECT gen_random_uuid(), 'NEW_EVENT', title, message, related_event_id, 'STUDENT', 'SENT',
+               max(delivered_at), created_at, max(updated_at)
+        FROM notifications
+        WHERE type = 'NEW_EVENT' AND related_event_id IS NOT NULL
+        GROUP BY related_event_id, title, message, created_at
+        """
+    )
+    # Состояние получателей переносим в строки состояния: прочитанные копии и недоставленные в Telegram.
+    op.execute(
+        """
+        INSERT INTO broadcast_notification_receipts (
+            id, broadcast_id, user_id, is_read, delivery_status, delivery_attempts
+        )
+        SELECT DISTINCT ON (broadcast.id, copy.user_id)
+               gen_random_uuid(), broadcast.id, copy.user_id, copy.is_read,
+               CASE WHEN copy.delivery_status = 'PENDING' THEN copy.delivery_status END,
+               copy.delivery_attempts
+        FROM notifications AS copy
+        JOIN broadcast_notifications AS broadcast
+          ON broadcast.related_event_id = copy.related_event_id
+         AND broadcast.title = copy.title
+         AND broadcast.message = copy.message
+         AND broadcast.created_at = copy.created_at
+        WHERE copy.type = 'NEW_EVENT' AND (copy.is_read OR copy.delivery_status = 'PENDING')
+        ORDER BY broadcast.id, copy.user_id, copy.is_read DESC
+        """
+    )
+    # Студенты, у которых копии не было (удалили её сами), не должны увидеть рассылку снова.
+    op.execute(
+        """
+        INSERT INTO broadcast_notification_receipts (id, broadcast_id, user_id, is_deleted)
+        SELECT gen_random_uuid(), broadcast.id, users.id, true
+        FROM broadcast_notifications AS broadcast
+        JOIN users ON users.role = broadcast.audience_role AND users.created_at <= broadcast.created_at
+        WHERE NOT EXISTS (
+            SELECT 1 FROM notifications AS copy
+            WHERE copy.user_id = users.id
+              AND copy.type = 'NEW_EVENT'
+              AND copy.related_event_id = broadcast.related_event_id
+              AND copy.title = broadcast.title
+              AND copy.message = broadcast.message
+              AND copy.created_at = broadcast.created_at
+        )
+        """
+    )
+    op.execute("DELETE FROM notifications WHERE type = 'NEW_EVENT' AND related_event_id IS NOT NULL")
+    op.execute(RECOUNT_UNREAD_COUNTERS)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Разворачиваем рассылки обратно в копии на каждого видимого получателя.
+    op.execute(
+        """
+        INSERT INTO notifications (
+            id, user_id, type, title, message, is_read, related_event_id, delivery_status, delivery_attempts,
+            delivered_at, created_at, updated_at
+        )
+        SELECT gen_random_uuid(), users.id, broadcast.type, broadcast.title, broadcast.message,
+               COALESCE(receipt.is_read, false)
+                   OR COALESCE(broadcast.created_at < counter.broadcast_read_until, false),
+               broadcast.related_event_id,
+               CASE
+                   WHEN receipt.delivery_status IS NOT NULL THEN receipt.delivery_status
+                   WHEN broadcast.delivery_status = 'PENDING'
+                        AND (broadcast.delivery_cursor IS NULL OR users.id > broadcast.delivery_cursor)
+                   THEN 'PENDING'::notificationdeliverystatus
+                   ELSE 'SENT'::notificationdeliverystatus
+               END,
+               COALESCE(receipt.delivery_attempts, 0), broadcast.delivered_at, broadcast.created_at,
+               broadcast.updated_at
+        FROM broadcast_notifications AS broadcast
+        JOIN users ON users.role = broadcast.audience_role AND users.created_at <= broadcast.created_at
+        LEFT JOIN broadcast_notification_receipts AS receipt
+          ON receipt.broadcast_id = broadcast.id AND receipt.user_id = users.id
+        LEFT JOIN notification_counters AS counter ON counter.user_id = users.id
+        WHERE NOT COALESCE(receipt.is_deleted, false)
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO notification_counters (id, user_id, unread_count)
+        SELECT gen_random_uuid(), user_id, 0 FROM notifications WHERE is_read = false GROUP BY user_id
+        ON CONFLICT (user_id) DO NOTHING
+        """
+    )
+    op.execute(RECOUNT_UNREAD_COUNTERS)
+    op.drop_index("ix_broadcast_notification_receipts_pending_delivery", table_name="broadcast_notification_receipts")
+    op.drop_index(op.f("ix_broadcast_notification_receipts_user_id"), table_name="broadcast_notification_receipts")
+    op.drop_table("broadcast_notification_receipts")
+    op.drop_index("ix_broadcast_notifications_pending_delivery", table_name="broadcast_notifications")
+    op.drop_index("ix_broadcast_notifications_audience_role_created_at", table_name="broadcast_notifications")
+    op.drop_table("broadcast_notifications")
+    op.drop_column("notification_counters", "broadcast_read_until")
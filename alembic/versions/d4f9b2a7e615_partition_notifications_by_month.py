@@ -0,0 +1,135 @@
+"""partition notifications by month
+
+Revision ID: d4f9b2a7e615
+Revises: c6e1a9d4f372
+Create Date: 2026-10-19 02:00:00.000000
+
+"""
+import datetime
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d4f9b2a7e615"
+down_revision: Union[str, Sequence[str], None] = "c6e1a9d4f372"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+NOTIFICATION_TYPE = postgresql.ENUM(name="notificationtype", create_type=False)
+DELIVERY_STATUS = postgresql.ENUM(name="notificationdeliverystatus", create_type=False)
+# Дальше секции создаёт задача CREATE_NOTIFICATION_PARTITIONS
+PARTITION_MONTHS_AHEAD = 3
+COLUMNS = (
+    "id, user_id, type, title, message, is_read, related_event_id, delivery_status, delivery_attempts, "
+    "delivered_at, created_at, updated_at"
+)
+
+
+def _notification_columns() -> list[sa.Column]:
+    return [
+        sa.Column("user_id", sa.Uuid(), nullable=False),
+        sa.Column("type", NOTIFICATION_TYPE, nullable=False),
+        sa.Column("title", sa.String(length=500), nullable=False),
+        sa.Column("message", sa.Text(), nullable=False),
+        sa.Column("is_read", sa.Boolean(), nullable=False),
+        sa.Column("related_event_id", sa.Uuid(), nullable=True),
+        sa.Column("delivery_status", DELIVERY_STATUS, server_default="PENDING", nullable=False),
+        sa.Column("delivery_attempts", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("delivered_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("id", sa.Uuid(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=True),
+        sa.ForeignKeyConstraint(["related_event_id"], ["events.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+    ]
+
+
+def _create_notification_indexes() -> None:
+    op.create_index(op.f("ix_notifications_type"), "notifications", ["type"], unique=False)
+    op.create_index(
+        "ix_notifications_user_id_created_at_id",
+        "notifications",
+        ["user_id", "created_at", "id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_notifications_user_id_unread",
+        "notifications",
+        ["user_id", "created_at", "id"],
+        unique=False,
+        postgresql_where=sa.text("is_read = false"),
+    )
+    op.create_index(
+        "ix_notifications_pending_delivery",
+        "notifications",
+        ["created_at"],
+        unique=False,
+        postgresql_where=sa.text("delivery_status = 'PENDING'"),
+    )
+
+
+def _drop_notification_indexes(table_name: str) -> None:
+    op.drop_index("ix_notifications_pending_delivery", table_name=table_name)
+    op.drop_index("ix_notifications_user_id_unread", table_name=table_name)
+    op.drop_index("ix_notifications_user_id_created_at_id", table_name=table_name)
+    op.drop_index(op.f("ix_notifications_type"), table_name=table_name)
+
+
+def _add_months(month: datetime.datetime, months: int) -> datetime.datetime:
+    index = month.year * 12 + month.month - 1 + months
+    return month.replace(year=index // 12, month=index % 12 + 1)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("ALTER TYPE jobkind ADD VALUE IF NOT EXISTS 'CREATE_NOTIFICATION_PARTITIONS'")
+    op.execute("ALTER TYPE jobkind ADD VALUE IF NOT EXISTS 'ARCHIVE_NOTIFICATION_PARTITIONS'")
+    # Обычную таблицу нельзя секционировать на месте: создаём новую рядом и переливаем строки.
+    op.rename_table("notifications", "notifications_unpartitioned")
+    op.execute("ALTER TABLE notifications_unpartitioned RENAME CONSTRAINT notifications_pkey TO notifications_unpartitioned_pkey")
+    _drop_notification_indexes("notifications_unpartitioned")
+    op.create_table(
+        "notifications",
+        *_notification_columns(),
+        sa.PrimaryKeyConstraint("id", "created_at", name="notifications_pkey"),
+        postgresql_partition_by="RANGE (created_at)",
+    )
+    oldest, now = op.get_bind().execute(sa.text("SELECT min(created_at), now() FROM notifications_unpartitioned")).one()
+    month = (oldest or now).astimezone(datetime.UTC).replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    last_month = _add_months(now.astimezone(datetime.UTC).replace(day=1), PARTITION_MONTHS_AHEAD)
+    while month <= last_month:
+        next_month = _add_months(month, 1)
+        op.execute(
+            f"CREATE TABLE notifications_p{month:%Y_%m} PARTITION OF notifications "
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{next_month.isoformat()}')"
+        )
+        month = next_month
+    # Страховка на случай, если задача создания секций не успела: вставка не падает, а строки потом переносятся.
+    op.execute("CREATE TABLE notifications_default PARTITION OF notifications DEFAULT")
+    op.execute(f"INSERT INTO notifications ({COLUMNS}) SELECT {COLUMNS} FROM notifications_unpartitioned")
+    op.drop_table("notifications_unpartitioned")
+    # Индексы строим после загрузки: так быстрее, и у каждой секции появляется свой экземпляр индекса.
+    _create_notification_indexes()
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Строки, уже выгруженные в архив задачей ARCHIVE_NOTIFICATION_PARTITIONS, обратно не возвращаются.
+    op.rename_table("notifications", "notifications_partitioned")
+    op.execute("ALTER TABLE notifications_partitioned RENAME CONSTRAINT notifications_pkey TO notifications_partitioned_pkey")
+    _drop_notification_indexes("notifications_partitioned")
+    op.create_table(
+        "notifications",
+        *_notification_columns(),
+        sa.PrimaryKeyConstraint("id", name="notifications_pkey"),
+    )
+    op.execute(f"INSERT INTO notifications ({COLUMNS}) SELECT {COLUMNS} FROM notifications_partitioned")
+    op.drop_table("notifications_partitioned")
+    _create_notification_indexes()
+    # Значения из enum в PostgreSQL не удаляются; оставшиеся задачи обслуживания секций просто удаляем.
+    op.execute("DELETE FROM jobs WHERE kind IN ('CREATE_NOTIFICATION_PARTITIONS', 'ARCHIVE_NOTIFICATION_PARTITIONS')")
@@ -0,0 +1,54 @@
+"""add trigram name indexes
+
+Revision ID: e8c3b7f1d264
+Revises: d5f2a8b6c941
+Create Date: 2026-10-18 21:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e8c3b7f1d264"
+down_revision: Union[str, Sequence[str], None] = "d5f2a8b6c941"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_index(
+        "ix_event_categories_name_trgm",
+        "event_categories",
+        ["name"],
+        unique=False,
+        postgresql_using="gin",
+        postgresql_ops={"name": "gin_trgm_ops"},
+    )
+    op.create_index(
+        "ix_rooms_name_trgm",
+        "rooms",
+        ["name"],
+        unique=False,
+        postgresql_using="gin",
+        postgresql_ops={"name": "gin_trgm_ops"},
+    )
+    op.create_index(
+        "ix_users_login_trgm",
+        "users",
+        ["login"],
+        unique=False,
+        postgresql_using="gin",
+        postgresql_ops={"login": "gin_trgm_ops"},
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_users_login_trgm", table_name="users", postgresql_using="gin")
+    op.drop_index("ix_rooms_name_trgm", table_name="rooms", postgresql_using="gin")
+    op.drop_index("ix_event_categories_name_trgm", table_name="event_categories", postgresql_using="gin")
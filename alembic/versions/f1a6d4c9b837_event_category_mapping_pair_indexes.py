@@ -0,0 +1,62 @@
+"""event category mapping pair indexes
+
+Revision ID: f1a6d4c9b837
+Revises: e8c3b7f1d264
+Create Date: 2026-10-18 22:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "f1a6d4c9b837"
+down_revision: Union[str, Sequence[str], None] = "e8c3b7f1d264"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(
+        """
+        DELETE FROM event_category_mapping AS duplicate
+        USING event_category_mapping AS original
+        WHERE duplicate.event_id = original.event_id
+          AND duplicate.category_id = original.category_id
+          AND (duplicate.created_at, duplicate.id) > (original.created_at, original.id)
+        """
+    )
+    op.create_unique_constraint(
+        "uq_event_category_mapping_event_id_category_id",
+        "event_category_mapping",
+        ["event_id", "category_id"],
+    )
+    op.create_index(
+        "ix_event_category_mapping_category_id_event_id",
+        "event_category_mapping",
+        ["category_id", "event_id"],
+        unique=False,
+    )
+    # Одиночные индексы покрываются левыми префиксами уникальной пары и составного индекса.
+    op.drop_index(op.f("ix_event_category_mapping_event_id"), table_name="event_category_mapping")
+    op.drop_index(op.f("ix_event_category_mapping_category_id"), table_name="event_category_mapping")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index(
+        op.f("ix_event_category_mapping_category_id"),
+        "event_category_mapping",
+        ["category_id"],
+        unique=False,
+    )
+    op.create_index(op.f("ix_event_category_mapping_event_id"), "event_category_mapping", ["event_id"], unique=False)
+    op.drop_index("ix_event_category_mapping_category_id_event_id", table_name="event_category_mapping")
+    op.drop_constraint(
+        "uq_event_category_mapping_event_id_category_id",
+        "event_category_mapping",
+        type_="unique",
+    )
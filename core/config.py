@@ -14,12 +14,62 @@ class Settings(BaseSettings):
     postgres_host: str = "postgres"
     postgres_port: int = 5432
     postgres_db: str = "postgres"
+    postgres_replica_hosts: str = ""
+
+    read_your_writes_seconds: float = 5.0
+    replica_max_lag_seconds: float = 10.0
+    replica_health_check_interval_seconds: float = 5.0
+    replica_health_check_timeout_seconds: float = 2.0
 
     jwt_secret: str = "your-secret-key-change-in-production"
     jwt_algorithm: str = "HS256"
-    jwt_expiration_minutes: int = 60 * 24 * 7
+    jwt_expiration_minutes: int = 15
+    refresh_token_expiration_days: int = 30
+    token_revocation_sync_interval_seconds: float = 5.0
+    auth_token_prune_interval_seconds: float = 3600.0
+
+    password_scrypt_n: int = 2**14
+    password_scrypt_r: int = 8
+    password_scrypt_p: int = 1
+    password_hash_max_concurrency: int = 4
+    password_hash_max_queue: int = 256
+
+    user_cache_ttl_seconds: float = 60.0
+    user_cache_max_entries: int = 10_000
+    user_cache_url: str = ""
 
     telegram_bot_token: str = ""
+    telegram_api_url: str = "https://api.telegram.org"
+    telegram_global_rate_per_second: float = 30.0
+    telegram_per_chat_rate_per_second: float = 1.0
+    telegram_pool_size: int = 20
+    telegram_request_timeout_seconds: float = 10.0
+    telegram_batch_size: int = 100
+    telegram_max_delivery_attempts: int = 5
+    telegram_retry_base_seconds: float = 30.0
+    telegram_retry_max_seconds: float = 3600.0
+    telegram_delivery_lease_seconds: float = 300.0
+    telegram_poll_interval_seconds: float = 2.0
+
+    worker_concurrency: int = 4
+    worker_batch_size: int = 10
+    worker_poll_interval_seconds: float = 1.0
+    job_max_attempts: int = 5
+    job_retry_base_seconds: float = 5.0
+    job_retry_max_seconds: float = 600.0
+    job_lock_timeout_seconds: float = 300.0
+    registered_count_reconcile_interval_seconds: float = 3600.0
+    notification_counter_reconcile_interval_seconds: float = 3600.0
+    notification_partition_interval_seconds: float = 3600.0
+    notification_partition_months_ahead: int = 3
+    notification_archive_interval_seconds: float = 86400.0
+    notification_retention_months: int = 6
+    notification_archive_dir: str = "archive/notifications"
+
+    notification_stream_heartbeat_seconds: float = 15.0
+    notification_stream_retry_milliseconds: int = 3000
+    notification_stream_fetch_concurrency: int = 8
+    notification_stream_reconnect_seconds: float = 2.0
     
     debug: bool = True
 
@@ -27,6 +77,23 @@ class Settings(BaseSettings):
     def database_url(self) -> str:
         return f"postgresql+asyncpg://{self.postgres_user}:{self.postgres_password}@{self.postgres_host}:{self.postgres_port}/{self.postgres_db}"
 
+    @property
+    def listen_database_url(self) -> str:
+        # LISTEN держит выделенное соединение asyncpg вне пула SQLAlchemy.
+        return f"postgresql://{self.postgres_user}:{self.postgres_password}@{self.postgres_host}:{self.postgres_port}/{self.postgres_db}"
+
+    @property
+    def replica_database_urls(self) -> list[str]:
+        urls = []
+        for replica in self.postgres_replica_hosts.split(","):
+            host, _, port = replica.strip().partition(":")
+            if not host:
+                continue
+            urls.append(
+                f"postgresql+asyncpg://{self.postgres_user}:{self.postgres_password}@{host}:{port or self.postgres_port}/{self.postgres_db}"
+            )
+        return urls
+
 
 settings = Settings()
 
@@ -1,42 +1,174 @@
-from typing import AsyncGenerator
+import asyncio
+import itertools
+import time
+from collections import OrderedDict
+from collections.abc import Sequence
+from contextlib import asynccontextmanager
+from typing import Any, AsyncGenerator, AsyncIterator
+from sqlalchemy import Engine, text
 from sqlalchemy.ext.asyncio import (
     AsyncSession,
     AsyncEngine,
     create_async_engine,
     async_sessionmaker,
 )
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.dml import UpdateBase
+from sqlalchemy.sql.selectable import GenerativeSelect
 
 from core.config import settings
 from core.table import Base
 
 
+POOL_SIZE = 20
+POOL_MAX_OVERFLOW = 10
+REPLICA_LAG_QUERY = text(
+    """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+    """
+)
+
+
+def _create_engine(database_url: str) -> AsyncEngine:
+    return create_async_engine(
+        database_url,
+        echo=settings.debug,
+        pool_size=POOL_SIZE,
+        max_overflow=POOL_MAX_OVERFLOW,
+        pool_pre_ping=True,
+    )
+
+
+class Replica:
+    def __init__(self, *, engine: AsyncEngine):
+        self.engine = engine
+        self.healthy = True
+        self.lag_seconds: float | None = None
+
+
+class RoutingSession(Session):
+    """Сессия, отправляющая чтения read-only запросов на реплики, а всё остальное — на primary."""
+
+    def __init__(self, *, session_manager: "DatabaseSessionManager", **kwargs: Any):
+        super().__init__(**kwargs)
+        self._session_manager = session_manager
+        self._replica_engine: Engine | None = None
+        self._replica_chosen = False
+
+    def get_bind(self, mapper=None, clause=None, **kwargs: Any) -> Engine:
+        primary_engine = self._session_manager.primary_engine.sync_engine
+        if self._flushing or isinstance(clause, UpdateBase):
+            self.info["wrote"] = True
+            return primary_engine
+        if not self.info.get("read_only") or not _is_replica_safe(clause):
+            return primary_engine
+        if not self._replica_chosen:
+            # Реплика выбирается один раз на сессию, чтобы все чтения запроса видели один и тот же снимок.
+            self._replica_chosen = True
+            if not self._session_manager.is_pinned_to_primary(self.info.get("sticky_key")):
+                replica = self._session_manager.next_healthy_replica()
+                if replica is not None:
+                    self._replica_engine = replica.engine.sync_engine
+        return self._replica_engine or primary_engine
+
+    def commit(self) -> None:
+        super().commit()
+        if self.info.pop("wrote", False):
+            self._session_manager.pin_to_primary(self.info.get("sticky_key"))
+
+
+def _is_replica_safe(clause: Any) -> bool:
+    return isinstance(clause, GenerativeSelect) and clause._for_update_arg is None
+
+
 class DatabaseSessionManager:
     def __init__(self):
         self.engine: AsyncEngine | None = None
+        self.replicas: list[Replica] = []
         self.session_maker: async_sessionmaker[AsyncSession] | None = None
+        self._replica_cycle: itertools.cycle[Replica] | None = None
+        self._primary_pins: OrderedDict[str, float] = OrderedDict()
 
-    def init(self, database_url: str):
-        self.engine = create_async_engine(
-            database_url,
-            echo=settings.debug,
-            pool_size=20,
-            max_overflow=10,
-            pool_pre_ping=True,
-        )
+    def init(self, database_url: str, replica_urls: Sequence[str] = ()):
+        self.engine = _create_engine(database_url)
+        self.replicas = [Replica(engine=_create_engine(url)) for url in replica_urls]
+        self._replica_cycle = itertools.cycle(self.replicas) if self.replicas else None
         self.session_maker = async_sessionmaker(
             bind=self.engine,
             class_=AsyncSession,
+            sync_session_class=RoutingSession,
+            session_manager=self,
             expire_on_commit=False,
             autoflush=False,
             autocommit=False,
         )
 
+    @property
+    def primary_engine(self) -> AsyncEngine:
+        if self.engine is None:
+            raise Exception("DatabaseSessionManager is not initialized")
+        return self.engine
+
+    def next_healthy_replica(self) -> Replica | None:
+        if self._replica_cycle is None:
+            return None
+        for _ in range(len(self.replicas)):
+            replica = next(self._replica_cycle)
+            if replica.healthy:
+                return replica
+        return None
+
+    def pin_to_primary(self, sticky_key: str | None) -> None:
+        if sticky_key is None or not self.replicas:
+            return
+        now = time.monotonic()
+        while self._primary_pins and next(iter(self._primary_pins.values())) <= now:
+            self._primary_pins.popitem(last=False)
+        self._primary_pins[sticky_key] = now + settings.read_your_writes_seconds
+        self._primary_pins.move_to_end(sticky_key)
+
+    def is_pinned_to_primary(self, sticky_key: str | None) -> bool:
+        if sticky_key is None:
+            return False
+        pinned_until = self._primary_pins.get(sticky_key)
+        return pinned_until is not None and pinned_until > time.monotonic()
+
+    async def check_replicas(self) -> None:
+        await asyncio.gather(*(self._check_replica(replica) for replica in self.replicas))
+
+    async def _check_replica(self, replica: Replica) -> None:
+        try:
+            async with asyncio.timeout(settings.replica_health_check_timeout_seconds):
+                async with replica.engine.connect() as connection:
+                    lag_seconds = float(await connection.scalar(REPLICA_LAG_QUERY))
+        except Exception:
+            replica.healthy = False
+            replica.lag_seconds = None
+            return
+        replica.lag_seconds = lag_seconds
+        replica.healthy = lag_seconds <= settings.replica_max_lag_seconds
+
+    async def run_replica_health_checks(self) -> None:
+        if not self.replicas:
+            return
+        while True:
+            await self.check_replicas()
+            await asyncio.sleep(settings.replica_health_check_interval_seconds)
+
     async def close(self):
         if self.engine is None:
             return
         await self.engine.dispose()
+        for replica in self.replicas:
+            await replica.engine.dispose()
         self.engine = None
+        self.replicas = []
         self.session_maker = None
+        self._replica_cycle = None
 
     async def create_all(self):
         if self.engine is None:
@@ -52,13 +184,17 @@ class DatabaseSessionManager:
 
 
 sessionmanager = DatabaseSessionManager()
-sessionmanager.init(settings.database_url)
+sessionmanager.init(settings.database_url, replica_urls=settings.replica_database_urls)
 
 
-async def get_session() -> AsyncGenerator[AsyncSession, None]:
+@asynccontextmanager
+async def open_session(*, read_only: bool = False, sticky_key: str | None = None) -> AsyncIterator[AsyncSession]:
     if sessionmanager.session_maker is None:
         raise Exception("DatabaseSessionManager is not initialized")
+    # Соединение берётся из пула только при первом запросе к БД и возвращается при закрытии сессии.
     async with sessionmanager.session_maker() as session:
+        session.info["read_only"] = read_only
+        session.info["sticky_key"] = sticky_key
         try:
             yield session
         except Exception:
@@ -67,3 +203,7 @@ async def get_session() -> AsyncGenerator[AsyncSession, None]:
         finally:
             await session.close()
 
+
+async def get_session() -> AsyncGenerator[AsyncSession, None]:
+    async with open_session() as session:
+        yield session
@@ -3,36 +3,47 @@ from collections.abc import AsyncIterator, Awaitable, Callable
 from fastapi import Depends, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from core.database import get_session
+from core.database import open_session
 from core.enums import UserRole
-from services.auth import resolve_current_user
+from services.auth import resolve_access_claims, resolve_current_user
 from services.exceptions import InvalidStateError
+from schemas.auth import AccessTokenClaims
 from schemas.users import UserRecord
 
 
-async def provide_session() -> AsyncIterator[AsyncSession]:
-    async for session in get_session():
+READ_ONLY_METHODS = {"GET", "HEAD"}
+
+
+async def provide_session(request: Request) -> AsyncIterator[AsyncSession]:
+    # Чтения GET-запросов могут уйти на реплику; после записи клиент с тем же токеном читает с primary.
+    async with open_session(
+        read_only=request.method in READ_ONLY_METHODS,
+        sticky_key=request.headers.get("authorization"),
+    ) as session:
         yield session
 
 
-async def provide_current_user(
-    request: Request,
-    session: AsyncSession = Depends(provide_session),
-) -> UserRecord:
+async def provide_access_claims(request: Request) -> AccessTokenClaims:
     authorization_header = request.headers.get("authorization")
     if authorization_header is None:
         raise InvalidStateError("Authorization header missing")
     scheme, _, token = authorization_header.partition(" ")
     if scheme.lower() != "bearer" or not token:
         raise InvalidStateError("Invalid authorization header")
-    return await resolve_current_user(session=session, token=token)
+    # Роль и версия токена лежат в самом JWT: проверка подписи и снимка отзывов обходится без БД.
+    return resolve_access_claims(token)
+
 
+async def provide_current_user(claims: AccessTokenClaims = Depends(provide_access_claims)) -> UserRecord:
+    # Отдельная короткая сессия: при попадании в кэш пользователей соединение из пула не берётся вовсе.
+    async with open_session() as session:
+        return await resolve_current_user(session=session, user_id=claims.sub)
 
-def provide_user_with_roles(allowed_roles: set[UserRole]) -> Callable[[], Awaitable[UserRecord]]:
-    async def dependency(current_user: UserRecord = Depends(provide_current_user)) -> UserRecord:
-        if current_user.role not in allowed_roles:
+
+def provide_user_with_roles(allowed_roles: set[UserRole]) -> Callable[[], Awaitable[AccessTokenClaims]]:
+    async def dependency(claims: AccessTokenClaims = Depends(provide_access_claims)) -> AccessTokenClaims:
+        if claims.role not in allowed_roles:
             raise InvalidStateError("Insufficient permissions")
-        return current_user
+        return claims
 
     return dependency
-
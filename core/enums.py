@@ -17,6 +17,29 @@ class EventType(str, enum.Enum):
     OFFICIAL = "official"  # Официальное
 
 
+class BulkItemStatus(str, enum.Enum):
+    """Результат обработки элемента массовой операции"""
+    CREATED = "created"  # Создано
+    DUPLICATE = "duplicate"  # Уже существует
+    EVENT_NOT_FOUND = "event_not_found"  # Мероприятие не найдено
+    USER_NOT_FOUND = "user_not_found"  # Пользователь не найден
+    EVENT_FULL = "event_full"  # Нет свободных мест
+
+
+class CategoryMatch(str, enum.Enum):
+    """Режим фильтрации мероприятий по нескольким категориям"""
+    ANY = "any"  # Хотя бы одна из категорий
+    ALL = "all"  # Все категории сразу
+
+
+class EventExpansion(str, enum.Enum):
+    """Связанные сущности, встраиваемые в ответ о мероприятии"""
+    CATEGORIES = "categories"  # Категории
+    ROOM = "room"  # Аудитория
+    CURATOR = "curator"  # Куратор
+    CREATOR = "creator"  # Создатель
+
+
 class UserRole(str, enum.Enum):
     """Роль пользователя"""
     ADMIN = "admin"  # Администратор
@@ -46,3 +69,29 @@ class NotificationType(str, enum.Enum):
     NEW_EVENT = "new_event"  # Новое событие
     SYSTEM = "system"  # Системное уведомление
 
+
+class NotificationDeliveryStatus(str, enum.Enum):
+    """Статус доставки уведомления в Telegram"""
+    PENDING = "pending"  # Ожидает отправки
+    SENT = "sent"  # Отправлено
+    FAILED = "failed"  # Не удалось доставить
+    SKIPPED = "skipped"  # Нет Telegram-чата у получателя
+
+
+
+class JobStatus(str, enum.Enum):
+    """Статус фоновой задачи"""
+    PENDING = "pending"  # Ожидает выполнения
+    RUNNING = "running"  # Выполняется
+    SUCCEEDED = "succeeded"  # Выполнена
+    FAILED = "failed"  # Завершилась ошибкой
+
+
+class JobKind(str, enum.Enum):
+    """Тип фоновой задачи"""
+    NEW_EVENT_NOTIFICATIONS = "new_event_notifications"  # Рассылка о новом событии
+    RECONCILE_REGISTERED_COUNTS = "reconcile_registered_counts"  # Сверка счётчиков регистраций
+    PRUNE_AUTH_TOKENS = "prune_auth_tokens"  # Удаление истёкших refresh-токенов и отзывов
+    RECONCILE_NOTIFICATION_COUNTERS = "reconcile_notification_counters"  # Сверка счётчиков непрочитанных
+    CREATE_NOTIFICATION_PARTITIONS = "create_notification_partitions"  # Создание будущих секций уведомлений
+    ARCHIVE_NOTIFICATION_PARTITIONS = "archive_notification_partitions"  # Выгрузка старых секций уведомлений в архив
@@ -1,19 +1,160 @@
+import asyncio
+import base64
 import datetime
 import hashlib
-from typing import Any
+import hmac
+import os
+import re
+import secrets
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, TypedDict
 
 import jwt
 
 from core.config import settings
-from services.exceptions import InvalidStateError
+from services.exceptions import InvalidStateError, ServiceBusyError
+
+
+SCRYPT_PREFIX = "scrypt"
+SCRYPT_SALT_BYTES = 16
+SCRYPT_KEY_BYTES = 32
+LEGACY_SHA256_PATTERN = re.compile(r"^[0-9a-f]{64}$")
+REFRESH_TOKEN_BYTES = 32
 
 
 def hash_password(raw_password: str) -> str:
-    return hashlib.sha256(raw_password.encode("utf-8")).hexdigest()
+    salt = os.urandom(SCRYPT_SALT_BYTES)
+    key = _scrypt(
+        raw_password,
+        salt=salt,
+        n=settings.password_scrypt_n,
+        r=settings.password_scrypt_r,
+        p=settings.password_scrypt_p,
+    )
+    return "$".join(
+        [
+            SCRYPT_PREFIX,
+            str(settings.password_scrypt_n),
+            str(settings.password_scrypt_r),
+            str(settings.password_scrypt_p),
+            base64.b64encode(salt).decode("ascii"),
+            base64.b64encode(key).decode("ascii"),
+        ]
+    )
 
 
 def verify_password(raw_password: str, stored_hash: str) -> bool:
-    return hash_password(raw_password) == stored_hash
+    if LEGACY_SHA256_PATTERN.match(stored_hash):
+        legacy_hash = hashlib.sha256(raw_password.encode("utf-8")).hexdigest()
+        return hmac.compare_digest(legacy_hash, stored_hash)
+    try:
+        prefix, n, r, p, salt, key = stored_hash.split("$")
+        if prefix != SCRYPT_PREFIX:
+            return False
+        expected_key = base64.b64decode(key)
+        actual_key = _scrypt(raw_password, salt=base64.b64decode(salt), n=int(n), r=int(r), p=int(p))
+    except ValueError:
+        return False
+    return hmac.compare_digest(actual_key, expected_key)
+
+
+def password_needs_rehash(stored_hash: str) -> bool:
+    current_parameters = [
+        SCRYPT_PREFIX,
+        str(settings.password_scrypt_n),
+        str(settings.password_scrypt_r),
+        str(settings.password_scrypt_p),
+    ]
+    return stored_hash.split("$")[:4] != current_parameters
+
+
+def _scrypt(raw_password: str, *, salt: bytes, n: int, r: int, p: int) -> bytes:
+    return hashlib.scrypt(
+        raw_password.encode("utf-8"),
+        salt=salt,
+        n=n,
+        r=r,
+        p=p,
+        maxmem=256 * r * n,
+        dklen=SCRYPT_KEY_BYTES,
+    )
+
+
+class PasswordHasherMetrics(TypedDict):
+    in_flight: int
+    queued: int
+    max_queued: int
+    completed: int
+    rejected: int
+    average_wait_ms: float
+    average_hash_ms: float
+
+
+class PasswordHasher:
+    """Выполняет KDF в пуле потоков: hashlib.scrypt отпускает GIL, поэтому event loop не блокируется."""
+
+    def __init__(self, *, max_concurrency: int, max_queue: int):
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="password-hasher")
+        self._slots = asyncio.Semaphore(max_concurrency)
+        self._in_flight = 0
+        self._queued = 0
+        self._max_queued = 0
+        self._completed = 0
+        self._rejected = 0
+        self._wait_seconds_total = 0.0
+        self._hash_seconds_total = 0.0
+
+    async def hash(self, raw_password: str) -> str:
+        return await self._run(hash_password, raw_password)
+
+    async def verify(self, raw_password: str, stored_hash: str) -> bool:
+        if LEGACY_SHA256_PATTERN.match(stored_hash):
+            return verify_password(raw_password, stored_hash)
+        return await self._run(verify_password, raw_password, stored_hash)
+
+    async def _run(self, function: Any, *args: str) -> Any:
+        # При переполненной очереди сразу отказываем: ожидание в хвосте лишь растянуло бы задержку всех логинов.
+        if self._queued >= self.max_queue:
+            self._rejected += 1
+            raise ServiceBusyError("Too many concurrent logins, retry later")
+        queued_at = time.perf_counter()
+        self._queued += 1
+        self._max_queued = max(self._max_queued, self._queued)
+        try:
+            await self._slots.acquire()
+        finally:
+            self._queued -= 1
+        started_at = time.perf_counter()
+        self._wait_seconds_total += started_at - queued_at
+        self._in_flight += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, function, *args)
+        finally:
+            self._in_flight -= 1
+            self._completed += 1
+            self._hash_seconds_total += time.perf_counter() - started_at
+            self._slots.release()
+
+    def metrics(self) -> PasswordHasherMetrics:
+        completed = self._completed or 1
+        return {
+            "in_flight": self._in_flight,
+            "queued": self._queued,
+            "max_queued": self._max_queued,
+            "completed": self._completed,
+            "rejected": self._rejected,
+            "average_wait_ms": round(self._wait_seconds_total / completed * 1000, 2),
+            "average_hash_ms": round(self._hash_seconds_total / completed * 1000, 2),
+        }
+
+
+password_hasher = PasswordHasher(
+    max_concurrency=settings.password_hash_max_concurrency,
+    max_queue=settings.password_hash_max_queue,
+)
 
 
 def create_access_token(payload: dict[str, Any]) -> str:
@@ -39,3 +180,12 @@ def decode_access_token(token: str) -> dict[str, Any]:
     except jwt.InvalidTokenError as exc:
         raise InvalidStateError("Invalid token") from exc
 
+
+
+def generate_refresh_token() -> str:
+    return secrets.token_urlsafe(REFRESH_TOKEN_BYTES)
+
+
+def hash_refresh_token(refresh_token: str) -> str:
+    # Токен случайный и длинный, поэтому достаточно быстрого хэша: KDF здесь ничего не добавляет.
+    return hashlib.sha256(refresh_token.encode("utf-8")).hexdigest()
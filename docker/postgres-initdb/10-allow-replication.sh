@@ -0,0 +1,5 @@
+#!/usr/bin/env bash
+set -euo pipefail
+
+# Разрешаем потоковую репликацию из docker-сети для сервиса postgres-replica.
+echo "host replication all all scram-sha-256" >> "$PGDATA/pg_hba.conf"
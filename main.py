@@ -3,11 +3,16 @@
 
 
 
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager, suppress
+
 from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.openapi.utils import get_openapi
 from fastapi.responses import JSONResponse
 
+from core.database import open_session, sessionmanager
 from routers import (
     auth_router,
     events_router,
@@ -16,21 +21,47 @@ from routers import (
     rooms_router,
     users_router,
 )
+from routers.pagination import NEXT_CURSOR_HEADER
 from services.exceptions import (
     EntityConflictError,
     EntityNotFoundError,
     InvalidStateError,
+    ServiceBusyError,
     ServiceError,
 )
-
-
-app = FastAPI()
+from services.notification_stream import notification_broker
+from services.token_revocation import run_token_revocation_sync, sync_token_revocations
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+    await sessionmanager.check_replicas()
+    async with open_session() as session:
+        await sync_token_revocations(session=session)
+    background_tasks = [
+        asyncio.create_task(sessionmanager.run_replica_health_checks()),
+        asyncio.create_task(run_token_revocation_sync()),
+        asyncio.create_task(notification_broker.run()),
+    ]
+    try:
+        yield
+    finally:
+        for task in background_tasks:
+            task.cancel()
+        for task in background_tasks:
+            with suppress(asyncio.CancelledError):
+                await task
+        await sessionmanager.close()
+
+
+app = FastAPI(lifespan=lifespan)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
 
@@ -48,7 +79,7 @@ def custom_openapi() -> dict:
         "scheme": "bearer",
         "bearerFormat": "JWT",
     }
-    unsecured_paths = {"/auth/login", "/auth/register", "/auth/refresh"}
+    unsecured_paths = {"/auth/login", "/auth/register", "/auth/refresh", "/auth/logout"}
     for path, operations in schema.get("paths", {}).items():
         if path in unsecured_paths:
             continue
@@ -71,6 +102,8 @@ async def service_error_handler(_: Request, exc: ServiceError) -> JSONResponse:
         status_code = status.HTTP_409_CONFLICT
     elif isinstance(exc, InvalidStateError):
         status_code = status.HTTP_400_BAD_REQUEST
+    elif isinstance(exc, ServiceBusyError):
+        status_code = status.HTTP_503_SERVICE_UNAVAILABLE
     return JSONResponse(
         content={"detail": exc.detail},
         status_code=status_code,
@@ -26,7 +26,18 @@ from models.moderation import (
 )
 
 # Notification models
-from models.notification import Notification
+from models.notification import (
+    BroadcastNotification,
+    BroadcastNotificationReceipt,
+    Notification,
+    NotificationCounter,
+)
+
+# Background job models
+from models.job import Job
+
+# Auth token models
+from models.token import RefreshToken, TokenRevocation
 
 
 __all__ = [
@@ -47,5 +58,13 @@ __all__ = [
     "ApplicationHistory",
     # Notification
     "Notification",
+    "NotificationCounter",
+    "BroadcastNotification",
+    "BroadcastNotificationReceipt",
+    # Job
+    "Job",
+    # Token
+    "RefreshToken",
+    "TokenRevocation",
 ]
 
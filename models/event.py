@@ -2,7 +2,8 @@ import datetime
 from uuid import UUID
 from typing import Optional
 
-from sqlalchemy import String, Text, DateTime, Integer, Boolean, Enum as SQLEnum, ForeignKey
+from sqlalchemy import String, Text, DateTime, Integer, Boolean, Computed, Enum as SQLEnum, ForeignKey, Index, UniqueConstraint
+from sqlalchemy.dialects.postgresql import TSRANGE, TSVECTOR, ExcludeConstraint, Range
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from core.table import Base
@@ -12,19 +13,50 @@ from core.enums import EventStatus, EventType
 class Event(Base):
     """Модель мероприятия"""
     __tablename__ = "events"
+    __table_args__ = (
+        Index("ix_events_created_at_id", "created_at", "id"),
+        Index("ix_events_search_vector", "search_vector", postgresql_using="gin"),
+        # Основные выборки студентов: статус + сортировка по (created_at, id) и статус + диапазон дат.
+        Index("ix_events_status_created_at_id", "status", "created_at", "id"),
+        Index("ix_events_status_event_date", "status", "event_date"),
+        # Одна аудитория не может быть занята пересекающимися мероприятиями; отменённые и отклонённые не в счёт.
+        ExcludeConstraint(
+            ("room_id", "="),
+            ("booked_during", "&&"),
+            name="ex_events_room_id_booked_during",
+            using="gist",
+            where="room_id IS NOT NULL AND status NOT IN ('REJECTED', 'CANCELLED')",
+        ),
+    )
 
     title: Mapped[str] = mapped_column(String(500), nullable=False, index=True)
     description: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    # Поисковый вектор: заголовок весомее описания; не загружается вместе с моделью.
+    search_vector: Mapped[str] = mapped_column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('russian', coalesce(title, '')), 'A') || "
+            "setweight(to_tsvector('russian', coalesce(description, '')), 'B')",
+            persisted=True,
+        ),
+        nullable=False,
+        deferred=True,
+    )
     event_date: Mapped[datetime.date] = mapped_column(nullable=False, index=True)
     start_time: Mapped[datetime.time] = mapped_column(nullable=False)
     end_time: Mapped[datetime.time] = mapped_column(nullable=False)
+    booked_during: Mapped[Range[datetime.datetime]] = mapped_column(
+        TSRANGE,
+        Computed("tsrange(event_date + start_time, event_date + end_time, '[)')", persisted=True),
+        nullable=False,
+    )
     
     # Участники
     registered_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
     max_participants: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
     
     # Статусы
-    status: Mapped[EventStatus] = mapped_column(SQLEnum(EventStatus), default=EventStatus.DRAFT, nullable=False, index=True)
+    status: Mapped[EventStatus] = mapped_column(SQLEnum(EventStatus), default=EventStatus.DRAFT, nullable=False)
     event_type: Mapped[EventType] = mapped_column(SQLEnum(EventType), default=EventType.STUDENT, nullable=False, index=True)
     
     # Создатель и локация
@@ -53,6 +85,9 @@ class Event(Base):
 class EventCategory(Base):
     """Категория мероприятия"""
     __tablename__ = "event_categories"
+    __table_args__ = (
+        Index("ix_event_categories_name_trgm", "name", postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"}),
+    )
 
     name: Mapped[str] = mapped_column(String(255), unique=True, nullable=False, index=True)
     description: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
@@ -68,9 +103,14 @@ class EventCategory(Base):
 class EventCategoryMapping(Base):
     """Связь мероприятия и категории (many-to-many)"""
     __tablename__ = "event_category_mapping"
+    __table_args__ = (
+        # Уникальная пара обслуживает поиск по event_id, составной индекс — фильтр мероприятий по категории.
+        UniqueConstraint("event_id", "category_id", name="uq_event_category_mapping_event_id_category_id"),
+        Index("ix_event_category_mapping_category_id_event_id", "category_id", "event_id"),
+    )
 
-    event_id: Mapped[UUID] = mapped_column(ForeignKey("events.id", ondelete="CASCADE"), nullable=False, index=True)
-    category_id: Mapped[UUID] = mapped_column(ForeignKey("event_categories.id", ondelete="CASCADE"), nullable=False, index=True)
+    event_id: Mapped[UUID] = mapped_column(ForeignKey("events.id", ondelete="CASCADE"), nullable=False)
+    category_id: Mapped[UUID] = mapped_column(ForeignKey("event_categories.id", ondelete="CASCADE"), nullable=False)
 
     # Relationships
     event: Mapped["Event"] = relationship("Event", back_populates="categories")
@@ -83,9 +123,13 @@ class EventCategoryMapping(Base):
 class EventRegistration(Base):
     """Регистрация на мероприятие (без модерации)"""
     __tablename__ = "event_registrations"
+    __table_args__ = (
+        UniqueConstraint("event_id", "user_id", name="uq_event_registrations_event_id_user_id"),
+        Index("ix_event_registrations_user_id_created_at_id", "user_id", "created_at", "id"),
+    )
 
-    event_id: Mapped[UUID] = mapped_column(ForeignKey("events.id", ondelete="CASCADE"), nullable=False, index=True)
-    user_id: Mapped[UUID] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    event_id: Mapped[UUID] = mapped_column(ForeignKey("events.id", ondelete="CASCADE"), nullable=False)
+    user_id: Mapped[UUID] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     comment: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
 
     # Relationships
@@ -99,6 +143,9 @@ class EventRegistration(Base):
 class EventApplication(Base):
     """Заявка на участие в мероприятии (с модерацией)"""
     __tablename__ = "event_applications"
+    __table_args__ = (
+        UniqueConstraint("event_id", "applicant_id", name="uq_event_applications_event_id_applicant_id"),
+    )
 
     event_id: Mapped[UUID] = mapped_column(ForeignKey("events.id", ondelete="CASCADE"), nullable=False, index=True)
     applicant_id: Mapped[UUID] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
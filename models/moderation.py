@@ -1,7 +1,7 @@
 from uuid import UUID
 from typing import Optional
 
-from sqlalchemy import String, Text, ForeignKey, Enum as SQLEnum
+from sqlalchemy import String, Text, ForeignKey, Index, Enum as SQLEnum
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from core.table import Base
@@ -11,8 +11,11 @@ from core.enums import ModerationAction
 class EventModerationHistory(Base):
     """История модерации мероприятия кураторами"""
     __tablename__ = "event_moderation_history"
+    __table_args__ = (
+        Index("ix_event_moderation_history_event_id_action_created_at", "event_id", "action", "created_at"),
+    )
 
-    event_id: Mapped[UUID] = mapped_column(ForeignKey("events.id", ondelete="CASCADE"), nullable=False, index=True)
+    event_id: Mapped[UUID] = mapped_column(ForeignKey("events.id", ondelete="CASCADE"), nullable=False)
     curator_id: Mapped[UUID] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
     action: Mapped[ModerationAction] = mapped_column(SQLEnum(ModerationAction), nullable=False)
     comment: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
@@ -1,29 +1,166 @@
+import datetime
 from uuid import UUID
 from typing import Optional
 
-from sqlalchemy import String, Text, Boolean, ForeignKey, Enum as SQLEnum
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import String, Text, Boolean, DateTime, Integer, ForeignKey, Index, PrimaryKeyConstraint, UniqueConstraint, Enum as SQLEnum, func, text
+from sqlalchemy.orm import Mapped, declared_attr, mapped_column, relationship
 
 from core.table import Base
-from core.enums import NotificationType
+from core.enums import NotificationDeliveryStatus, NotificationType, UserRole
 
 
 class Notification(Base):
-    """Уведомление пользователя"""
+    """Уведомление пользователя; таблица секционирована по месяцам created_at (см. services.notification_partitions)"""
     __tablename__ = "notifications"
+    __table_args__ = (
+        # Ключ секционирования обязан входить в первичный ключ
+        PrimaryKeyConstraint("id", "created_at", name="notifications_pkey"),
+        Index("ix_notifications_user_id_created_at_id", "user_id", "created_at", "id"),
+        Index(
+            "ix_notifications_user_id_unread",
+            "user_id",
+            "created_at",
+            "id",
+            postgresql_where=text("is_read = false"),
+        ),
+        Index(
+            "ix_notifications_pending_delivery",
+            "next_attempt_at",
+            postgresql_where=text("delivery_status = 'PENDING'"),
+        ),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
 
-    user_id: Mapped[UUID] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    created_at: Mapped[datetime.datetime] = mapped_column(
+        DateTime(timezone=True),
+        primary_key=True,
+        server_default=func.now(),
+    )
+    user_id: Mapped[UUID] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     type: Mapped[NotificationType] = mapped_column(SQLEnum(NotificationType), nullable=False, index=True)
     title: Mapped[str] = mapped_column(String(500), nullable=False)
     message: Mapped[str] = mapped_column(Text, nullable=False)
-    is_read: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False, index=True)
+    is_read: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
     
     # Опционально: ссылка на связанную сущность
     related_event_id: Mapped[Optional[UUID]] = mapped_column(ForeignKey("events.id", ondelete="CASCADE"), nullable=True)
 
+    # Доставка в Telegram
+    delivery_status: Mapped[NotificationDeliveryStatus] = mapped_column(
+        SQLEnum(NotificationDeliveryStatus),
+        default=NotificationDeliveryStatus.PENDING,
+        server_default=NotificationDeliveryStatus.PENDING.name,
+        nullable=False,
+    )
+    delivery_attempts: Mapped[int] = mapped_column(Integer, default=0, server_default="0", nullable=False)
+    delivered_at: Mapped[Optional[datetime.datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    # Раньше этого момента строку не берут: здесь и отложенный повтор, и аренда на время отправки
+    next_attempt_at: Mapped[datetime.datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+    )
+
     # Relationships
     user: Mapped["User"] = relationship("User", back_populates="notifications")
 
+    @declared_attr.directive
+    def __mapper_args__(cls):
+        # id — uuid4 и уникален без created_at, поэтому ORM идентифицирует уведомление по нему одному и session.get(id) работает
+        return {"primary_key": [cls.__table__.c.id]}
+
     def __repr__(self) -> str:
         return f"<Notification(id={self.id}, user_id={self.user_id}, type={self.type}, is_read={self.is_read})>"
 
+
+
+class NotificationCounter(Base):
+    """Счётчик непрочитанных уведомлений пользователя; поддерживается в тех же транзакциях, что и уведомления"""
+    __tablename__ = "notification_counters"
+
+    user_id: Mapped[UUID] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), unique=True, nullable=False)
+    unread_count: Mapped[int] = mapped_column(Integer, default=0, server_default="0", nullable=False)
+    # Широковещательные уведомления, созданные раньше этой отметки, считаются прочитанными
+    broadcast_read_until: Mapped[Optional[datetime.datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    def __repr__(self) -> str:
+        return f"<NotificationCounter(user_id={self.user_id}, unread_count={self.unread_count})>"
+
+
+class BroadcastNotification(Base):
+    """Уведомление для всех пользователей роли; текст хранится один раз, а не копией на каждого получателя"""
+    __tablename__ = "broadcast_notifications"
+    __table_args__ = (
+        Index("ix_broadcast_notifications_audience_role_created_at", "audience_role", "created_at"),
+        Index(
+            "ix_broadcast_notifications_pending_delivery",
+            "next_attempt_at",
+            postgresql_where=text("delivery_status = 'PENDING'"),
+        ),
+    )
+
+    type: Mapped[NotificationType] = mapped_column(SQLEnum(NotificationType), nullable=False)
+    title: Mapped[str] = mapped_column(String(500), nullable=False)
+    message: Mapped[str] = mapped_column(Text, nullable=False)
+    related_event_id: Mapped[Optional[UUID]] = mapped_column(ForeignKey("events.id", ondelete="CASCADE"), nullable=True)
+    # Видят пользователи этой роли, зарегистрированные до создания уведомления
+    audience_role: Mapped[UserRole] = mapped_column(SQLEnum(UserRole), nullable=False)
+
+    # Доставка в Telegram идёт по получателям в порядке id; курсор — последний обработанный пользователь
+    delivery_status: Mapped[NotificationDeliveryStatus] = mapped_column(
+        SQLEnum(NotificationDeliveryStatus),
+        default=NotificationDeliveryStatus.PENDING,
+        server_default=NotificationDeliveryStatus.PENDING.name,
+        nullable=False,
+    )
+    delivery_cursor: Mapped[Optional[UUID]] = mapped_column(nullable=True)
+    delivered_at: Mapped[Optional[datetime.datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    # Пока пачка получателей отправляется, уведомление арендовано и другой процесс его не берёт
+    next_attempt_at: Mapped[datetime.datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+    )
+
+    def __repr__(self) -> str:
+        return f"<BroadcastNotification(id={self.id}, type={self.type}, audience_role={self.audience_role})>"
+
+
+class BroadcastNotificationReceipt(Base):
+    """Состояние широковещательного уведомления у конкретного пользователя; строка есть только при отличии от умолчаний"""
+    __tablename__ = "broadcast_notification_receipts"
+    __table_args__ = (
+        UniqueConstraint("broadcast_id", "user_id", name="uq_broadcast_notification_receipts_broadcast_id_user_id"),
+        Index(
+            "ix_broadcast_notification_receipts_pending_delivery",
+            "next_attempt_at",
+            postgresql_where=text("delivery_status = 'PENDING'"),
+        ),
+    )
+
+    broadcast_id: Mapped[UUID] = mapped_column(
+        ForeignKey("broadcast_notifications.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    user_id: Mapped[UUID] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    is_read: Mapped[bool] = mapped_column(Boolean, default=False, server_default="false", nullable=False)
+    is_deleted: Mapped[bool] = mapped_column(Boolean, default=False, server_default="false", nullable=False)
+
+    # Повторная доставка в Telegram тем, кому не удалось отправить при обходе аудитории
+    delivery_status: Mapped[Optional[NotificationDeliveryStatus]] = mapped_column(
+        SQLEnum(NotificationDeliveryStatus),
+        nullable=True,
+    )
+    delivery_attempts: Mapped[int] = mapped_column(Integer, default=0, server_default="0", nullable=False)
+    # Срок следующего повтора; на время отправки сдвигается вперёд, чтобы строку не взял другой процесс
+    next_attempt_at: Mapped[datetime.datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"<BroadcastNotificationReceipt(broadcast_id={self.broadcast_id}, user_id={self.user_id}, "
+            f"is_read={self.is_read}, is_deleted={self.is_deleted})>"
+        )
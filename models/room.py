@@ -1,6 +1,7 @@
 from typing import Optional
 
-from sqlalchemy import String, Integer, JSON, Boolean
+from sqlalchemy import String, Integer, Boolean, Index
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from core.table import Base
@@ -9,11 +10,15 @@ from core.table import Base
 class Room(Base):
     """Модель аудитории"""
     __tablename__ = "rooms"
+    __table_args__ = (
+        Index("ix_rooms_name_trgm", "name", postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"}),
+        Index("ix_rooms_equipment", "equipment", postgresql_using="gin", postgresql_ops={"equipment": "jsonb_path_ops"}),
+    )
 
     name: Mapped[str] = mapped_column(String(255), nullable=False, index=True)
     capacity: Mapped[int] = mapped_column(Integer, nullable=False)
     location: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
-    equipment: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)
+    equipment: Mapped[Optional[dict]] = mapped_column(JSONB, nullable=True)
     is_available: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
 
     # Relationships
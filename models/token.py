@@ -0,0 +1,38 @@
+import datetime
+from uuid import UUID
+from typing import Optional
+
+from sqlalchemy import DateTime, ForeignKey, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from core.table import Base
+
+
+class RefreshToken(Base):
+    """Refresh-токен; хранится только хэш, цепочка ротаций объединена family_id"""
+    __tablename__ = "refresh_tokens"
+
+    user_id: Mapped[UUID] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    token_hash: Mapped[str] = mapped_column(String(64), unique=True, nullable=False)
+    family_id: Mapped[UUID] = mapped_column(nullable=False, index=True)
+    expires_at: Mapped[datetime.datetime] = mapped_column(DateTime(timezone=True), nullable=False, index=True)
+    revoked_at: Mapped[Optional[datetime.datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    # Relationships
+    user: Mapped["User"] = relationship("User", back_populates="refresh_tokens")
+
+    def __repr__(self) -> str:
+        return f"<RefreshToken(user_id={self.user_id}, family_id={self.family_id}, revoked_at={self.revoked_at})>"
+
+
+class TokenRevocation(Base):
+    """Отзыв access-токенов пользователя: токены с версией ниже min_token_version недействительны"""
+    __tablename__ = "token_revocations"
+
+    # Без внешнего ключа: запись должна пережить удаление пользователя, пока живы его access-токены.
+    user_id: Mapped[UUID] = mapped_column(unique=True, nullable=False)
+    min_token_version: Mapped[int] = mapped_column(Integer, nullable=False)
+    expires_at: Mapped[datetime.datetime] = mapped_column(DateTime(timezone=True), nullable=False, index=True)
+
+    def __repr__(self) -> str:
+        return f"<TokenRevocation(user_id={self.user_id}, min_token_version={self.min_token_version})>"
@@ -1,7 +1,7 @@
 from uuid import UUID
 from typing import Optional
 
-from sqlalchemy import String, Enum as SQLEnum, JSON
+from sqlalchemy import Index, Integer, String, Enum as SQLEnum, JSON
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy import ForeignKey
 
@@ -12,12 +12,16 @@ from core.enums import UserRole
 class User(Base):
     """Модель пользователя"""
     __tablename__ = "users"
+    __table_args__ = (
+        Index("ix_users_login_trgm", "login", postgresql_using="gin", postgresql_ops={"login": "gin_trgm_ops"}),
+    )
 
     login: Mapped[str] = mapped_column(String(255), unique=True, nullable=False, index=True)
     password_hash: Mapped[str] = mapped_column(String(255), nullable=False)
     role: Mapped[UserRole] = mapped_column(SQLEnum(UserRole), nullable=False, default=UserRole.STUDENT)
     telegram_username: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
     telegram_chat_id: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    token_version: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
 
     # Relationships
     profile: Mapped[Optional["UserProfile"]] = relationship("UserProfile", back_populates="user", uselist=False)
@@ -26,6 +30,7 @@ class User(Base):
     event_registrations: Mapped[list["EventRegistration"]] = relationship("EventRegistration", back_populates="user")
     event_applications: Mapped[list["EventApplication"]] = relationship("EventApplication", back_populates="applicant")
     notifications: Mapped[list["Notification"]] = relationship("Notification", back_populates="user")
+    refresh_tokens: Mapped[list["RefreshToken"]] = relationship("RefreshToken", back_populates="user", passive_deletes=True)
 
     def __repr__(self) -> str:
         return f"<User(id={self.id}, login={self.login}, role={self.role})>"
@@ -1,11 +1,10 @@
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.dependencies import provide_current_user, provide_session
-from core.security import create_access_token
-from schemas.auth import LoginPayload, RegisterPayload, TokenPayload
+from schemas.auth import LoginPayload, RefreshPayload, RegisterPayload, TokenPayload
 from schemas.users import UserRecord
-from services.auth import authenticate_user, register_user
+from services.auth import authenticate_user, refresh_tokens, register_user, revoke_refresh_token
 
 
 auth_router = APIRouter(prefix="/auth", tags=["Auth"])
@@ -14,7 +13,7 @@ auth_router = APIRouter(prefix="/auth", tags=["Auth"])
 @auth_router.post("/login", response_model=TokenPayload)
 async def login_route(
     payload: LoginPayload,
-    session: AsyncSession = Depends(provide_session),
+    session: AsyncSession = Depends(provide_session, scope="function"),
 ) -> TokenPayload:
     return await authenticate_user(session=session, payload=payload)
 
@@ -22,7 +21,7 @@ async def login_route(
 @auth_router.post("/register", response_model=UserRecord, status_code=status.HTTP_201_CREATED)
 async def register_route(
     payload: RegisterPayload,
-    session: AsyncSession = Depends(provide_session),
+    session: AsyncSession = Depends(provide_session, scope="function"),
 ) -> UserRecord:
     return await register_user(session=session, payload=payload)
 
@@ -36,8 +35,16 @@ async def get_current_user_route(
 
 @auth_router.post("/refresh", response_model=TokenPayload)
 async def refresh_token_route(
-    current_user: UserRecord = Depends(provide_current_user),
+    payload: RefreshPayload,
+    session: AsyncSession = Depends(provide_session, scope="function"),
 ) -> TokenPayload:
-    token = create_access_token({"sub": str(current_user.id)})
-    return TokenPayload(access_token=token, user_id=current_user.id)
+    return await refresh_tokens(session=session, payload=payload)
+
 
+@auth_router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+async def logout_route(
+    payload: RefreshPayload,
+    session: AsyncSession = Depends(provide_session, scope="function"),
+) -> Response:
+    await revoke_refresh_token(session=session, payload=payload)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -0,0 +1,37 @@
+import datetime
+from email.utils import format_datetime
+
+from fastapi import Request, Response, status
+
+from services.utils import ResourceVersion
+
+
+def _opaque_tag(etag: str) -> str:
+    return etag.strip().removeprefix("W/")
+
+
+def is_not_modified(*, request: Request, version: ResourceVersion) -> bool:
+    # Сверяем только If-None-Match: удаление строки не сдвигает max(updated_at), поэтому If-Modified-Since
+    # на списках дал бы ложный 304.
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is None:
+        return False
+    candidates = {_opaque_tag(tag) for tag in if_none_match.split(",")}
+    return "*" in candidates or _opaque_tag(version["etag"]) in candidates
+
+
+def set_version_headers(*, response: Response, version: ResourceVersion) -> None:
+    response.headers["ETag"] = version["etag"]
+    # Ответы зависят от авторизации: общие кэши их не хранят, а клиент перепроверяет версию при каждом запросе.
+    response.headers["Cache-Control"] = "private, no-cache"
+    if version["last_modified"] is not None:
+        response.headers["Last-Modified"] = format_datetime(
+            version["last_modified"].astimezone(datetime.UTC),
+            usegmt=True,
+        )
+
+
+def not_modified_response(*, version: ResourceVersion) -> Response:
+    response = Response(status_code=status.HTTP_304_NOT_MODIFIED)
+    set_version_headers(response=response, version=version)
+    return response
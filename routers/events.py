@@ -1,11 +1,15 @@
 from typing import Annotated
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Query, Request, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from core.dependencies import provide_current_user, provide_session
+from core.dependencies import provide_access_claims, provide_session
+from routers.conditional import is_not_modified, not_modified_response, set_version_headers
+from routers.pagination import set_next_cursor_header
 from schemas.events import (
+    EventApplicationBulkCreatePayload,
+    EventApplicationBulkResult,
     EventApplicationCreatePayload,
     EventApplicationListParams,
     EventApplicationRecord,
@@ -19,8 +23,12 @@ from schemas.events import (
     EventCategoryRecord,
     EventCategoryUpdatePayload,
     EventCreatePayload,
+    EventExpandedRecord,
     EventListParams,
+    EventReadParams,
     EventRecord,
+    EventRegistrationBulkCreatePayload,
+    EventRegistrationBulkResult,
     EventRegistrationCreatePayload,
     EventRegistrationListParams,
     EventRegistrationRecord,
@@ -30,9 +38,11 @@ from schemas.events import (
 from services.events import (
     create_event,
     create_event_application,
+    create_event_applications_bulk,
     create_event_category,
     create_event_category_mapping,
     create_event_registration,
+    create_event_registrations_bulk,
     delete_event,
     delete_event_application,
     delete_event_category,
@@ -41,8 +51,11 @@ from services.events import (
     get_event,
     get_event_application,
     get_event_category,
+    get_event_category_list_version,
     get_event_category_mapping,
+    get_event_list_version,
     get_event_registration,
+    get_event_version,
     list_event_applications,
     list_event_categories,
     list_event_category_mappings,
@@ -56,21 +69,35 @@ from services.events import (
 )
 
 
-events_router = APIRouter(prefix="/events", tags=["Events"], dependencies=[Depends(provide_current_user)])
+events_router = APIRouter(prefix="/events", tags=["Events"], dependencies=[Depends(provide_access_claims)])
 
 
-@events_router.get("/", response_model=list[EventRecord])
+@events_router.get("/", response_model=list[EventExpandedRecord | EventRecord])
 async def list_events_route(
-    params: Annotated[EventListParams, Depends()],
-    session: AsyncSession = Depends(provide_session),
-) -> list[EventRecord]:
-    return await list_events(session=session, params=params)
+    params: Annotated[EventListParams, Query()],
+    request: Request,
+    response: Response,
+    session: AsyncSession = Depends(provide_session, scope="function"),
+) -> list[EventRecord] | Response:
+    # Версию считаем до выборки: если строки изменятся между запросами, тело окажется новее ETag, а не наоборот.
+    version = await get_event_list_version(session=session, params=params)
+    if is_not_modified(request=request, version=version):
+        return not_modified_response(version=version)
+    records = await list_events(session=session, params=params)
+    set_version_headers(response=response, version=version)
+    set_next_cursor_header(
+        response=response,
+        items=records,
+        limit=params.limit,
+        leading_attributes=("search_rank",) if params.q else (),
+    )
+    return records
 
 
 @events_router.post("/", response_model=EventRecord, status_code=status.HTTP_201_CREATED)
 async def create_event_route(
     payload: EventCreatePayload,
-    session: AsyncSession = Depends(provide_session),
+    session: AsyncSession = Depends(provide_session, scope="function"),
 ) -> EventRecord:
     return await create_event(session=session, payload=payload)
 
@@ -78,15 +105,28 @@ async def create_event_route(
 @events_router.get("/categories", response_model=list[EventCategoryRecord])
 async def list_event_categories_route(
     params: Annotated[EventCategoryListParams, Depends()],
-    session: AsyncSession = Depends(provide_session),
-) -> list[EventCategoryRecord]:
-    return await list_event_categories(session=session, params=params)
+    request: Request,
+    response: Response,
+    session: AsyncSession = Depends(provide_session, scope="function"),
+) -> list[EventCategoryRecord] | Response:
+    version = await get_event_category_list_version(session=session, params=params)
+    if is_not_modified(request=request, version=version):
+        return not_modified_response(version=version)
+    records = await list_event_categories(session=session, params=params)
+    set_version_headers(response=response, version=version)
+    set_next_cursor_header(
+        response=response,
+        items=records,
+        limit=params.limit,
+        leading_attributes=("search_rank",) if params.name else (),
+    )
+    return records
 
 
 @events_router.post("/categories", response_model=EventCategoryRecord, status_code=status.HTTP_201_CREATED)
 async def create_event_category_route(
     payload: EventCategoryCreatePayload,
-    session: AsyncSession = Depends(provide_session),
+    session: AsyncSession = Depends(provide_session, scope="function"),
 ) -> EventCategoryRecord:
     return await create_event_category(session=session, payload=payload)
 
@@ -94,9 +134,12 @@ async def create_event_category_route(
 @events_router.get("/category-mappings", response_model=list[EventCategoryMappingRecord])
 async def list_event_category_mappings_route(
     params: Annotated[EventCategoryMappingListParams, Depends()],
-    session: AsyncSession = Depends(provide_session),
+    response: Response,
+    session: AsyncSession = Depends(provide_session, scope="function"),
 ) -> list[EventCategoryMappingRecord]:
-    return await list_event_category_mappings(session=session, params=params)
+    records = await list_event_category_mappings(session=session, params=params)
+    set_next_cursor_header(response=response, items=records, limit=params.limit)
+    return records
 
 
 @events_router.post(
@@ -106,7 +149,7 @@ async def list_event_category_mappings_route(
 )
 async def create_event_category_mapping_route(
     payload: EventCategoryMappingCreatePayload,
-    session: AsyncSession = Depends(provide_session),
+    session: AsyncSession = Depends(provide_session, scope="function"),
 ) -> EventCategoryMappingRecord:
     return await create_event_category_mapping(session=session, payload=payload)
 
@@ -114,9 +157,12 @@ async def create_event_category_mapping_route(
 @events_router.get("/registrations", response_model=list[EventRegistrationRecord])
 async def list_event_registrations_route(
     params: Annotated[EventRegistrationListParams, Depends()],
-    session: AsyncSession = Depends(provide_session),
+    response: Response,
+    session: AsyncSession = Depends(provide_session, scope="function"),
 ) -> list[EventRegistrationRecord]:
-    return await list_event_registrations(session=session, params=params)
+    records = await list_event_registrations(session=session, params=params)
+    set_next_cursor_header(response=response, items=records, limit=params.limit)
+    return records
 
 
 @events_router.post(
@@ -126,17 +172,28 @@ async def list_event_registrations_route(
 )
 async def create_event_registration_route(
     payload: EventRegistrationCreatePayload,
-    session: AsyncSession = Depends(provide_session),
+    session: AsyncSession = Depends(provide_session, scope="function"),
 ) -> EventRegistrationRecord:
     return await create_event_registration(session=session, payload=payload)
 
 
+@events_router.post("/registrations/bulk", response_model=list[EventRegistrationBulkResult])
+async def create_event_registrations_bulk_route(
+    payload: EventRegistrationBulkCreatePayload,
+    session: AsyncSession = Depends(provide_session, scope="function"),
+) -> list[EventRegistrationBulkResult]:
+    return await create_event_registrations_bulk(session=session, payload=payload)
+
+
 @events_router.get("/applications", response_model=list[EventApplicationRecord])
 async def list_event_applications_route(
     params: Annotated[EventApplicationListParams, Depends()],
-    session: AsyncSession = Depends(provide_session),
+    response: Response,
+    session: AsyncSession = Depends(provide_session, scope="function"),
 ) -> list[EventApplicationRecord]:
-    return await list_event_applications(session=session, params=params)
+    records = await list_event_applications(session=session, params=params)
+    set_next_cursor_header(response=response, items=records, limit=params.limit)
+    return records
 
 
 @events_router.post(
@@ -146,24 +203,40 @@ async def list_event_applications_route(
 )
 async def create_event_application_route(
     payload: EventApplicationCreatePayload,
-    session: AsyncSession = Depends(provide_session),
+    session: AsyncSession = Depends(provide_session, scope="function"),
 ) -> EventApplicationRecord:
     return await create_event_application(session=session, payload=payload)
 
 
-@events_router.get("/{event_id}", response_model=EventRecord)
+@events_router.post("/applications/bulk", response_model=list[EventApplicationBulkResult])
+async def create_event_applications_bulk_route(
+    payload: EventApplicationBulkCreatePayload,
+    session: AsyncSession = Depends(provide_session, scope="function"),
+) -> list[EventApplicationBulkResult]:
+    return await create_event_applications_bulk(session=session, payload=payload)
+
+
+@events_router.get("/{event_id}", response_model=EventExpandedRecord | EventRecord)
 async def get_event_route(
     event_id: UUID,
-    session: AsyncSession = Depends(provide_session),
-) -> EventRecord:
-    return await get_event(session=session, event_id=event_id)
+    params: Annotated[EventReadParams, Depends()],
+    request: Request,
+    response: Response,
+    session: AsyncSession = Depends(provide_session, scope="function"),
+) -> EventRecord | Response:
+    version = await get_event_version(session=session, event_id=event_id, params=params)
+    if is_not_modified(request=request, version=version):
+        return not_modified_response(version=version)
+    record = await get_event(session=session, event_id=event_id, params=params)
+    set_version_headers(response=response, version=version)
+    return record
 
 
 @events_router.put("/{event_id}", response_model=EventRecord)
 async def update_event_route(
     event_id: UUID,
     payload: EventUpdatePayload,
-    session: AsyncSession = Depends(provide_session),
+    session: AsyncSession = Depends(provide_session, scope="function"),
 ) -> EventRecord:
     return await update_event(session=session, event_id=event_id, payload=payload)
 
@@ -171,7 +244,7 @@ async def update_event_route(
 @events_router.delete("/{event_id}", response_model=EventRecord)
 async def delete_event_route(
     event_id: UUID,
-    session: AsyncSession = Depends(provide_session),
+    session: AsyncSession = Depends(provide_session, scope="function"),
 ) -> EventRecord:
     return await delete_event(session=session, event_id=event_id)
 
@@ -179,7 +252,7 @@ async def delete_event_route(
 @events_router.get("/categories/{category_id}", response_model=EventCategoryRecord)
 async def get_event_category_route(
     category_id: UUID,
-    session: AsyncSession = Depends(provide_session),
+    session: AsyncSession = Depends(provide_session, scope="function"),
 ) -> EventCategoryRecord:
     return await get_event_category(session=session, category_id=category_id)
 
@@ -188,7 +261,7 @@ async def get_event_category_route(
 async def update_event_category_route(
     category_id: UUID,
     payload: EventCategoryUpdatePayload,
-    session: AsyncSession = Depends(provide_session),
+    session: AsyncSession = Depends(provide_session, scope="function"),
 ) -> EventCategoryRecord:
     return await update_event_category(session=session, category_id=category_id, payload=payload)
 
@@ -196,7 +269,7 @@ async def update_event_category_route(
 @events_router.delete("/categories/{category_id}", response_model=EventCategoryRecord)
 async def delete_event_category_route(
     category_id: UUID,
-    session: AsyncSession = Depends(provide_session),
+    session: AsyncSession = Depends(provide_session, scope="function"),
 ) -> EventCategoryRecord:
     return await delete_event_category(session=session, category_id=category_id)
 
@@ -204,7 +277,7 @@ async def delete_event_category_route(
 @events_router.get("/category-mappings/{mapping_id}", response_model=EventCategoryMappingRecord)
 async def get_event_category_mapping_route(
     mapping_id: UUID,
-    session: AsyncSession = Depends(provide_session),
+    session: AsyncSession = Depends(provide_session, scope="function"),
 ) -> EventCategoryMappingRecord:
     return await get_event_category_mapping(session=session, mapping_id=mapping_id)
 
@@ -213,7 +286,7 @@ async def get_event_category_mapping_route(
 async def update_event_category_mapping_route(
     mapping_id: UUID,
     payload: EventCategoryMappingUpdatePayload,
-    session: AsyncSession = Depends(provide_session),
+    session: AsyncSession = Depends(provide_session, scope="function"),
 ) -> EventCategoryMappingRecord:
     return await update_event_category_mapping(
         session=session,
@@ -225,7 +298,7 @@ async def update_event_category_mapping_route(
 @events_router.delete("/category-mappings/{mapping_id}", response_model=EventCategoryMappingRecord)
 async def delete_event_category_mapping_route(
     mapping_id: UUID,
-    session: AsyncSession = Depends(provide_session),
+    session: AsyncSession = Depends(provide_session, scope="function"),
 ) -> EventCategoryMappingRecord:
     return await delete_event_category_mapping(session=session, mapping_id=mapping_id)
 
@@ -233,7 +306,7 @@ async def delete_event_category_mapping_route(
 @events_router.get("/registrations/{registration_id}", response_model=EventRegistrationRecord)
 async def get_event_registration_route(
     registration_id: UUID,
-    session: AsyncSession = Depends(provide_session),
+    session: AsyncSession = Depends(provide_session, scope="function"),
 ) -> EventRegistrationRecord:
     return await get_event_registration(session=session, registration_id=registration_id)
 
@@ -242,7 +315,7 @@ async def get_event_registration_route(
 async def update_event_registration_route(
     registration_id: UUID,
     payload: EventRegistrationUpdatePayload,
-    session: AsyncSession = Depends(provide_session),
+    session: AsyncSession = Depends(provide_session, scope="function"),
 ) -> EventRegistrationRecord:
     return await update_event_registration(
         session=session,
@@ -254,7 +327,7 @@ async def update_event_registration_route(
 @events_router.delete("/registrations/{registration_id}", response_model=EventRegistrationRecord)
 async def delete_event_registration_route(
     registration_id: UUID,
-    session: AsyncSession = Depends(provide_session),
+    session: AsyncSession = Depends(provide_session, scope="function"),
 ) -> EventRegistrationRecord:
     return await delete_event_registration(session=session, registration_id=registration_id)
 
@@ -262,7 +335,7 @@ async def delete_event_registration_route(
 @events_router.get("/applications/{application_id}", response_model=EventApplicationRecord)
 async def get_event_application_route(
     application_id: UUID,
-    session: AsyncSession = Depends(provide_session),
+    session: AsyncSession = Depends(provide_session, scope="function"),
 ) -> EventApplicationRecord:
     return await get_event_application(session=session, application_id=application_id)
 
@@ -271,7 +344,7 @@ async def get_event_application_route(
 async def update_event_application_route(
     application_id: UUID,
     payload: EventApplicationUpdatePayload,
-    session: AsyncSession = Depends(provide_session),
+    session: AsyncSession = Depends(provide_session, scope="function"),
 ) -> EventApplicationRecord:
     return await update_event_application(
         session=session,
@@ -283,7 +356,7 @@ async def update_event_application_route(
 @events_router.delete("/applications/{application_id}", response_model=EventApplicationRecord)
 async def delete_event_application_route(
     application_id: UUID,
-    session: AsyncSession = Depends(provide_session),
+    session: AsyncSession = Depends(provide_session, scope="function"),
 ) -> EventApplicationRecord:
     return await delete_event_application(session=session, application_id=application_id)
 
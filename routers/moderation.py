@@ -1,11 +1,12 @@
 from typing import Annotated
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.dependencies import provide_session, provide_user_with_roles
 from core.enums import UserRole
+from routers.pagination import set_next_cursor_header
 from schemas.moderation import (
     ApplicationHistoryCreatePayload,
     ApplicationHistoryListParams,
@@ -40,9 +41,12 @@ moderation_router = APIRouter(
 @moderation_router.get("/event-history", response_model=list[EventModerationHistoryRecord])
 async def list_event_moderation_history_route(
     params: Annotated[EventModerationHistoryListParams, Depends()],
-    session: AsyncSession = Depends(provide_session),
+    response: Response,
+    session: AsyncSession = Depends(provide_session, scope="function"),
 ) -> list[EventModerationHistoryRecord]:
-    return await list_event_moderation_history(session=session, params=params)
+    records = await list_event_moderation_history(session=session, params=params)
+    set_next_cursor_header(response=response, items=records, limit=params.limit)
+    return records
 
 
 @moderation_router.post(
@@ -52,7 +56,7 @@ async def list_event_moderation_history_route(
 )
 async def create_event_moderation_history_route(
     payload: EventModerationHistoryCreatePayload,
-    session: AsyncSession = Depends(provide_session),
+    session: AsyncSession = Depends(provide_session, scope="function"),
 ) -> EventModerationHistoryRecord:
     return await create_event_moderation_history(session=session, payload=payload)
 
@@ -60,9 +64,12 @@ async def create_event_moderation_history_route(
 @moderation_router.get("/application-history", response_model=list[ApplicationHistoryRecord])
 async def list_application_history_route(
     params: Annotated[ApplicationHistoryListParams, Depends()],
-    session: AsyncSession = Depends(provide_session),
+    response: Response,
+    session: AsyncSession = Depends(provide_session, scope="function"),
 ) -> list[ApplicationHistoryRecord]:
-    return await list_application_history(session=session, params=params)
+    records = await list_application_history(session=session, params=params)
+    set_next_cursor_header(response=response, items=records, limit=params.limit)
+    return records
 
 
 @moderation_router.post(
@@ -72,7 +79,7 @@ async def list_application_history_route(
 )
 async def create_application_history_route(
     payload: ApplicationHistoryCreatePayload,
-    session: AsyncSession = Depends(provide_session),
+    session: AsyncSession = Depends(provide_session, scope="function"),
 ) -> ApplicationHistoryRecord:
     return await create_application_history(session=session, payload=payload)
 
@@ -80,7 +87,7 @@ async def create_application_history_route(
 @moderation_router.get("/event-history/{history_id}", response_model=EventModerationHistoryRecord)
 async def get_event_moderation_history_route(
     history_id: UUID,
-    session: AsyncSession = Depends(provide_session),
+    session: AsyncSession = Depends(provide_session, scope="function"),
 ) -> EventModerationHistoryRecord:
     return await get_event_moderation_history(session=session, history_id=history_id)
 
@@ -89,7 +96,7 @@ async def get_event_moderation_history_route(
 async def update_event_moderation_history_route(
     history_id: UUID,
     payload: EventModerationHistoryUpdatePayload,
-    session: AsyncSession = Depends(provide_session),
+    session: AsyncSession = Depends(provide_session, scope="function"),
 ) -> EventModerationHistoryRecord:
     return await update_event_moderation_history(
         session=session,
@@ -101,7 +108,7 @@ async def update_event_moderation_history_route(
 @moderation_router.delete("/event-history/{history_id}", response_model=EventModerationHistoryRecord)
 async def delete_event_moderation_history_route(
     history_id: UUID,
-    session: AsyncSession = Depends(provide_session),
+    session: AsyncSession = Depends(provide_session, scope="function"),
 ) -> EventModerationHistoryRecord:
     return await delete_event_moderation_history(session=session, history_id=history_id)
 
@@ -109,7 +116,7 @@ async def delete_event_moderation_history_route(
 @moderation_router.get("/application-history/{history_id}", response_model=ApplicationHistoryRecord)
 async def get_application_history_route(
     history_id: UUID,
-    session: AsyncSession = Depends(provide_session),
+    session: AsyncSession = Depends(provide_session, scope="function"),
 ) -> ApplicationHistoryRecord:
     return await get_application_history(session=session, history_id=history_id)
 
@@ -118,7 +125,7 @@ async def get_application_history_route(
 async def update_application_history_route(
     history_id: UUID,
     payload: ApplicationHistoryUpdatePayload,
-    session: AsyncSession = Depends(provide_session),
+    session: AsyncSession = Depends(provide_session, scope="function"),
 ) -> ApplicationHistoryRecord:
     return await update_application_history(
         session=session,
@@ -130,7 +137,7 @@ async def update_application_history_route(
 @moderation_router.delete("/application-history/{history_id}", response_model=ApplicationHistoryRecord)
 async def delete_application_history_route(
     history_id: UUID,
-    session: AsyncSession = Depends(provide_session),
+    session: AsyncSession = Depends(provide_session, scope="function"),
 ) -> ApplicationHistoryRecord:
     return await delete_application_history(session=session, history_id=history_id)
 
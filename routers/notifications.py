@@ -1,61 +1,117 @@
 from typing import Annotated
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Header, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from core.dependencies import provide_current_user, provide_session
+from core.dependencies import provide_access_claims, provide_session
+from schemas.auth import AccessTokenClaims
+from routers.pagination import set_next_cursor_header
 from schemas.notifications import (
+    NotificationBulkPayload,
+    NotificationBulkResult,
     NotificationCreatePayload,
     NotificationListParams,
     NotificationRecord,
+    NotificationUnreadCountRecord,
     NotificationUpdatePayload,
 )
+from services.notification_stream import open_stream_cursor, stream_notifications
 from services.notifications import (
     create_notification,
     delete_notification,
+    delete_notifications,
     get_notification,
+    get_unread_count,
     list_notifications,
+    mark_notifications_read,
     update_notification,
 )
 
 
-notifications_router = APIRouter(prefix="/notifications", tags=["Notifications"], dependencies=[Depends(provide_current_user)])
+notifications_router = APIRouter(prefix="/notifications", tags=["Notifications"], dependencies=[Depends(provide_access_claims)])
 
 
 @notifications_router.get("/", response_model=list[NotificationRecord])
 async def list_notifications_route(
     params: Annotated[NotificationListParams, Depends()],
-    session: AsyncSession = Depends(provide_session),
+    response: Response,
+    session: AsyncSession = Depends(provide_session, scope="function"),
 ) -> list[NotificationRecord]:
-    return await list_notifications(session=session, params=params)
+    records = await list_notifications(session=session, params=params)
+    set_next_cursor_header(response=response, items=records, limit=params.limit)
+    return records
 
 
 @notifications_router.post("/", response_model=NotificationRecord, status_code=status.HTTP_201_CREATED)
 async def create_notification_route(
     payload: NotificationCreatePayload,
-    session: AsyncSession = Depends(provide_session),
+    session: AsyncSession = Depends(provide_session, scope="function"),
 ) -> NotificationRecord:
     return await create_notification(session=session, payload=payload)
 
 
+@notifications_router.post("/mark-read", response_model=NotificationBulkResult)
+async def mark_notifications_read_route(
+    payload: NotificationBulkPayload,
+    claims: AccessTokenClaims = Depends(provide_access_claims),
+    session: AsyncSession = Depends(provide_session, scope="function"),
+) -> NotificationBulkResult:
+    return await mark_notifications_read(session=session, payload=payload, caller_id=claims.sub)
+
+
+@notifications_router.post("/bulk-delete", response_model=NotificationBulkResult)
+async def delete_notifications_route(
+    payload: NotificationBulkPayload,
+    claims: AccessTokenClaims = Depends(provide_access_claims),
+    session: AsyncSession = Depends(provide_session, scope="function"),
+) -> NotificationBulkResult:
+    return await delete_notifications(session=session, payload=payload, caller_id=claims.sub)
+
+
+@notifications_router.get("/unread-count", response_model=NotificationUnreadCountRecord)
+async def get_unread_count_route(
+    user_id: UUID,
+    session: AsyncSession = Depends(provide_session, scope="function"),
+) -> NotificationUnreadCountRecord:
+    return await get_unread_count(session=session, user_id=user_id)
+
+
+@notifications_router.get("/stream", response_class=StreamingResponse)
+async def stream_notifications_route(
+    claims: AccessTokenClaims = Depends(provide_access_claims),
+    last_event_id: Annotated[str | None, Header()] = None,
+) -> StreamingResponse:
+    # Курсор разбирается до начала потока, чтобы неверный Last-Event-ID вернул 400, а не оборванный ответ.
+    cursor = await open_stream_cursor(user_id=claims.sub, last_event_id=last_event_id)
+    return StreamingResponse(
+        stream_notifications(claims=claims, cursor=cursor),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @notifications_router.get("/{notification_id}", response_model=NotificationRecord)
 async def get_notification_route(
     notification_id: UUID,
-    session: AsyncSession = Depends(provide_session),
+    claims: AccessTokenClaims = Depends(provide_access_claims),
+    session: AsyncSession = Depends(provide_session, scope="function"),
 ) -> NotificationRecord:
-    return await get_notification(session=session, notification_id=notification_id)
+    return await get_notification(session=session, notification_id=notification_id, user_id=claims.sub)
 
 
 @notifications_router.put("/{notification_id}", response_model=NotificationRecord)
 async def update_notification_route(
     notification_id: UUID,
     payload: NotificationUpdatePayload,
-    session: AsyncSession = Depends(provide_session),
+    claims: AccessTokenClaims = Depends(provide_access_claims),
+    session: AsyncSession = Depends(provide_session, scope="function"),
 ) -> NotificationRecord:
     return await update_notification(
         session=session,
         notification_id=notification_id,
+        user_id=claims.sub,
         payload=payload,
     )
 
@@ -63,7 +119,8 @@ async def update_notification_route(
 @notifications_router.delete("/{notification_id}", response_model=NotificationRecord)
 async def delete_notification_route(
     notification_id: UUID,
-    session: AsyncSession = Depends(provide_session),
+    claims: AccessTokenClaims = Depends(provide_access_claims),
+    session: AsyncSession = Depends(provide_session, scope="function"),
 ) -> NotificationRecord:
-    return await delete_notification(session=session, notification_id=notification_id)
+    return await delete_notification(session=session, notification_id=notification_id, user_id=claims.sub)
 
@@ -0,0 +1,21 @@
+from collections.abc import Sequence
+from typing import Any
+
+from fastapi import Response
+
+from services.utils import build_next_cursor
+
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def set_next_cursor_header(
+    *,
+    response: Response,
+    items: Sequence[Any],
+    limit: int,
+    leading_attributes: Sequence[str] = (),
+) -> None:
+    next_cursor = build_next_cursor(items, limit=limit, leading_attributes=leading_attributes)
+    if next_cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
@@ -1,29 +1,63 @@
 from typing import Annotated
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Query, Request, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from core.dependencies import provide_current_user, provide_session
-from schemas.rooms import RoomCreatePayload, RoomListParams, RoomRecord, RoomUpdatePayload
-from services.rooms import create_room, delete_room, get_room, list_rooms, update_room
+from core.dependencies import provide_access_claims, provide_session
+from routers.conditional import is_not_modified, not_modified_response, set_version_headers
+from routers.pagination import set_next_cursor_header
+from schemas.rooms import RoomAvailabilityParams, RoomCreatePayload, RoomListParams, RoomRecord, RoomUpdatePayload
+from services.rooms import (
+    create_room,
+    delete_room,
+    get_room,
+    get_room_list_version,
+    list_available_rooms,
+    list_rooms,
+    update_room,
+)
 
 
-rooms_router = APIRouter(prefix="/rooms", tags=["Rooms"], dependencies=[Depends(provide_current_user)])
+rooms_router = APIRouter(prefix="/rooms", tags=["Rooms"], dependencies=[Depends(provide_access_claims)])
 
 
 @rooms_router.get("/", response_model=list[RoomRecord])
 async def list_rooms_route(
     params: Annotated[RoomListParams, Depends()],
-    session: AsyncSession = Depends(provide_session),
+    request: Request,
+    response: Response,
+    session: AsyncSession = Depends(provide_session, scope="function"),
+) -> list[RoomRecord] | Response:
+    version = await get_room_list_version(session=session, params=params)
+    if is_not_modified(request=request, version=version):
+        return not_modified_response(version=version)
+    records = await list_rooms(session=session, params=params)
+    set_version_headers(response=response, version=version)
+    set_next_cursor_header(
+        response=response,
+        items=records,
+        limit=params.limit,
+        leading_attributes=("search_rank",) if params.name else (),
+    )
+    return records
+
+
+@rooms_router.get("/available", response_model=list[RoomRecord])
+async def list_available_rooms_route(
+    params: Annotated[RoomAvailabilityParams, Query()],
+    response: Response,
+    session: AsyncSession = Depends(provide_session, scope="function"),
 ) -> list[RoomRecord]:
-    return await list_rooms(session=session, params=params)
+    records = await list_available_rooms(session=session, params=params)
+    set_next_cursor_header(response=response, items=records, limit=params.limit)
+    return records
 
 
 @rooms_router.post("/", response_model=RoomRecord, status_code=status.HTTP_201_CREATED)
 async def create_room_route(
     payload: RoomCreatePayload,
-    session: AsyncSession = Depends(provide_session),
+    session: AsyncSession = Depends(provide_session, scope="function"),
 ) -> RoomRecord:
     return await create_room(session=session, payload=payload)
 
@@ -31,7 +65,7 @@ async def create_room_route(
 @rooms_router.get("/{room_id}", response_model=RoomRecord)
 async def get_room_route(
     room_id: UUID,
-    session: AsyncSession = Depends(provide_session),
+    session: AsyncSession = Depends(provide_session, scope="function"),
 ) -> RoomRecord:
     return await get_room(session=session, room_id=room_id)
 
@@ -40,7 +74,7 @@ async def get_room_route(
 async def update_room_route(
     room_id: UUID,
     payload: RoomUpdatePayload,
-    session: AsyncSession = Depends(provide_session),
+    session: AsyncSession = Depends(provide_session, scope="function"),
 ) -> RoomRecord:
     return await update_room(session=session, room_id=room_id, payload=payload)
 
@@ -48,7 +82,7 @@ async def update_room_route(
 @rooms_router.delete("/{room_id}", response_model=RoomRecord)
 async def delete_room_route(
     room_id: UUID,
-    session: AsyncSession = Depends(provide_session),
+    session: AsyncSession = Depends(provide_session, scope="function"),
 ) -> RoomRecord:
     return await delete_room(session=session, room_id=room_id)
 
@@ -1,10 +1,11 @@
 from typing import Annotated
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from core.dependencies import provide_current_user, provide_session
+from core.dependencies import provide_access_claims, provide_session
+from routers.pagination import set_next_cursor_header
 from schemas.users import (
     UserCreatePayload,
     UserListParams,
@@ -30,21 +31,29 @@ from services.users import (
 )
 
 
-users_router = APIRouter(prefix="/users", tags=["Users"], dependencies=[Depends(provide_current_user)])
+users_router = APIRouter(prefix="/users", tags=["Users"], dependencies=[Depends(provide_access_claims)])
 
 
 @users_router.get("/", response_model=list[UserRecord])
 async def list_users_route(
     params: Annotated[UserListParams, Depends()],
-    session: AsyncSession = Depends(provide_session),
+    response: Response,
+    session: AsyncSession = Depends(provide_session, scope="function"),
 ) -> list[UserRecord]:
-    return await list_users(session=session, params=params)
+    records = await list_users(session=session, params=params)
+    set_next_cursor_header(
+        response=response,
+        items=records,
+        limit=params.limit,
+        leading_attributes=("search_rank",) if params.login else (),
+    )
+    return records
 
 
 @users_router.post("/", response_model=UserRecord, status_code=status.HTTP_201_CREATED)
 async def create_user_route(
     payload: UserCreatePayload,
-    session: AsyncSession = Depends(provide_session),
+    session: AsyncSession = Depends(provide_session, scope="function"),
 ) -> UserRecord:
     return await create_user(session=session, payload=payload)
 
@@ -52,15 +61,18 @@ async def create_user_route(
 @users_router.get("/profiles", response_model=list[UserProfileRecord])
 async def list_user_profiles_route(
     params: Annotated[UserProfileListParams, Depends()],
-    session: AsyncSession = Depends(provide_session),
+    response: Response,
+    session: AsyncSession = Depends(provide_session, scope="function"),
 ) -> list[UserProfileRecord]:
-    return await list_user_profiles(session=session, params=params)
+    records = await list_user_profiles(session=session, params=params)
+    set_next_cursor_header(response=response, items=records, limit=params.limit)
+    return records
 
 
 @users_router.post("/profiles", response_model=UserProfileRecord, status_code=status.HTTP_201_CREATED)
 async def create_user_profile_route(
     payload: UserProfileCreatePayload,
-    session: AsyncSession = Depends(provide_session),
+    session: AsyncSession = Depends(provide_session, scope="function"),
 ) -> UserProfileRecord:
     return await create_user_profile(session=session, payload=payload)
 
@@ -68,7 +80,7 @@ async def create_user_profile_route(
 @users_router.get("/{user_id}", response_model=UserRecord)
 async def get_user_route(
     user_id: UUID,
-    session: AsyncSession = Depends(provide_session),
+    session: AsyncSession = Depends(provide_session, scope="function"),
 ) -> UserRecord:
     return await get_user(session=session, user_id=user_id)
 
@@ -77,7 +89,7 @@ async def get_user_route(
 async def update_user_route(
     user_id: UUID,
     payload: UserUpdatePayload,
-    session: AsyncSession = Depends(provide_session),
+    session: AsyncSession = Depends(provide_session, scope="function"),
 ) -> UserRecord:
     return await update_user(session=session, user_id=user_id, payload=payload)
 
@@ -85,7 +97,7 @@ async def update_user_route(
 @users_router.delete("/{user_id}", response_model=UserRecord)
 async def delete_user_route(
     user_id: UUID,
-    session: AsyncSession = Depends(provide_session),
+    session: AsyncSession = Depends(provide_session, scope="function"),
 ) -> UserRecord:
     return await delete_user(session=session, user_id=user_id)
 
@@ -93,7 +105,7 @@ async def delete_user_route(
 @users_router.get("/profiles/{profile_id}", response_model=UserProfileRecord)
 async def get_user_profile_route(
     profile_id: UUID,
-    session: AsyncSession = Depends(provide_session),
+    session: AsyncSession = Depends(provide_session, scope="function"),
 ) -> UserProfileRecord:
     return await get_user_profile(session=session, profile_id=profile_id)
 
@@ -102,7 +114,7 @@ async def get_user_profile_route(
 async def update_user_profile_route(
     profile_id: UUID,
     payload: UserProfileUpdatePayload,
-    session: AsyncSession = Depends(provide_session),
+    session: AsyncSession = Depends(provide_session, scope="function"),
 ) -> UserProfileRecord:
     return await update_user_profile(session=session, profile_id=profile_id, payload=payload)
 
@@ -110,7 +122,7 @@ async def update_user_profile_route(
 @users_router.delete("/profiles/{profile_id}", response_model=UserProfileRecord)
 async def delete_user_profile_route(
     profile_id: UUID,
-    session: AsyncSession = Depends(provide_session),
+    session: AsyncSession = Depends(provide_session, scope="function"),
 ) -> UserProfileRecord:
     return await delete_user_profile(session=session, profile_id=profile_id)
 
@@ -118,7 +130,7 @@ async def delete_user_profile_route(
 @users_router.get("/{user_id}/profile", response_model=UserProfileRecord)
 async def get_user_profile_by_user_route(
     user_id: UUID,
-    session: AsyncSession = Depends(provide_session),
+    session: AsyncSession = Depends(provide_session, scope="function"),
 ) -> UserProfileRecord:
     return await get_user_profile_by_user(session=session, user_id=user_id)
 
@@ -1,3 +1,4 @@
+import datetime
 from uuid import UUID
 
 from pydantic import BaseModel
@@ -12,14 +13,26 @@ class LoginPayload(BaseModel):
 
 class TokenPayload(BaseModel):
     access_token: str
+    refresh_token: str
     token_type: str = "bearer"
+    expires_in: int
     user_id: UUID
 
 
+class RefreshPayload(BaseModel):
+    refresh_token: str
+
+
+class AccessTokenClaims(BaseModel):
+    sub: UUID
+    role: UserRole
+    ver: int
+    exp: datetime.datetime
+
+
 class RegisterPayload(BaseModel):
     login: str
     password: str
     role: UserRole = UserRole.STUDENT
     telegram_username: str | None = None
     telegram_chat_id: str | None = None
-
@@ -3,7 +3,9 @@ from uuid import UUID
 
 from pydantic import BaseModel, ConfigDict, Field
 
-from core.enums import ApplicationStatus, EventStatus, EventType
+from core.enums import ApplicationStatus, BulkItemStatus, CategoryMatch, EventStatus, EventType
+from schemas.rooms import RoomRecord
+from schemas.users import UserRecord
 
 
 class EventCreatePayload(BaseModel):
@@ -29,7 +31,6 @@ class EventUpdatePayload(BaseModel):
     event_date: datetime.date | None = None
     start_time: datetime.time | None = None
     end_time: datetime.time | None = None
-    registered_count: int | None = None
     max_participants: int | None = None
     status: EventStatus | None = None
     event_type: EventType | None = None
@@ -44,6 +45,7 @@ class EventUpdatePayload(BaseModel):
 class EventListParams(BaseModel):
     offset: int = Field(0, ge=0)
     limit: int = Field(100, ge=1, le=500)
+    cursor: str | None = None
     status: EventStatus | None = None
     event_type: EventType | None = None
     creator_id: UUID | None = None
@@ -51,6 +53,14 @@ class EventListParams(BaseModel):
     room_id: UUID | None = None
     date_from: datetime.date | None = None
     date_to: datetime.date | None = None
+    category_id: list[UUID] = Field(default_factory=list)
+    category_match: CategoryMatch = CategoryMatch.ANY
+    q: str | None = None
+    expand: str | None = None
+
+
+class EventReadParams(BaseModel):
+    expand: str | None = None
 
 
 class EventRecord(BaseModel):
@@ -74,6 +84,7 @@ class EventRecord(BaseModel):
     created_at: datetime.datetime
     updated_at: datetime.datetime | None
     moderation_comment: str | None = None
+    search_rank: float | None = None
 
 
 class EventCategoryCreatePayload(BaseModel):
@@ -91,6 +102,7 @@ class EventCategoryUpdatePayload(BaseModel):
 class EventCategoryListParams(BaseModel):
     offset: int = Field(0, ge=0)
     limit: int = Field(100, ge=1, le=500)
+    cursor: str | None = None
     name: str | None = None
 
 
@@ -102,6 +114,14 @@ class EventCategoryRecord(BaseModel):
     color: str | None
     created_at: datetime.datetime
     updated_at: datetime.datetime | None
+    search_rank: float | None = None
+
+
+class EventExpandedRecord(EventRecord):
+    categories: list[EventCategoryRecord] | None = None
+    room: RoomRecord | None = None
+    curator: UserRecord | None = None
+    creator: UserRecord | None = None
 
 
 class EventCategoryMappingCreatePayload(BaseModel):
@@ -117,6 +137,7 @@ class EventCategoryMappingUpdatePayload(BaseModel):
 class EventCategoryMappingListParams(BaseModel):
     offset: int = Field(0, ge=0)
     limit: int = Field(100, ge=1, le=500)
+    cursor: str | None = None
     event_id: UUID | None = None
     category_id: UUID | None = None
 
@@ -136,6 +157,10 @@ class EventRegistrationCreatePayload(BaseModel):
     comment: str | None = None
 
 
+class EventRegistrationBulkCreatePayload(BaseModel):
+    items: list[EventRegistrationCreatePayload] = Field(min_length=1, max_length=1000)
+
+
 class EventRegistrationUpdatePayload(BaseModel):
     comment: str | None = None
 
@@ -143,6 +168,7 @@ class EventRegistrationUpdatePayload(BaseModel):
 class EventRegistrationListParams(BaseModel):
     offset: int = Field(0, ge=0)
     limit: int = Field(100, ge=1, le=500)
+    cursor: str | None = None
     event_id: UUID | None = None
     user_id: UUID | None = None
 
@@ -164,6 +190,10 @@ class EventApplicationCreatePayload(BaseModel):
     motivation: str | None = None
 
 
+class EventApplicationBulkCreatePayload(BaseModel):
+    items: list[EventApplicationCreatePayload] = Field(min_length=1, max_length=1000)
+
+
 class EventApplicationUpdatePayload(BaseModel):
     status: ApplicationStatus | None = None
     motivation: str | None = None
@@ -172,6 +202,7 @@ class EventApplicationUpdatePayload(BaseModel):
 class EventApplicationListParams(BaseModel):
     offset: int = Field(0, ge=0)
     limit: int = Field(100, ge=1, le=500)
+    cursor: str | None = None
     event_id: UUID | None = None
     applicant_id: UUID | None = None
     status: ApplicationStatus | None = None
@@ -187,3 +218,16 @@ class EventApplicationRecord(BaseModel):
     created_at: datetime.datetime
     updated_at: datetime.datetime | None
 
+
+class EventRegistrationBulkResult(BaseModel):
+    event_id: UUID
+    user_id: UUID
+    status: BulkItemStatus
+    registration: EventRegistrationRecord | None = None
+
+
+class EventApplicationBulkResult(BaseModel):
+    event_id: UUID
+    applicant_id: UUID
+    status: BulkItemStatus
+    application: EventApplicationRecord | None = None
@@ -21,6 +21,7 @@ class EventModerationHistoryUpdatePayload(BaseModel):
 class EventModerationHistoryListParams(BaseModel):
     offset: int = Field(0, ge=0)
     limit: int = Field(100, ge=1, le=500)
+    cursor: str | None = None
     event_id: UUID | None = None
     curator_id: UUID | None = None
 
@@ -51,6 +52,7 @@ class ApplicationHistoryUpdatePayload(BaseModel):
 class ApplicationHistoryListParams(BaseModel):
     offset: int = Field(0, ge=0)
     limit: int = Field(100, ge=1, le=500)
+    cursor: str | None = None
     application_id: UUID | None = None
     moderator_id: UUID | None = None
 
@@ -26,11 +26,19 @@ class NotificationUpdatePayload(BaseModel):
 class NotificationListParams(BaseModel):
     offset: int = Field(0, ge=0)
     limit: int = Field(100, ge=1, le=500)
+    cursor: str | None = None
     user_id: UUID | None = None
     type: NotificationType | None = None
     is_read: bool | None = None
 
 
+class NotificationBulkPayload(BaseModel):
+    ids: list[UUID] = Field(default_factory=list, max_length=1000)
+    user_id: UUID | None = None
+    type: NotificationType | None = None
+    before: datetime.datetime | None = None
+
+
 class NotificationRecord(BaseModel):
     model_config = ConfigDict(from_attributes=True)
     id: UUID
@@ -40,6 +48,17 @@ class NotificationRecord(BaseModel):
     message: str
     is_read: bool
     related_event_id: UUID | None
+    is_broadcast: bool = False
     created_at: datetime.datetime
     updated_at: datetime.datetime | None
 
+
+
+class NotificationUnreadCountRecord(BaseModel):
+    user_id: UUID
+    unread_count: int
+
+
+class NotificationBulkResult(BaseModel):
+    affected_count: int
+    notification_ids: list[UUID]
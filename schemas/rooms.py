@@ -24,9 +24,22 @@ class RoomUpdatePayload(BaseModel):
 class RoomListParams(BaseModel):
     offset: int = Field(0, ge=0)
     limit: int = Field(100, ge=1, le=500)
+    cursor: str | None = None
+    name: str | None = None
     is_available: bool | None = None
 
 
+class RoomAvailabilityParams(BaseModel):
+    offset: int = Field(0, ge=0)
+    limit: int = Field(100, ge=1, le=500)
+    cursor: str | None = None
+    date: datetime.date
+    start: datetime.time
+    end: datetime.time
+    min_capacity: int | None = Field(None, ge=1)
+    equipment: list[str] = Field(default_factory=list)
+
+
 class RoomRecord(BaseModel):
     model_config = ConfigDict(from_attributes=True)
     id: UUID
@@ -37,4 +50,5 @@ class RoomRecord(BaseModel):
     is_available: bool
     created_at: datetime.datetime
     updated_at: datetime.datetime | None
+    search_rank: float | None = None
 
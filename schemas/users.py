@@ -26,6 +26,8 @@ class UserUpdatePayload(BaseModel):
 class UserListParams(BaseModel):
     offset: int = Field(0, ge=0)
     limit: int = Field(100, ge=1, le=500)
+    cursor: str | None = None
+    login: str | None = None
     role: UserRole | None = None
 
 
@@ -38,6 +40,7 @@ class UserRecord(BaseModel):
     telegram_chat_id: str | None
     created_at: datetime.datetime
     updated_at: datetime.datetime | None
+    search_rank: float | None = None
 
 
 class UserProfileCreatePayload(BaseModel):
@@ -58,6 +61,7 @@ class UserProfileUpdatePayload(BaseModel):
 class UserProfileListParams(BaseModel):
     offset: int = Field(0, ge=0)
     limit: int = Field(100, ge=1, le=500)
+    cursor: str | None = None
     user_id: UUID | None = None
 
 
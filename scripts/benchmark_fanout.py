@@ -0,0 +1,159 @@
+import argparse
+import asyncio
+import datetime
+import json
+import time
+from typing import TypedDict
+from uuid import UUID
+
+from sqlalchemy import String, cast, delete, func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.database import sessionmanager
+from core.enums import EventStatus, EventType, JobKind, UserRole
+from core.security import hash_password
+from models.event import Event
+from models.job import Job
+from models.notification import BroadcastNotification, Notification
+from models.user import User
+from schemas.events import EventUpdatePayload
+from services.events import notify_students_about_event, update_event
+
+
+BENCHMARK_LOGIN_PREFIX = "bench_fanout_"
+DEFAULT_STUDENT_COUNTS = [1_000, 10_000, 50_000, 100_000, 500_000]
+
+
+class FanoutBenchmarkResult(TypedDict):
+    students: int
+    notifications: int
+    request_seconds: float
+    fanout_seconds: float
+
+
+async def seed_benchmark_students(*, session: AsyncSession, count: int) -> None:
+    await session.execute(
+        text(
+            """
+            INSERT INTO users (id, login, password_hash, role)
+            SELECT gen_random_uuid(), :prefix || 'student_' || n, :password_hash, 'STUDENT'
+            FROM generate_series(1, :count) AS n
+            """
+        ),
+        {
+            "prefix": BENCHMARK_LOGIN_PREFIX,
+            "password_hash": hash_password("benchmark"),
+            "count": count,
+        },
+    )
+    await session.commit()
+
+
+async def seed_benchmark_event(*, session: AsyncSession) -> UUID:
+    curator = User(
+        login=f"{BENCHMARK_LOGIN_PREFIX}curator",
+        password_hash=hash_password("benchmark"),
+        role=UserRole.CURATOR,
+    )
+    session.add(curator)
+    await session.flush()
+    event = Event(
+        title=f"{BENCHMARK_LOGIN_PREFIX}event",
+        description="Мероприятие для замера рассылки уведомлений.",
+        event_date=datetime.date.today() + datetime.timedelta(days=30),
+        start_time=datetime.time(hour=10, minute=0),
+        end_time=datetime.time(hour=12, minute=0),
+        status=EventStatus.PENDING,
+        event_type=EventType.STUDENT,
+        creator_id=curator.id,
+        curator_id=curator.id,
+        is_external_venue=True,
+        external_location="Онлайн",
+    )
+    session.add(event)
+    await session.commit()
+    return event.id
+
+
+async def cleanup_benchmark_data(*, session: AsyncSession) -> None:
+    benchmark_user_ids = select(User.id).where(User.login.startswith(BENCHMARK_LOGIN_PREFIX))
+    benchmark_event_ids = select(cast(Event.id, String)).where(Event.title.startswith(BENCHMARK_LOGIN_PREFIX))
+    await session.execute(delete(Notification).where(Notification.user_id.in_(benchmark_user_ids)))
+    # Задачи рассылки ссылаются на мероприятие только из payload и сами не удаляются вместе с ним
+    await session.execute(
+        delete(Job).where(
+            Job.kind == JobKind.NEW_EVENT_NOTIFICATIONS,
+            Job.payload["event_id"].as_string().in_(benchmark_event_ids),
+        )
+    )
+    await session.execute(delete(Event).where(Event.title.startswith(BENCHMARK_LOGIN_PREFIX)))
+    await session.execute(delete(User).where(User.login.startswith(BENCHMARK_LOGIN_PREFIX)))
+    await session.commit()
+
+
+async def measure_approval(*, student_count: int) -> FanoutBenchmarkResult:
+    if sessionmanager.session_maker is None:
+        raise RuntimeError("Database sessionmaker is not initialized")
+    async with sessionmanager.session_maker() as session:
+        await cleanup_benchmark_data(session=session)
+        await seed_benchmark_students(session=session, count=student_count)
+        event_id = await seed_benchmark_event(session=session)
+    # Одобрение только ставит задачу в очередь, саму рассылку выполняет воркер: замеряем обе части отдельно.
+    async with sessionmanager.session_maker() as session:
+        started_at = time.perf_counter()
+        await update_event(
+            session=session,
+            event_id=event_id,
+            payload=EventUpdatePayload(status=EventStatus.APPROVED),
+        )
+        request_elapsed = time.perf_counter() - started_at
+    async with sessionmanager.session_maker() as session:
+        started_at = time.perf_counter()
+        await notify_students_about_event(session=session, event_id=event_id)
+        await session.commit()
+        fanout_elapsed = time.perf_counter() - started_at
+    async with sessionmanager.session_maker() as session:
+        notification_count = await session.scalar(
+            select(func.count())
+            .select_from(BroadcastNotification)
+            .where(BroadcastNotification.related_event_id == event_id)
+        )
+        await cleanup_benchmark_data(session=session)
+    return {
+        "students": student_count,
+        "notifications": notification_count or 0,
+        "request_seconds": round(request_elapsed, 4),
+        "fanout_seconds": round(fanout_elapsed, 4),
+    }
+
+
+async def main_async(student_counts: list[int]) -> None:
+    results: list[FanoutBenchmarkResult] = []
+    for student_count in student_counts:
+        result = await measure_approval(student_count=student_count)
+        results.append(result)
+        print(
+            f"students={result['students']:>8} "
+            f"notifications={result['notifications']:>8} "
+            f"request={result['request_seconds']:.4f}s "
+            f"fanout={result['fanout_seconds']:.4f}s"
+        )
+    print(json.dumps(results, indent=2))
+    await sessionmanager.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure event approval latency against the number of students.")
+    parser.add_argument(
+        "--students",
+        type=int,
+        nargs="+",
+        default=DEFAULT_STUDENT_COUNTS,
+        help="Student counts to benchmark",
+    )
+    args = parser.parse_args()
+    asyncio.run(main_async(args.students))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+import argparse
+import asyncio
+import json
+import time
+from typing import TypedDict
+
+from core.config import settings
+from services.telegram import FakeTelegramServer, TelegramClient, TelegramMessage
+
+
+class TelegramBenchmarkResult(TypedDict):
+    messages: int
+    chats: int
+    delivered: int
+    failed: int
+    rate_limited_responses: int
+    elapsed_seconds: float
+    messages_per_second: float
+
+
+async def run_benchmark(
+    *,
+    message_count: int,
+    chat_count: int,
+    latency_seconds: float,
+    global_rate: float,
+    per_chat_rate: float,
+    pool_size: int,
+) -> TelegramBenchmarkResult:
+    server = FakeTelegramServer(
+        latency_seconds=latency_seconds,
+        global_rate=global_rate,
+        per_chat_rate=per_chat_rate,
+    )
+    client = TelegramClient(
+        token="benchmark",
+        pool_size=pool_size,
+        global_rate=global_rate,
+        per_chat_rate=per_chat_rate,
+        transport=server.transport,
+    )
+    messages = [
+        TelegramMessage(chat_id=f"chat_{index % chat_count}", text=f"Сообщение {index}")
+        for index in range(message_count)
+    ]
+    started_at = time.perf_counter()
+    results = await client.send_batch(messages)
+    elapsed = time.perf_counter() - started_at
+    await client.aclose()
+    delivered = sum(1 for result in results if result["ok"])
+    return {
+        "messages": message_count,
+        "chats": chat_count,
+        "delivered": delivered,
+        "failed": message_count - delivered,
+        "rate_limited_responses": server.rejected_count,
+        "elapsed_seconds": round(elapsed, 3),
+        "messages_per_second": round(delivered / elapsed, 2) if elapsed else 0.0,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure Telegram delivery throughput against an in-process fake Bot API.")
+    parser.add_argument("--messages", type=int, default=300)
+    parser.add_argument("--chats", type=int, default=100)
+    parser.add_argument("--latency", type=float, default=0.05, help="Simulated Bot API latency in seconds")
+    parser.add_argument("--global-rate", type=float, default=settings.telegram_global_rate_per_second)
+    parser.add_argument("--per-chat-rate", type=float, default=settings.telegram_per_chat_rate_per_second)
+    parser.add_argument("--pool-size", type=int, default=settings.telegram_pool_size)
+    args = parser.parse_args()
+    result = asyncio.run(
+        run_benchmark(
+            message_count=args.messages,
+            chat_count=args.chats,
+            latency_seconds=args.latency,
+            global_rate=args.global_rate,
+            per_chat_rate=args.per_chat_rate,
+            pool_size=args.pool_size,
+        )
+    )
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
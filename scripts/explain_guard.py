@@ -0,0 +1,223 @@
+import argparse
+import asyncio
+import datetime
+import json
+import sys
+from collections.abc import Awaitable, Callable
+from typing import Any, TypedDict
+from uuid import UUID, uuid4
+
+from sqlalchemy import event, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.database import open_session, sessionmanager
+from core.enums import EventStatus
+from models.event import EventCategoryMapping, EventRegistration
+from models.notification import Notification
+from schemas.events import EventListParams, EventRegistrationListParams
+from schemas.notifications import NotificationListParams
+from services.events import _load_rejection_comments, list_event_registrations, list_events
+from services.notifications import list_notifications
+
+
+class GuardFixtures(TypedDict):
+    user_id: UUID
+    event_id: UUID
+    category_id: UUID
+
+
+class ScenarioReport(TypedDict):
+    name: str
+    statements: int
+    used_indexes: list[str]
+    seq_scans: list[str]
+    missing_index: bool
+
+
+ScenarioCall = Callable[[AsyncSession, GuardFixtures], Awaitable[Any]]
+
+
+class GuardScenario(TypedDict):
+    call: ScenarioCall
+    expected_indexes: frozenset[str]
+
+
+def _scenarios() -> dict[str, GuardScenario]:
+    today = datetime.date.today()
+    return {
+        "events_by_status": {
+            "call": lambda session, fixtures: list_events(
+                session=session,
+                params=EventListParams(status=EventStatus.APPROVED, limit=50),
+            ),
+            "expected_indexes": frozenset({"ix_events_status_created_at_id"}),
+        },
+        "events_by_status_and_dates": {
+            "call": lambda session, fixtures: list_events(
+                session=session,
+                params=EventListParams(
+                    status=EventStatus.APPROVED,
+                    date_from=today,
+                    date_to=today + datetime.timedelta(days=30),
+                    limit=50,
+                ),
+            ),
+            "expected_indexes": frozenset(
+                {"ix_events_status_event_date", "ix_events_status_created_at_id", "ix_events_event_date"}
+            ),
+        },
+        "events_by_category": {
+            "call": lambda session, fixtures: list_events(
+                session=session,
+                params=EventListParams(category_id=[fixtures["category_id"]], limit=50),
+            ),
+            "expected_indexes": frozenset(
+                {"ix_event_category_mapping_category_id_event_id", "uq_event_category_mapping_event_id_category_id"}
+            ),
+        },
+        "events_full_text_search": {
+            "call": lambda session, fixtures: list_events(
+                session=session,
+                params=EventListParams(q="мероприятие", limit=50),
+            ),
+            "expected_indexes": frozenset({"ix_events_search_vector"}),
+        },
+        "event_rejection_comments": {
+            "call": lambda session, fixtures: _load_rejection_comments(
+                session=session,
+                event_ids=[fixtures["event_id"]],
+            ),
+            "expected_indexes": frozenset({"ix_event_moderation_history_event_id_action_created_at"}),
+        },
+        "notifications_for_user": {
+            "call": lambda session, fixtures: list_notifications(
+                session=session,
+                params=NotificationListParams(user_id=fixtures["user_id"], limit=50),
+            ),
+            "expected_indexes": frozenset({"ix_notifications_user_id_created_at_id"}),
+        },
+        "unread_notifications_for_user": {
+            "call": lambda session, fixtures: list_notifications(
+                session=session,
+                params=NotificationListParams(user_id=fixtures["user_id"], is_read=False, limit=50),
+            ),
+            "expected_indexes": frozenset({"ix_notifications_user_id_unread"}),
+        },
+        "registrations_for_event": {
+            "call": lambda session, fixtures: list_event_registrations(
+                session=session,
+                params=EventRegistrationListParams(event_id=fixtures["event_id"], limit=50),
+            ),
+            "expected_indexes": frozenset({"uq_event_registrations_event_id_user_id"}),
+        },
+        "registrations_for_user": {
+            "call": lambda session, fixtures: list_event_registrations(
+                session=session,
+                params=EventRegistrationListParams(user_id=fixtures["user_id"], limit=50),
+            ),
+            "expected_indexes": frozenset({"ix_event_registrations_user_id_created_at_id"}),
+        },
+    }
+
+
+async def load_fixtures(*, session: AsyncSession) -> GuardFixtures:
+    user_id = await session.scalar(select(Notification.user_id).limit(1))
+    event_id = await session.scalar(select(EventRegistration.event_id).limit(1))
+    if user_id is None or event_id is None:
+        raise RuntimeError("No seeded data found. Seed first: python -m scripts.seed_data --load-students 2000")
+    # Для плана важна форма фильтра, а не совпадения, поэтому без привязок категорий подойдёт любой id.
+    category_id = await session.scalar(select(EventCategoryMapping.category_id).limit(1))
+    return {"user_id": user_id, "event_id": event_id, "category_id": category_id or uuid4()}
+
+
+async def load_partition_index_parents(*, session: AsyncSession) -> dict[str, str]:
+    # В плане по секционированной таблице фигурируют индексы секций; сверяем их по индексу родителя.
+    result = await session.execute(
+        text(
+            """
+            SELECT child.relname AS child_name, parent.relname AS parent_name
+            FROM pg_inherits
+            JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+            JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+            WHERE child.relkind = 'i'
+            """
+        )
+    )
+    return {row.child_name: row.parent_name for row in result}
+
+
+def collect_plan_nodes(plan: dict[str, Any]) -> list[dict[str, Any]]:
+    nodes = [plan]
+    for child in plan.get("Plans", []):
+        nodes.extend(collect_plan_nodes(child))
+    return nodes
+
+
+async def explain_scenario(*, name: str, scenario: GuardScenario, fixtures: GuardFixtures) -> ScenarioReport:
+    captured: list[tuple[str, Any]] = []
+
+    def capture(_connection, _cursor, statement, parameters, _context, _executemany) -> None:
+        if statement.lstrip().upper().startswith("SELECT"):
+            captured.append((statement, parameters))
+
+    async with open_session() as session:
+        # С выключенным seq scan планировщик выбирает его только тогда, когда подходящего индекса нет вовсе,
+        # поэтому проверка не зависит от объёма данных в базе.
+        await session.execute(text("SET LOCAL enable_seqscan = off"))
+        sync_engine = sessionmanager.primary_engine.sync_engine
+        event.listen(sync_engine, "before_cursor_execute", capture)
+        try:
+            await scenario["call"](session, fixtures)
+        finally:
+            event.remove(sync_engine, "before_cursor_execute", capture)
+        connection = await session.connection()
+        nodes: list[dict[str, Any]] = []
+        for statement, parameters in captured:
+            result = await connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", tuple(parameters or ()))
+            raw_plan = result.scalar_one()
+            plan = json.loads(raw_plan) if isinstance(raw_plan, str) else raw_plan
+            nodes.extend(collect_plan_nodes(plan[0]["Plan"]))
+        index_parents = await load_partition_index_parents(session=session)
+        await session.rollback()
+    used_indexes = {index_parents.get(node["Index Name"], node["Index Name"]) for node in nodes if "Index Name" in node}
+    return {
+        "name": name,
+        "statements": len(captured),
+        "used_indexes": sorted(used_indexes),
+        "seq_scans": sorted({node.get("Relation Name", "?") for node in nodes if node["Node Type"] == "Seq Scan"}),
+        # Индекс с неподходящим ведущим столбцом планировщик тоже обойдёт целиком, поэтому seq scan мало ловить.
+        "missing_index": not used_indexes & scenario["expected_indexes"],
+    }
+
+
+async def main_async(*, scenario_names: list[str]) -> list[ScenarioReport]:
+    scenarios = _scenarios()
+    async with open_session() as session:
+        fixtures = await load_fixtures(session=session)
+    reports = []
+    for name in scenario_names:
+        reports.append(await explain_scenario(name=name, scenario=scenarios[name], fixtures=fixtures))
+    await sessionmanager.close()
+    return reports
+
+
+def main() -> None:
+    scenario_names = list(_scenarios())
+    parser = argparse.ArgumentParser(
+        description=(
+            "Run EXPLAIN for the hot service queries against the seeded database and fail when any of them "
+            "falls back to a sequential scan or stops using its expected index."
+        )
+    )
+    parser.add_argument("--scenarios", nargs="+", choices=scenario_names, default=scenario_names)
+    args = parser.parse_args()
+    reports = asyncio.run(main_async(scenario_names=args.scenarios))
+    print(json.dumps(reports, indent=2, ensure_ascii=False))
+    failed = [report["name"] for report in reports if report["seq_scans"] or report["missing_index"]]
+    if failed:
+        print(f"Index regressions: {', '.join(failed)}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,317 @@
+import argparse
+import asyncio
+import datetime
+import json
+import random
+import subprocess
+import time
+from collections import Counter
+from collections.abc import Awaitable, Callable
+from typing import TypedDict
+from uuid import UUID
+
+import httpx
+from sqlalchemy import select
+
+from core.database import POOL_MAX_OVERFLOW, POOL_SIZE, sessionmanager
+from core.security import PasswordHasherMetrics, password_hasher
+from models.event import Event
+from scripts.seed_data import LOAD_EVENT_TITLE_PREFIX, LOAD_STUDENT_LOGIN_PREFIX, LOAD_STUDENT_PASSWORD
+
+
+SCENARIOS = ["events", "registrations", "notifications", "login"]
+POOL_SAMPLE_INTERVAL_SECONDS = 0.01
+
+
+class LoadTestUser(TypedDict):
+    login: str
+    user_id: str
+    token: str
+
+
+class LatencySummary(TypedDict):
+    p50: float
+    p95: float
+    p99: float
+    max: float
+    mean: float
+
+
+class PoolSummary(TypedDict):
+    capacity: int
+    max_checked_out: int
+    mean_checked_out: float
+    saturated_ratio: float
+
+
+class ScenarioResult(TypedDict):
+    requests: int
+    errors: int
+    status_counts: dict[str, int]
+    throughput_rps: float
+    latency_ms: LatencySummary
+    pool: PoolSummary | None
+
+
+class LoadTestReport(TypedDict):
+    commit: str | None
+    started_at: str
+    target: str
+    concurrency: int
+    duration_seconds: float
+    scenarios: dict[str, ScenarioResult]
+    password_hasher: PasswordHasherMetrics | None
+
+
+ScenarioRequest = Callable[[httpx.AsyncClient, LoadTestUser], Awaitable[httpx.Response]]
+
+
+class ScenarioContext:
+    def __init__(self, *, event_ids: list[str]):
+        self.event_ids = event_ids
+
+    async def list_events(self, client: httpx.AsyncClient, user: LoadTestUser) -> httpx.Response:
+        return await client.get("/events/", params={"limit": 50}, headers=_auth_headers(user))
+
+    async def register(self, client: httpx.AsyncClient, user: LoadTestUser) -> httpx.Response:
+        return await client.post(
+            "/events/registrations",
+            json={"event_id": random.choice(self.event_ids), "user_id": user["user_id"]},
+            headers=_auth_headers(user),
+        )
+
+    async def list_notifications(self, client: httpx.AsyncClient, user: LoadTestUser) -> httpx.Response:
+        return await client.get(
+            "/notifications/",
+            params={"user_id": user["user_id"], "limit": 20},
+            headers=_auth_headers(user),
+        )
+
+    async def login(self, client: httpx.AsyncClient, user: LoadTestUser) -> httpx.Response:
+        return await client.post("/auth/login", json={"login": user["login"], "password": LOAD_STUDENT_PASSWORD})
+
+    def request_for(self, scenario: str) -> ScenarioRequest:
+        return {
+            "events": self.list_events,
+            "registrations": self.register,
+            "notifications": self.list_notifications,
+            "login": self.login,
+        }[scenario]
+
+
+class PoolSampler:
+    """Периодически снимает занятость пула соединений приложения (только для in-process прогона)."""
+
+    def __init__(self):
+        self.samples: list[int] = []
+        self._task: asyncio.Task[None] | None = None
+
+    async def _run(self) -> None:
+        pool = sessionmanager.primary_engine.sync_engine.pool
+        while True:
+            self.samples.append(pool.checkedout())
+            await asyncio.sleep(POOL_SAMPLE_INTERVAL_SECONDS)
+
+    def start(self) -> None:
+        self.samples = []
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> PoolSummary:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        capacity = POOL_SIZE + POOL_MAX_OVERFLOW
+        samples = self.samples or [0]
+        return {
+            "capacity": capacity,
+            "max_checked_out": max(samples),
+            "mean_checked_out": round(sum(samples) / len(samples), 2),
+            "saturated_ratio": round(sum(1 for sample in samples if sample >= capacity) / len(samples), 4),
+        }
+
+
+def _auth_headers(user: LoadTestUser) -> dict[str, str]:
+    return {"Authorization": f"Bearer {user['token']}"}
+
+
+def _percentile(sorted_values: list[float], quantile: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(int(round(quantile * (len(sorted_values) - 1))), len(sorted_values) - 1)
+    return sorted_values[index]
+
+
+def summarize_latencies(latencies: list[float]) -> LatencySummary:
+    sorted_values = sorted(latencies)
+    return {
+        "p50": round(_percentile(sorted_values, 0.50) * 1000, 2),
+        "p95": round(_percentile(sorted_values, 0.95) * 1000, 2),
+        "p99": round(_percentile(sorted_values, 0.99) * 1000, 2),
+        "max": round((sorted_values[-1] if sorted_values else 0.0) * 1000, 2),
+        "mean": round((sum(sorted_values) / len(sorted_values) if sorted_values else 0.0) * 1000, 2),
+    }
+
+
+async def load_event_ids() -> list[str]:
+    if sessionmanager.session_maker is None:
+        raise RuntimeError("Database sessionmaker is not initialized")
+    async with sessionmanager.session_maker() as session:
+        result = await session.scalars(select(Event.id).where(Event.title.startswith(LOAD_EVENT_TITLE_PREFIX)))
+        return [str(event_id) for event_id in result]
+
+
+async def login_users(*, client: httpx.AsyncClient, count: int) -> list[LoadTestUser]:
+    async def login(index: int) -> LoadTestUser:
+        login_name = f"{LOAD_STUDENT_LOGIN_PREFIX}{index}"
+        response = await client.post("/auth/login", json={"login": login_name, "password": LOAD_STUDENT_PASSWORD})
+        response.raise_for_status()
+        body = response.json()
+        return {"login": login_name, "user_id": str(UUID(body["user_id"])), "token": body["access_token"]}
+
+    semaphore = asyncio.Semaphore(20)
+
+    async def limited_login(index: int) -> LoadTestUser:
+        async with semaphore:
+            return await login(index)
+
+    return list(await asyncio.gather(*(limited_login(index) for index in range(1, count + 1))))
+
+
+async def run_scenario(
+    *,
+    client: httpx.AsyncClient,
+    request: ScenarioRequest,
+    users: list[LoadTestUser],
+    concurrency: int,
+    duration_seconds: float,
+    pool_sampler: PoolSampler | None,
+) -> ScenarioResult:
+    latencies: list[float] = []
+    status_counts: Counter[str] = Counter()
+    errors = 0
+    deadline = time.perf_counter() + duration_seconds
+
+    async def virtual_user() -> None:
+        nonlocal errors
+        while time.perf_counter() < deadline:
+            user = random.choice(users)
+            started_at = time.perf_counter()
+            try:
+                response = await request(client, user)
+            except httpx.HTTPError as exc:
+                errors += 1
+                status_counts[type(exc).__name__] += 1
+                continue
+            latencies.append(time.perf_counter() - started_at)
+            status_counts[str(response.status_code)] += 1
+            if response.status_code >= 500:
+                errors += 1
+
+    if pool_sampler is not None:
+        pool_sampler.start()
+    started_at = time.perf_counter()
+    await asyncio.gather(*(virtual_user() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started_at
+    pool_summary = await pool_sampler.stop() if pool_sampler is not None else None
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "status_counts": dict(sorted(status_counts.items())),
+        "throughput_rps": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        "latency_ms": summarize_latencies(latencies),
+        "pool": pool_summary,
+    }
+
+
+def current_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def main_async(
+    *,
+    base_url: str | None,
+    scenarios: list[str],
+    concurrency: int,
+    duration_seconds: float,
+    users_count: int,
+) -> LoadTestReport:
+    if base_url is None:
+        from main import app
+
+        transport: httpx.AsyncBaseTransport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+        target = "in-process"
+    else:
+        transport = httpx.AsyncHTTPTransport(limits=httpx.Limits(max_connections=concurrency))
+        target = base_url
+    report: LoadTestReport = {
+        "commit": current_commit(),
+        "started_at": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "target": target,
+        "concurrency": concurrency,
+        "duration_seconds": duration_seconds,
+        "scenarios": {},
+        "password_hasher": None,
+    }
+    async with httpx.AsyncClient(transport=transport, base_url=base_url or "http://load-test", timeout=30) as client:
+        users = await login_users(client=client, count=users_count)
+        context = ScenarioContext(event_ids=await load_event_ids())
+        # Пул приложения виден только при прогоне в том же процессе; для удалённого стенда смотрите метрики сервера.
+        pool_sampler = PoolSampler() if base_url is None else None
+        for scenario in scenarios:
+            report["scenarios"][scenario] = await run_scenario(
+                client=client,
+                request=context.request_for(scenario),
+                users=users,
+                concurrency=concurrency,
+                duration_seconds=duration_seconds,
+                pool_sampler=pool_sampler,
+            )
+    if base_url is None:
+        report["password_hasher"] = password_hasher.metrics()
+    await sessionmanager.close()
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Drive concurrent traffic against the API and report latency percentiles, throughput and DB pool "
+            "saturation as JSON. Seed the dataset first: python -m scripts.seed_data --load-students 2000"
+        )
+    )
+    parser.add_argument("--base-url", default=None, help="Target a running server instead of the in-process app")
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=SCENARIOS)
+    parser.add_argument("--concurrency", type=int, default=50, help="Concurrent virtual users per scenario")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds to run each scenario")
+    parser.add_argument("--users", type=int, default=200, help="Seeded load-test students to log in as")
+    parser.add_argument("--output", default=None, help="Write the JSON report to this file as well")
+    args = parser.parse_args()
+    report = asyncio.run(
+        main_async(
+            base_url=args.base_url,
+            scenarios=args.scenarios,
+            concurrency=args.concurrency,
+            duration_seconds=args.duration,
+            users_count=args.users,
+        )
+    )
+    serialized = json.dumps(report, indent=2, ensure_ascii=False)
+    print(serialized)
+    if args.output is not None:
+        with open(args.output, "w", encoding="utf-8") as output_file:
+            output_file.write(serialized + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,10 @@
+import argparse
 import asyncio
 import datetime
 from typing import Any, TypedDict
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import select, text
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.database import sessionmanager
@@ -14,6 +15,17 @@ from models.room import Room
 from models.user import User
 
 
+LOAD_STUDENT_LOGIN_PREFIX = "load_student_"
+LOAD_STUDENT_PASSWORD = "load_student_password"
+LOAD_EVENT_TITLE_PREFIX = "Нагрузочное мероприятие "
+
+
+class LoadDatasetPayload(TypedDict):
+    students: int
+    events: int
+    notifications_per_student: int
+
+
 class RoomSeedPayload(TypedDict):
     name: str
     capacity: int
@@ -133,7 +145,82 @@ async def seed_events(
     await session.commit()
 
 
-async def run_seed() -> None:
+async def seed_load_dataset(*, session: AsyncSession, payload: LoadDatasetPayload, curator_id: UUID) -> None:
+    # Данные для scripts.load_test вставляются set-based запросами, чтобы сотни тысяч строк сидились за секунды.
+    await session.execute(
+        text(
+            """
+            INSERT INTO users (id, login, password_hash, role)
+            SELECT gen_random_uuid(), :prefix || n, :password_hash, 'STUDENT'
+            FROM generate_series(1, :count) AS n
+            ON CONFLICT (login) DO NOTHING
+            """
+        ),
+        {
+            "prefix": LOAD_STUDENT_LOGIN_PREFIX,
+            "password_hash": hash_password(LOAD_STUDENT_PASSWORD),
+            "count": payload["students"],
+        },
+    )
+    existing_events = await session.scalar(
+        text("SELECT count(*) FROM events WHERE title LIKE :prefix || '%'"),
+        {"prefix": LOAD_EVENT_TITLE_PREFIX},
+    )
+    # Каждое четвёртое мероприятие маленькое, чтобы нагрузка упиралась и в лимит мест.
+    await session.execute(
+        text(
+            """
+            INSERT INTO events (
+                id, title, description, event_date, start_time, end_time, registered_count, max_participants,
+                status, event_type, creator_id, curator_id, is_external_venue, external_location,
+                need_approve_candidates
+            )
+            SELECT
+                gen_random_uuid(), :prefix || n, 'Мероприятие для нагрузочного тестирования.',
+                CURRENT_DATE + (n % 60), '10:00', '12:00', 0, CASE WHEN n % 4 = 0 THEN 20 ELSE 500 END,
+                'APPROVED', 'STUDENT', :curator_id, :curator_id, true, 'Онлайн', false
+            FROM generate_series(CAST(:first AS integer), CAST(:count AS integer)) AS n
+            """
+        ),
+        {
+            "prefix": LOAD_EVENT_TITLE_PREFIX,
+            "curator_id": curator_id,
+            "first": (existing_events or 0) + 1,
+            "count": payload["events"],
+        },
+    )
+    await session.execute(
+        text(
+            """
+            INSERT INTO notifications (id, user_id, type, title, message, is_read, delivery_status)
+            SELECT gen_random_uuid(), users.id, 'SYSTEM', 'Нагрузочное уведомление ' || n,
+                   'Уведомление для нагрузочного тестирования.', n % 3 = 0, 'SKIPPED'
+            FROM users
+            CROSS JOIN generate_series(1, :count) AS n
+            WHERE users.login LIKE :prefix || '%'
+              AND NOT EXISTS (SELECT 1 FROM notifications WHERE notifications.user_id = users.id)
+            """
+        ),
+        {"prefix": LOAD_STUDENT_LOGIN_PREFIX, "count": payload["notifications_per_student"]},
+    )
+    await session.execute(
+        text(
+            """
+            INSERT INTO notification_counters (id, user_id, unread_count)
+            SELECT gen_random_uuid(), notifications.user_id, count(*)
+            FROM notifications
+            JOIN users ON users.id = notifications.user_id
+            WHERE users.login LIKE :prefix || '%' AND NOT notifications.is_read
+            GROUP BY notifications.user_id
+            ON CONFLICT (user_id) DO UPDATE SET unread_count = EXCLUDED.unread_count, updated_at = now()
+            """
+        ),
+        {"prefix": LOAD_STUDENT_LOGIN_PREFIX},
+    )
+    await session.commit()
+
+
+async def run_seed(load_dataset: LoadDatasetPayload | None = None) -> None:
     if sessionmanager.session_maker is None:
         raise RuntimeError("Database sessionmaker is not initialized")
     async with sessionmanager.session_maker() as session:
@@ -208,13 +295,34 @@ async def run_seed() -> None:
                 },
             ],
         )
-async def main_async() -> None:
-    await run_seed()
+        if load_dataset is not None:
+            await seed_load_dataset(session=session, payload=load_dataset, curator_id=curators["curator_alex"]["id"])
+
+
+async def main_async(load_dataset: LoadDatasetPayload | None) -> None:
+    await run_seed(load_dataset)
     await sessionmanager.close()
 
 
 def main() -> None:
-    asyncio.run(main_async())
+    parser = argparse.ArgumentParser(description="Seed reference data and, optionally, a load-test dataset.")
+    parser.add_argument("--load-students", type=int, default=0, help="Students to create for scripts.load_test")
+    parser.add_argument("--load-events", type=int, default=200, help="Approved events to create for the load dataset")
+    parser.add_argument(
+        "--load-notifications",
+        type=int,
+        default=20,
+        help="Notifications per load-test student",
+    )
+    args = parser.parse_args()
+    load_dataset: LoadDatasetPayload | None = None
+    if args.load_students > 0:
+        load_dataset = {
+            "students": args.load_students,
+            "events": args.load_events,
+            "notifications_per_student": args.load_notifications,
+        }
+    asyncio.run(main_async(load_dataset))
 
 
 if __name__ == "__main__":
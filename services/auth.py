@@ -1,13 +1,27 @@
-from uuid import UUID
+import datetime
+from uuid import UUID, uuid4
 
-from sqlalchemy import select
+from pydantic import ValidationError
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from core.security import create_access_token, decode_access_token, hash_password, verify_password
+from core.config import settings
+from core.security import (
+    create_access_token,
+    decode_access_token,
+    generate_refresh_token,
+    hash_refresh_token,
+    password_hasher,
+    password_needs_rehash,
+)
+from models.token import RefreshToken, TokenRevocation
 from models.user import User
 from services.exceptions import EntityConflictError, EntityNotFoundError, InvalidStateError
+from services.token_revocation import revocation_expires_at, revoked_tokens
+from services.user_cache import get_cached_user, store_cached_user
 from services.utils import load_entity
-from schemas.auth import LoginPayload, RegisterPayload, TokenPayload
+from schemas.auth import AccessTokenClaims, LoginPayload, RefreshPayload, RegisterPayload, TokenPayload
 from schemas.users import UserCreatePayload, UserRecord
 
 
@@ -15,17 +29,53 @@ async def authenticate_user(*, session: AsyncSession, payload: LoginPayload) ->
     user = await session.scalar(select(User).where(User.login == payload.login))
     if user is None:
         raise EntityNotFoundError("User")
-    if not verify_password(payload.password, user.password_hash):
+    # Завершаем читающую транзакцию, чтобы соединение вернулось в пул на время работы KDF.
+    await session.commit()
+    if not await password_hasher.verify(payload.password, user.password_hash):
         raise InvalidStateError("Invalid credentials")
-    token = create_access_token({"sub": str(user.id)})
-    return TokenPayload(access_token=token, user_id=user.id)
+    if password_needs_rehash(user.password_hash):
+        user.password_hash = await password_hasher.hash(payload.password)
+    token_payload = _issue_tokens(session=session, user=user, family_id=uuid4())
+    await session.commit()
+    return token_payload
+
+
+async def refresh_tokens(*, session: AsyncSession, payload: RefreshPayload) -> TokenPayload:
+    token_hash = hash_refresh_token(payload.refresh_token)
+    # Условный UPDATE атомарно погашает токен: из двух параллельных ротаций выиграет только одна.
+    result = await session.execute(
+        update(RefreshToken)
+        .where(
+            RefreshToken.token_hash == token_hash,
+            RefreshToken.revoked_at.is_(None),
+            RefreshToken.expires_at > func.now(),
+        )
+        .values(revoked_at=func.now())
+        .returning(RefreshToken.user_id, RefreshToken.family_id)
+    )
+    rotated = result.first()
+    if rotated is None:
+        # Повторное предъявление погашенного токена означает утечку: отзываем всю цепочку ротаций.
+        await _revoke_refresh_family(session=session, token_hash=token_hash)
+        await session.commit()
+        raise InvalidStateError("Invalid refresh token")
+    user = await load_entity(session=session, model=User, entity_id=rotated.user_id, entity_label="User")
+    token_payload = _issue_tokens(session=session, user=user, family_id=rotated.family_id)
+    await session.commit()
+    return token_payload
+
+
+async def revoke_refresh_token(*, session: AsyncSession, payload: RefreshPayload) -> None:
+    await _revoke_refresh_family(session=session, token_hash=hash_refresh_token(payload.refresh_token))
+    await session.commit()
 
 
 async def register_user(*, session: AsyncSession, payload: RegisterPayload) -> UserRecord:
     existing_user = await session.scalar(select(User).where(User.login == payload.login))
     if existing_user is not None:
         raise EntityConflictError("User login")
-    hashed_password = hash_password(payload.password)
+    await session.commit()
+    hashed_password = await password_hasher.hash(payload.password)
     user_payload = UserCreatePayload(
         login=payload.login,
         password_hash=hashed_password,
@@ -46,15 +96,92 @@ async def register_user(*, session: AsyncSession, payload: RegisterPayload) -> U
     return UserRecord.model_validate(user)
 
 
-async def resolve_current_user(*, session: AsyncSession, token: str) -> UserRecord:
-    payload = decode_access_token(token)
-    subject = payload.get("sub")
-    if subject is None:
-        raise InvalidStateError("Token subject missing")
+def resolve_access_claims(token: str) -> AccessTokenClaims:
     try:
-        user_id = UUID(subject)
-    except ValueError as exc:
-        raise InvalidStateError("Invalid token subject") from exc
+        claims = AccessTokenClaims.model_validate(decode_access_token(token))
+    except ValidationError as exc:
+        raise InvalidStateError("Invalid token") from exc
+    if revoked_tokens.is_revoked(user_id=claims.sub, token_version=claims.ver):
+        raise InvalidStateError("Token revoked")
+    return claims
+
+
+async def resolve_current_user(*, session: AsyncSession, user_id: UUID) -> UserRecord:
+    cached_record = await get_cached_user(user_id=user_id)
+    if cached_record is not None:
+        return cached_record
     user = await load_entity(session=session, model=User, entity_id=user_id, entity_label="User")
-    return UserRecord.model_validate(user)
+    record = UserRecord.model_validate(user)
+    await store_cached_user(record=record)
+    return record
+
 
+async def revoke_user_tokens(
+    *,
+    session: AsyncSession,
+    user: User,
+    revoke_refresh_tokens: bool,
+) -> None:
+    """Делает недействительными выданные пользователю access-токены; коммитит вызывающий код."""
+    user.token_version += 1
+    await _store_token_revocation(session=session, user_id=user.id, min_token_version=user.token_version)
+    if revoke_refresh_tokens:
+        await session.execute(
+            update(RefreshToken)
+            .where(RefreshToken.user_id == user.id, RefreshToken.revoked_at.is_(None))
+            .values(revoked_at=func.now())
+        )
+
+
+async def revoke_deleted_user_tokens(*, session: AsyncSession, user: User) -> None:
+    # Refresh-токены удалятся каскадом вместе с пользователем, остаётся закрыть живые access-токены.
+    await _store_token_revocation(session=session, user_id=user.id, min_token_version=user.token_version + 1)
+
+
+async def prune_auth_tokens(*, session: AsyncSession) -> int:
+    refresh_result = await session.execute(delete(RefreshToken).where(RefreshToken.expires_at <= func.now()))
+    revocation_result = await session.execute(delete(TokenRevocation).where(TokenRevocation.expires_at <= func.now()))
+    return refresh_result.rowcount + revocation_result.rowcount
+
+
+def _issue_tokens(*, session: AsyncSession, user: User, family_id: UUID) -> TokenPayload:
+    access_token = create_access_token({"sub": str(user.id), "role": user.role.value, "ver": user.token_version})
+    refresh_token = generate_refresh_token()
+    session.add(
+        RefreshToken(
+            user_id=user.id,
+            token_hash=hash_refresh_token(refresh_token),
+            family_id=family_id,
+            expires_at=datetime.datetime.now(datetime.timezone.utc)
+            + datetime.timedelta(days=settings.refresh_token_expiration_days),
+        )
+    )
+    return TokenPayload(
+        access_token=access_token,
+        refresh_token=refresh_token,
+        expires_in=settings.jwt_expiration_minutes * 60,
+        user_id=user.id,
+    )
+
+
+async def _revoke_refresh_family(*, session: AsyncSession, token_hash: str) -> None:
+    family_id = select(RefreshToken.family_id).where(RefreshToken.token_hash == token_hash).scalar_subquery()
+    await session.execute(
+        update(RefreshToken)
+        .where(RefreshToken.family_id == family_id, RefreshToken.revoked_at.is_(None))
+        .values(revoked_at=func.now())
+    )
+
+
+async def _store_token_revocation(*, session: AsyncSession, user_id: UUID, min_token_version: int) -> None:
+    expires_at = revocation_expires_at()
+    await session.execute(
+        pg_insert(TokenRevocation)
+        .values(id=uuid4(), user_id=user_id, min_token_version=min_token_version, expires_at=expires_at)
+        .on_conflict_do_update(
+            index_elements=[TokenRevocation.user_id],
+            set_={"min_token_version": min_token_version, "expires_at": expires_at, "updated_at": func.now()},
+        )
+    )
+    # Локальный снимок обновляем сразу, остальные процессы подхватят отзыв при ближайшей синхронизации.
+    revoked_tokens.add(user_id=user_id, min_token_version=min_token_version)
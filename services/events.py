@@ -1,9 +1,16 @@
+from collections import Counter
+from typing import Any
 from uuid import UUID
 
-from sqlalchemy import and_, select
+from sqlalchemy import Select, and_, func, or_, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload, selectinload
+from sqlalchemy.orm.interfaces import ORMOption
+from sqlalchemy.sql.elements import ColumnElement
 
-from core.enums import EventStatus, ModerationAction, NotificationType, UserRole
+from core.enums import BulkItemStatus, CategoryMatch, EventExpansion, EventStatus, JobKind, ModerationAction, NotificationType, UserRole
 from models.event import (
     Event,
     EventCategory,
@@ -12,10 +19,12 @@ from models.event import (
     EventApplication,
 )
 from models.moderation import EventModerationHistory
-from models.notification import Notification
+from models.notification import BroadcastNotification
 from models.room import Room
 from models.user import User
 from schemas.events import (
+    EventApplicationBulkCreatePayload,
+    EventApplicationBulkResult,
     EventApplicationCreatePayload,
     EventApplicationListParams,
     EventApplicationRecord,
@@ -29,16 +38,37 @@ from schemas.events import (
     EventCategoryRecord,
     EventCategoryUpdatePayload,
     EventCreatePayload,
+    EventExpandedRecord,
     EventListParams,
+    EventReadParams,
     EventRecord,
+    EventRegistrationBulkCreatePayload,
+    EventRegistrationBulkResult,
     EventRegistrationCreatePayload,
     EventRegistrationListParams,
     EventRegistrationRecord,
     EventRegistrationUpdatePayload,
     EventUpdatePayload,
 )
-from services.exceptions import EntityConflictError, InvalidStateError
-from services.utils import load_entity
+from schemas.rooms import RoomRecord
+from schemas.users import UserRecord
+from services.exceptions import EntityConflictError, EntityNotFoundError, InvalidStateError
+from services.jobs import enqueue_job
+from services.notifications import publish_notification_signal
+from services.utils import (
+    EXCLUSION_VIOLATION,
+    SEARCH_RANK_LABEL,
+    UNIQUE_VIOLATION,
+    ResourceVersion,
+    apply_fuzzy_search,
+    apply_keyset_pagination,
+    collect_ranked,
+    is_constraint_violation,
+    load_entity,
+    load_resource_version,
+    row_version,
+    version_checksum,
+)
 
 
 async def create_event(*, session: AsyncSession, payload: EventCreatePayload) -> EventRecord:
@@ -71,14 +101,26 @@ async def create_event(*, session: AsyncSession, payload: EventCreatePayload) ->
         need_approve_candidates=payload.need_approve_candidates,
     )
     session.add(event)
-    await session.commit()
+    await _commit_event(session=session)
     await session.refresh(event)
     await _attach_rejection_comments(session=session, events=[event])
     return EventRecord.model_validate(event)
 
 
-async def list_events(*, session: AsyncSession, params: EventListParams) -> list[EventRecord]:
+EVENT_SEARCH_CONFIG = "russian"
+
+
+def _build_event_list_query(params: EventListParams) -> tuple[Select, bool]:
     query = select(Event)
+    leading_columns = []
+    if params.q:
+        search_query = func.websearch_to_tsquery(EVENT_SEARCH_CONFIG, params.q)
+        search_rank = func.ts_rank(Event.search_vector, search_query)
+        # При поиске страницы упорядочены по релевантности, ранг входит в курсор.
+        query = query.add_columns(search_rank.label(SEARCH_RANK_LABEL)).where(
+            Event.search_vector.op("@@")(search_query)
+        )
+        leading_columns.append(search_rank)
     if params.status is not None:
         query = query.where(Event.status == params.status)
     if params.event_type is not None:
@@ -93,17 +135,153 @@ async def list_events(*, session: AsyncSession, params: EventListParams) -> list
         query = query.where(Event.event_date >= params.date_from)
     if params.date_to is not None:
         query = query.where(Event.event_date <= params.date_to)
-    query = query.offset(params.offset).limit(params.limit)
-    result = await session.scalars(query)
-    events = list(result)
+    if params.category_id:
+        query = query.where(_event_category_filter(set(params.category_id), match=params.category_match))
+    query = apply_keyset_pagination(
+        query,
+        model=Event,
+        cursor=params.cursor,
+        offset=params.offset,
+        limit=params.limit,
+        leading_columns=leading_columns,
+    )
+    return query, bool(leading_columns)
+
+
+async def list_events(*, session: AsyncSession, params: EventListParams) -> list[EventRecord]:
+    expansions = _parse_event_expansions(params.expand)
+    query, is_ranked = _build_event_list_query(params)
+    query = query.options(*_event_expansion_options(expansions))
+    if is_ranked:
+        events = collect_ranked(await session.execute(query))
+    else:
+        events = list(await session.scalars(query))
     await _attach_rejection_comments(session=session, events=events)
-    return [EventRecord.model_validate(item) for item in events]
+    return [_build_event_record(event=item, expansions=expansions) for item in events]
 
 
-async def get_event(*, session: AsyncSession, event_id: UUID) -> EventRecord:
-    event = await load_entity(session=session, model=Event, entity_id=event_id, entity_label="Event")
+async def get_event_list_version(*, session: AsyncSession, params: EventListParams) -> ResourceVersion:
+    expansions = _parse_event_expansions(params.expand)
+    query, _is_ranked = _build_event_list_query(params)
+    return await load_resource_version(
+        session=session,
+        query=query,
+        model=Event,
+        scope=params,
+        dependencies=_event_version_dependencies(expansions),
+    )
+
+
+async def get_event(*, session: AsyncSession, event_id: UUID, params: EventReadParams) -> EventRecord:
+    expansions = _parse_event_expansions(params.expand)
+    event = await load_entity(
+        session=session,
+        model=Event,
+        entity_id=event_id,
+        entity_label="Event",
+        options=_event_expansion_options(expansions),
+    )
     await _attach_rejection_comments(session=session, events=[event])
-    return EventRecord.model_validate(event)
+    return _build_event_record(event=event, expansions=expansions)
+
+
+async def get_event_version(*, session: AsyncSession, event_id: UUID, params: EventReadParams) -> ResourceVersion:
+    expansions = _parse_event_expansions(params.expand)
+    version = await load_resource_version(
+        session=session,
+        query=select(Event).where(Event.id == event_id),
+        model=Event,
+        scope=params,
+        dependencies=_event_version_dependencies(expansions),
+    )
+    if not version["row_count"]:
+        raise EntityNotFoundError("Event")
+    return version
+
+
+def _event_version_dependencies(expansions: set[EventExpansion]) -> list[ColumnElement[Any]]:
+    # Комментарий отклонения и раскрытые связи входят в запись события, но их правки не меняют events.updated_at.
+    dependencies: list[ColumnElement[Any]] = [
+        select(version_checksum(row_version(EventModerationHistory)))
+        .where(
+            EventModerationHistory.event_id == Event.id,
+            EventModerationHistory.action == ModerationAction.REJECT,
+        )
+        .scalar_subquery()
+    ]
+    if EventExpansion.CATEGORIES in expansions:
+        dependencies.append(
+            select(version_checksum(row_version(EventCategoryMapping, EventCategory)))
+            .join(EventCategory, EventCategory.id == EventCategoryMapping.category_id)
+            .where(EventCategoryMapping.event_id == Event.id)
+            .scalar_subquery()
+        )
+    if EventExpansion.ROOM in expansions:
+        dependencies.append(select(row_version(Room)).where(Room.id == Event.room_id).scalar_subquery())
+    if EventExpansion.CURATOR in expansions:
+        dependencies.append(select(row_version(User)).where(User.id == Event.curator_id).scalar_subquery())
+    if EventExpansion.CREATOR in expansions:
+        dependencies.append(select(row_version(User)).where(User.id == Event.creator_id).scalar_subquery())
+    return dependencies
+
+
+def _event_category_filter(category_ids: set[UUID], *, match: CategoryMatch) -> ColumnElement[bool]:
+    # Полусоединение через EXISTS: каждая проверка — проба индекса (category_id, event_id), без выборки связей.
+    def has_category(*conditions: ColumnElement[bool]) -> ColumnElement[bool]:
+        return (
+            select(EventCategoryMapping.id)
+            .where(EventCategoryMapping.event_id == Event.id, *conditions)
+            .exists()
+        )
+
+    if match == CategoryMatch.ALL:
+        return and_(*(has_category(EventCategoryMapping.category_id == category_id) for category_id in category_ids))
+    return has_category(EventCategoryMapping.category_id.in_(category_ids))
+
+
+def _parse_event_expansions(expand: str | None) -> set[EventExpansion]:
+    if not expand:
+        return set()
+    try:
+        return {EventExpansion(item.strip()) for item in expand.split(",") if item.strip()}
+    except ValueError as exc:
+        raise InvalidStateError(f"Unsupported expand value, allowed: {', '.join(item.value for item in EventExpansion)}") from exc
+
+
+def _event_expansion_options(expansions: set[EventExpansion]) -> list[ORMOption]:
+    # Связи many-to-one приходят JOIN-ом в основном запросе, категории — одним IN-запросом на страницу,
+    # так что число запросов не зависит от размера страницы.
+    options: list[ORMOption] = []
+    if EventExpansion.CATEGORIES in expansions:
+        options.append(selectinload(Event.categories).joinedload(EventCategoryMapping.category))
+    if EventExpansion.ROOM in expansions:
+        options.append(joinedload(Event.room))
+    if EventExpansion.CURATOR in expansions:
+        options.append(joinedload(Event.curator))
+    if EventExpansion.CREATOR in expansions:
+        options.append(joinedload(Event.creator))
+    return options
+
+
+def _build_event_record(*, event: Event, expansions: set[EventExpansion]) -> EventRecord:
+    record = EventRecord.model_validate(event)
+    if not expansions:
+        return record
+    return EventExpandedRecord(
+        **record.model_dump(),
+        categories=(
+            [EventCategoryRecord.model_validate(mapping.category) for mapping in event.categories]
+            if EventExpansion.CATEGORIES in expansions
+            else None
+        ),
+        room=(
+            RoomRecord.model_validate(event.room)
+            if EventExpansion.ROOM in expansions and event.room is not None
+            else None
+        ),
+        curator=UserRecord.model_validate(event.curator) if EventExpansion.CURATOR in expansions else None,
+        creator=UserRecord.model_validate(event.creator) if EventExpansion.CREATOR in expansions else None,
+    )
 
 
 async def update_event(*, session: AsyncSession, event_id: UUID, payload: EventUpdatePayload) -> EventRecord:
@@ -137,13 +315,28 @@ async def update_event(*, session: AsyncSession, event_id: UUID, payload: EventU
         setattr(event, attribute, value)
     should_notify = previous_status != EventStatus.APPROVED and event.status == EventStatus.APPROVED
     if should_notify:
-        await _queue_new_event_notifications(session=session, event=event)
-    await session.commit()
+        enqueue_job(
+            session=session,
+            kind=JobKind.NEW_EVENT_NOTIFICATIONS,
+            payload={"event_id": str(event.id)},
+        )
+    await _commit_event(session=session)
     await session.refresh(event)
     await _attach_rejection_comments(session=session, events=[event])
     return EventRecord.model_validate(event)
 
 
+async def _commit_event(*, session: AsyncSession) -> None:
+    # Пересечение бронирований ловит exclusion-ограничение в БД, поэтому параллельные брони тоже не пройдут.
+    try:
+        await session.commit()
+    except IntegrityError as exc:
+        await session.rollback()
+        if is_constraint_violation(exc, sqlstate=EXCLUSION_VIOLATION):
+            raise EntityConflictError("Room booking") from exc
+        raise
+
+
 async def delete_event(*, session: AsyncSession, event_id: UUID) -> EventRecord:
     event = await load_entity(session=session, model=Event, entity_id=event_id, entity_label="Event")
     await _attach_rejection_comments(session=session, events=[event])
@@ -172,17 +365,43 @@ async def create_event_category(
     return EventCategoryRecord.model_validate(category)
 
 
+def _build_event_category_list_query(params: EventCategoryListParams) -> tuple[Select, bool]:
+    query = select(EventCategory)
+    leading_columns = []
+    if params.name:
+        query, search_rank = apply_fuzzy_search(query, column=EventCategory.name, term=params.name)
+        leading_columns.append(search_rank)
+    query = apply_keyset_pagination(
+        query,
+        model=EventCategory,
+        cursor=params.cursor,
+        offset=params.offset,
+        limit=params.limit,
+        leading_columns=leading_columns,
+    )
+    return query, bool(leading_columns)
+
+
 async def list_event_categories(
     *,
     session: AsyncSession,
     params: EventCategoryListParams,
 ) -> list[EventCategoryRecord]:
-    query = select(EventCategory)
-    if params.name is not None:
-        query = query.where(EventCategory.name.ilike(f"%{params.name}%"))
-    query = query.offset(params.offset).limit(params.limit)
-    result = await session.scalars(query)
-    return [EventCategoryRecord.model_validate(item) for item in result]
+    query, is_ranked = _build_event_category_list_query(params)
+    if is_ranked:
+        categories = collect_ranked(await session.execute(query))
+    else:
+        categories = list(await session.scalars(query))
+    return [EventCategoryRecord.model_validate(item) for item in categories]
+
+
+async def get_event_category_list_version(
+    *,
+    session: AsyncSession,
+    params: EventCategoryListParams,
+) -> ResourceVersion:
+    query, _is_ranked = _build_event_category_list_query(params)
+    return await load_resource_version(session=session, query=query, model=EventCategory, scope=params)
 
 
 async def get_event_category(
@@ -259,23 +478,16 @@ async def create_event_category_mapping(
         entity_id=payload.category_id,
         entity_label="EventCategory",
     )
-    existing_mapping = await session.scalar(
-        select(EventCategoryMapping).where(
-            and_(
-                EventCategoryMapping.event_id == payload.event_id,
-                EventCategoryMapping.category_id == payload.category_id,
-            )
-        )
+    mapping = await session.scalar(
+        pg_insert(EventCategoryMapping)
+        .values(event_id=payload.event_id, category_id=payload.category_id)
+        .on_conflict_do_nothing(index_elements=[EventCategoryMapping.event_id, EventCategoryMapping.category_id])
+        .returning(EventCategoryMapping)
     )
-    if existing_mapping is not None:
+    if mapping is None:
+        await session.rollback()
         raise EntityConflictError("EventCategoryMapping")
-    mapping = EventCategoryMapping(
-        event_id=payload.event_id,
-        category_id=payload.category_id,
-    )
-    session.add(mapping)
     await session.commit()
-    await session.refresh(mapping)
     return EventCategoryMappingRecord.model_validate(mapping)
 
 
@@ -289,7 +501,13 @@ async def list_event_category_mappings(
         query = query.where(EventCategoryMapping.event_id == params.event_id)
     if params.category_id is not None:
         query = query.where(EventCategoryMapping.category_id == params.category_id)
-    query = query.offset(params.offset).limit(params.limit)
+    query = apply_keyset_pagination(
+        query,
+        model=EventCategoryMapping,
+        cursor=params.cursor,
+        offset=params.offset,
+        limit=params.limit,
+    )
     result = await session.scalars(query)
     return [EventCategoryMappingRecord.model_validate(item) for item in result]
 
@@ -330,20 +548,15 @@ async def update_event_category_mapping(
         entity_id=category_candidate,
         entity_label="EventCategory",
     )
-    existing_mapping = await session.scalar(
-        select(EventCategoryMapping).where(
-            and_(
-                EventCategoryMapping.event_id == event_candidate,
-                EventCategoryMapping.category_id == category_candidate,
-                EventCategoryMapping.id != mapping_id,
-            )
-        )
-    )
-    if existing_mapping is not None:
-        raise EntityConflictError("EventCategoryMapping")
     for attribute, value in update_data.items():
         setattr(mapping, attribute, value)
-    await session.commit()
+    try:
+        await session.commit()
+    except IntegrityError as exc:
+        await session.rollback()
+        if is_constraint_violation(exc, sqlstate=UNIQUE_VIOLATION):
+            raise EntityConflictError("EventCategoryMapping") from exc
+        raise
     await session.refresh(mapping)
     return EventCategoryMappingRecord.model_validate(mapping)
 
@@ -370,29 +583,127 @@ async def create_event_registration(
     session: AsyncSession,
     payload: EventRegistrationCreatePayload,
 ) -> EventRegistrationRecord:
-    await load_entity(session=session, model=Event, entity_id=payload.event_id, entity_label="Event")
     await load_entity(session=session, model=User, entity_id=payload.user_id, entity_label="User")
-    existing_registration = await session.scalar(
-        select(EventRegistration).where(
-            and_(
-                EventRegistration.event_id == payload.event_id,
-                EventRegistration.user_id == payload.user_id,
-            )
-        )
+    await _reserve_event_seat(session=session, event_id=payload.event_id)
+    registration = await session.scalar(
+        pg_insert(EventRegistration)
+        .values(event_id=payload.event_id, user_id=payload.user_id, comment=payload.comment)
+        .on_conflict_do_nothing(index_elements=[EventRegistration.event_id, EventRegistration.user_id])
+        .returning(EventRegistration)
     )
-    if existing_registration is not None:
+    if registration is None:
+        await session.rollback()
         raise EntityConflictError("EventRegistration")
-    registration = EventRegistration(
-        event_id=payload.event_id,
-        user_id=payload.user_id,
-        comment=payload.comment,
-    )
-    session.add(registration)
     await session.commit()
-    await session.refresh(registration)
     return EventRegistrationRecord.model_validate(registration)
 
 
+async def create_event_registrations_bulk(
+    *,
+    session: AsyncSession,
+    payload: EventRegistrationBulkCreatePayload,
+) -> list[EventRegistrationBulkResult]:
+    # Строки мероприятий блокируются в порядке id, поэтому места распределяются без гонок
+    # с одиночными регистрациями и без взаимных блокировок между параллельными импортами.
+    event_rows = await session.execute(
+        select(Event.id, Event.registered_count, Event.max_participants)
+        .where(Event.id.in_({item.event_id for item in payload.items}))
+        .order_by(Event.id)
+        .with_for_update()
+    )
+    seats_left: dict[UUID, int | None] = {
+        row.id: None if row.max_participants is None else row.max_participants - row.registered_count
+        for row in event_rows
+    }
+    user_ids = set(await session.scalars(select(User.id).where(User.id.in_({item.user_id for item in payload.items}))))
+    taken_pairs = set(
+        (
+            await session.execute(
+                select(EventRegistration.event_id, EventRegistration.user_id).where(
+                    tuple_(EventRegistration.event_id, EventRegistration.user_id).in_(
+                        [(item.event_id, item.user_id) for item in payload.items]
+                    )
+                )
+            )
+        ).tuples()
+    )
+    statuses: list[BulkItemStatus] = []
+    rows_to_insert = []
+    for item in payload.items:
+        if item.event_id not in seats_left:
+            statuses.append(BulkItemStatus.EVENT_NOT_FOUND)
+        elif item.user_id not in user_ids:
+            statuses.append(BulkItemStatus.USER_NOT_FOUND)
+        elif (item.event_id, item.user_id) in taken_pairs:
+            statuses.append(BulkItemStatus.DUPLICATE)
+        elif seats_left[item.event_id] is not None and seats_left[item.event_id] <= 0:
+            statuses.append(BulkItemStatus.EVENT_FULL)
+        else:
+            statuses.append(BulkItemStatus.CREATED)
+            taken_pairs.add((item.event_id, item.user_id))
+            if seats_left[item.event_id] is not None:
+                seats_left[item.event_id] -= 1
+            rows_to_insert.append({"event_id": item.event_id, "user_id": item.user_id, "comment": item.comment})
+    created: dict[tuple[UUID, UUID], EventRegistration] = {}
+    if rows_to_insert:
+        inserted = await session.scalars(
+            pg_insert(EventRegistration)
+            .on_conflict_do_nothing(index_elements=[EventRegistration.event_id, EventRegistration.user_id])
+            .returning(EventRegistration),
+            rows_to_insert,
+        )
+        created = {(registration.event_id, registration.user_id): registration for registration in inserted}
+        for event_id, added_count in Counter(event_id for event_id, _ in created).items():
+            await session.execute(
+                update(Event)
+                .where(Event.id == event_id)
+                .values(registered_count=Event.registered_count + added_count)
+                .execution_options(synchronize_session=False)
+            )
+    await session.commit()
+    results = []
+    for item, status in zip(payload.items, statuses):
+        # Повтор пары внутри запроса не получает запись первого вхождения
+        registration = created.get((item.event_id, item.user_id)) if status == BulkItemStatus.CREATED else None
+        if status == BulkItemStatus.CREATED and registration is None:
+            status = BulkItemStatus.DUPLICATE
+        results.append(
+            EventRegistrationBulkResult(
+                event_id=item.event_id,
+                user_id=item.user_id,
+                status=status,
+                registration=EventRegistrationRecord.model_validate(registration) if registration else None,
+            )
+        )
+    return results
+
+
+async def _reserve_event_seat(*, session: AsyncSession, event_id: UUID) -> None:
+    # Условный инкремент блокирует только строку события и только до конца транзакции регистрации.
+    reserved_event_id = await session.scalar(
+        update(Event)
+        .where(
+            Event.id == event_id,
+            or_(Event.max_participants.is_(None), Event.registered_count < Event.max_participants),
+        )
+        .values(registered_count=Event.registered_count + 1)
+        .returning(Event.id)
+        .execution_options(synchronize_session=False)
+    )
+    if reserved_event_id is None:
+        await load_entity(session=session, model=Event, entity_id=event_id, entity_label="Event")
+        raise InvalidStateError("Event is full")
+
+
+async def _release_event_seat(*, session: AsyncSession, event_id: UUID) -> None:
+    await session.execute(
+        update(Event)
+        .where(Event.id == event_id, Event.registered_count > 0)
+        .values(registered_count=Event.registered_count - 1)
+        .execution_options(synchronize_session=False)
+    )
+
+
 async def list_event_registrations(
     *,
     session: AsyncSession,
@@ -403,7 +714,13 @@ async def list_event_registrations(
         query = query.where(EventRegistration.event_id == params.event_id)
     if params.user_id is not None:
         query = query.where(EventRegistration.user_id == params.user_id)
-    query = query.offset(params.offset).limit(params.limit)
+    query = apply_keyset_pagination(
+        query,
+        model=EventRegistration,
+        cursor=params.cursor,
+        offset=params.offset,
+        limit=params.limit,
+    )
     result = await session.scalars(query)
     return [EventRegistrationRecord.model_validate(item) for item in result]
 
@@ -455,6 +772,8 @@ async def delete_event_registration(
     )
     record = EventRegistrationRecord.model_validate(registration)
     await session.delete(registration)
+    await session.flush()
+    await _release_event_seat(session=session, event_id=record.event_id)
     await session.commit()
     return record
 
@@ -466,28 +785,83 @@ async def create_event_application(
 ) -> EventApplicationRecord:
     await load_entity(session=session, model=Event, entity_id=payload.event_id, entity_label="Event")
     await load_entity(session=session, model=User, entity_id=payload.applicant_id, entity_label="User")
-    existing_application = await session.scalar(
-        select(EventApplication).where(
-            and_(
-                EventApplication.event_id == payload.event_id,
-                EventApplication.applicant_id == payload.applicant_id,
-            )
+    application = await session.scalar(
+        pg_insert(EventApplication)
+        .values(
+            event_id=payload.event_id,
+            applicant_id=payload.applicant_id,
+            status=payload.status.value,
+            motivation=payload.motivation,
         )
+        .on_conflict_do_nothing(index_elements=[EventApplication.event_id, EventApplication.applicant_id])
+        .returning(EventApplication)
     )
-    if existing_application is not None:
+    if application is None:
+        await session.rollback()
         raise EntityConflictError("EventApplication")
-    application = EventApplication(
-        event_id=payload.event_id,
-        applicant_id=payload.applicant_id,
-        status=payload.status.value,
-        motivation=payload.motivation,
-    )
-    session.add(application)
     await session.commit()
-    await session.refresh(application)
     return EventApplicationRecord.model_validate(application)
 
 
+async def create_event_applications_bulk(
+    *,
+    session: AsyncSession,
+    payload: EventApplicationBulkCreatePayload,
+) -> list[EventApplicationBulkResult]:
+    event_ids = set(
+        await session.scalars(select(Event.id).where(Event.id.in_({item.event_id for item in payload.items})))
+    )
+    applicant_ids = set(
+        await session.scalars(select(User.id).where(User.id.in_({item.applicant_id for item in payload.items})))
+    )
+    statuses: list[BulkItemStatus] = []
+    rows_to_insert = []
+    queued_pairs: set[tuple[UUID, UUID]] = set()
+    for item in payload.items:
+        if item.event_id not in event_ids:
+            statuses.append(BulkItemStatus.EVENT_NOT_FOUND)
+        elif item.applicant_id not in applicant_ids:
+            statuses.append(BulkItemStatus.USER_NOT_FOUND)
+        elif (item.event_id, item.applicant_id) in queued_pairs:
+            statuses.append(BulkItemStatus.DUPLICATE)
+        else:
+            statuses.append(BulkItemStatus.CREATED)
+            queued_pairs.add((item.event_id, item.applicant_id))
+            rows_to_insert.append(
+                {
+                    "event_id": item.event_id,
+                    "applicant_id": item.applicant_id,
+                    "status": item.status.value,
+                    "motivation": item.motivation,
+                }
+            )
+    created: dict[tuple[UUID, UUID], EventApplication] = {}
+    if rows_to_insert:
+        inserted = await session.scalars(
+            pg_insert(EventApplication)
+            .on_conflict_do_nothing(index_elements=[EventApplication.event_id, EventApplication.applicant_id])
+            .returning(EventApplication),
+            rows_to_insert,
+        )
+        created = {(application.event_id, application.applicant_id): application for application in inserted}
+    await session.commit()
+    results = []
+    for item, status in zip(payload.items, statuses):
+        # Повтор пары внутри запроса не получает запись первого вхождения
+        application = created.get((item.event_id, item.applicant_id)) if status == BulkItemStatus.CREATED else None
+        if status == BulkItemStatus.CREATED and application is None:
+            status = BulkItemStatus.DUPLICATE
+        results.append(
+            EventApplicationBulkResult(
+                event_id=item.event_id,
+                applicant_id=item.applicant_id,
+                status=status,
+                application=EventApplicationRecord.model_validate(application) if application else None,
+            )
+        )
+    return results
+
+
 async def list_event_applications(
     *,
     session: AsyncSession,
@@ -500,7 +874,13 @@ async def list_event_applications(
         query = query.where(EventApplication.applicant_id == params.applicant_id)
     if params.status is not None:
         query = query.where(EventApplication.status == params.status.value)
-    query = query.offset(params.offset).limit(params.limit)
+    query = apply_keyset_pagination(
+        query,
+        model=EventApplication,
+        cursor=params.cursor,
+        offset=params.offset,
+        limit=params.limit,
+    )
     result = await session.scalars(query)
     return [EventApplicationRecord.model_validate(item) for item in result]
 
@@ -595,23 +975,51 @@ async def _load_rejection_comments(
     return comments
 
 
-async def _queue_new_event_notifications(*, session: AsyncSession, event: Event) -> None:
-    student_ids_result = await session.scalars(select(User.id).where(User.role == UserRole.STUDENT))
-    student_ids = list(student_ids_result)
-    if not student_ids:
+async def notify_students_about_event(*, session: AsyncSession, event_id: UUID) -> None:
+    event = await load_entity(session=session, model=Event, entity_id=event_id, entity_label="Event")
+    if event.status != EventStatus.APPROVED:
         return
-    notification_message = _build_event_notification_message(event=event)
-    notifications = [
-        Notification(
-            user_id=user_id,
+    await _queue_new_event_notifications(session=session, event=event)
+
+
+async def reconcile_registered_counts(*, session: AsyncSession) -> int:
+    actual_count = (
+        select(func.count(EventRegistration.id))
+        .where(EventRegistration.event_id == Event.id)
+        .correlate(Event)
+        .scalar_subquery()
+    )
+    # Сначала блокируем расходящиеся строки: пересчёт следующим запросом видит уже закоммиченные
+    # регистрации, а новые ждут блокировки, поэтому исправление не теряет параллельные инкременты.
+    drifted_ids = list(
+        await session.scalars(
+            select(Event.id).where(Event.registered_count != actual_count).order_by(Event.id).with_for_update()
+        )
+    )
+    if drifted_ids:
+        await session.execute(
+            update(Event)
+            .where(Event.id.in_(drifted_ids))
+            .values(registered_count=actual_count)
+            .execution_options(synchronize_session=False)
+        )
+    return len(drifted_ids)
+
+
+async def _queue_new_event_notifications(*, session: AsyncSession, event: Event) -> None:
+    # Одна строка на рассылку вместо копии текста на каждого студента; прочтение и удаление
+    # у конкретного получателя хранятся в компактных строках состояния.
+    session.add(
+        BroadcastNotification(
             type=NotificationType.NEW_EVENT,
             title=f"Новое мероприятие: {event.title}",
-            message=notification_message,
+            message=_build_event_notification_message(event=event),
             related_event_id=event.id,
+            audience_role=UserRole.STUDENT,
         )
-        for user_id in student_ids
-    ]
-    session.add_all(notifications)
+    )
+    # Одним сигналом на всю рассылку: подписчики сами дочитают свои новые уведомления.
+    await publish_notification_signal(session=session, user_id=None)
 
 
 def _build_event_notification_message(*, event: Event) -> str:
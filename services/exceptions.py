@@ -19,3 +19,6 @@ class EntityConflictError(ServiceError):
 class InvalidStateError(ServiceError):
     pass
 
+
+class ServiceBusyError(ServiceError):
+    pass
@@ -0,0 +1,123 @@
+import datetime
+from typing import Any
+
+from sqlalchemy import and_, func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.elements import ColumnElement
+
+from core.config import settings
+from core.enums import JobKind, JobStatus
+from models.job import Job
+
+
+def enqueue_job(
+    *,
+    session: AsyncSession,
+    kind: JobKind,
+    payload: dict[str, Any],
+    run_after: datetime.datetime | None = None,
+    max_attempts: int | None = None,
+) -> Job:
+    job = Job(
+        kind=kind,
+        payload=payload,
+        status=JobStatus.PENDING,
+        attempts=0,
+        max_attempts=max_attempts or settings.job_max_attempts,
+    )
+    if run_after is not None:
+        job.run_after = run_after
+    session.add(job)
+    return job
+
+
+async def enqueue_unique_job(*, session: AsyncSession, kind: JobKind, payload: dict[str, Any]) -> Job | None:
+    queued_job_id = await session.scalar(
+        select(Job.id).where(Job.kind == kind, Job.status.in_([JobStatus.PENDING, JobStatus.RUNNING])).limit(1)
+    )
+    if queued_job_id is not None:
+        return None
+    return enqueue_job(session=session, kind=kind, payload=payload)
+
+
+async def claim_jobs(*, session: AsyncSession, batch_size: int) -> list[Job]:
+    lock_expired_before = func.now() - datetime.timedelta(seconds=settings.job_lock_timeout_seconds)
+    lock_expired = and_(Job.status == JobStatus.RUNNING, Job.locked_at < lock_expired_before)
+    # Задача с истёкшей блокировкой уже израсходовала попытку при захвате: последнюю не запускаем ещё раз.
+    await session.execute(
+        update(Job)
+        .where(lock_expired, Job.attempts >= Job.max_attempts)
+        .values(status=JobStatus.FAILED, locked_at=None, last_error="Lock expired on the last attempt")
+    )
+    claimable_ids = (
+        select(Job.id)
+        .where(
+            or_(
+                and_(Job.status == JobStatus.PENDING, Job.run_after <= func.now()),
+                and_(lock_expired, Job.attempts < Job.max_attempts),
+            )
+        )
+        .order_by(Job.run_after)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    )
+    result = await session.scalars(
+        update(Job)
+        .where(Job.id.in_(claimable_ids.scalar_subquery()))
+        .values(
+            status=JobStatus.RUNNING,
+            locked_at=func.now(),
+            attempts=Job.attempts + 1,
+        )
+        .returning(Job)
+    )
+    jobs = list(result)
+    await session.commit()
+    return jobs
+
+
+def _owned_by(job: Job) -> ColumnElement[bool]:
+    # Захват увеличивает attempts, поэтому пара (RUNNING, attempts) отличает наш запуск от более позднего
+    # перезахвата: опоздавший процесс не перезапишет его состояние.
+    return and_(Job.id == job.id, Job.status == JobStatus.RUNNING, Job.attempts == job.attempts)
+
+
+async def start_job(*, session: AsyncSession, job: Job) -> bool:
+    """Продлевает блокировку перед запуском; False — задачу уже перехватил другой процесс."""
+    # Задачи пачки выполняются по очереди, и без продления хвост пачки перезахватили бы как зависший.
+    result = await session.execute(update(Job).where(_owned_by(job)).values(locked_at=func.now()))
+    await session.commit()
+    return result.rowcount > 0
+
+
+async def complete_job(*, session: AsyncSession, job: Job) -> bool:
+    result = await session.execute(
+        update(Job)
+        .where(_owned_by(job))
+        .values(status=JobStatus.SUCCEEDED, locked_at=None, last_error=None)
+    )
+    return result.rowcount > 0
+
+
+async def fail_job(*, session: AsyncSession, job: Job, error: str) -> None:
+    if job.attempts >= job.max_attempts:
+        values: dict[str, Any] = {"status": JobStatus.FAILED}
+    else:
+        values = {
+            "status": JobStatus.PENDING,
+            "run_after": func.now() + datetime.timedelta(seconds=compute_retry_delay(attempts=job.attempts)),
+        }
+    result = await session.execute(
+        update(Job)
+        .where(_owned_by(job))
+        .values(locked_at=None, last_error=error, **values)
+    )
+    if result.rowcount:
+        await session.commit()
+    else:
+        await session.rollback()
+
+
+def compute_retry_delay(*, attempts: int) -> float:
+    delay = settings.job_retry_base_seconds * 2 ** max(attempts - 1, 0)
+    return min(delay, settings.job_retry_max_seconds)
@@ -16,7 +16,7 @@ from schemas.moderation import (
     EventModerationHistoryRecord,
     EventModerationHistoryUpdatePayload,
 )
-from services.utils import load_entity
+from services.utils import apply_keyset_pagination, load_entity
 
 
 async def create_event_moderation_history(
@@ -48,7 +48,13 @@ async def list_event_moderation_history(
         query = query.where(EventModerationHistory.event_id == params.event_id)
     if params.curator_id is not None:
         query = query.where(EventModerationHistory.curator_id == params.curator_id)
-    query = query.offset(params.offset).limit(params.limit)
+    query = apply_keyset_pagination(
+        query,
+        model=EventModerationHistory,
+        cursor=params.cursor,
+        offset=params.offset,
+        limit=params.limit,
+    )
     result = await session.scalars(query)
     return [EventModerationHistoryRecord.model_validate(item) for item in result]
 
@@ -138,7 +144,13 @@ async def list_application_history(
         query = query.where(ApplicationHistory.application_id == params.application_id)
     if params.moderator_id is not None:
         query = query.where(ApplicationHistory.moderator_id == params.moderator_id)
-    query = query.offset(params.offset).limit(params.limit)
+    query = apply_keyset_pagination(
+        query,
+        model=ApplicationHistory,
+        cursor=params.cursor,
+        offset=params.offset,
+        limit=params.limit,
+    )
     result = await session.scalars(query)
     return [ApplicationHistoryRecord.model_validate(item) for item in result]
 
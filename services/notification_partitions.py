@@ -0,0 +1,271 @@
+import asyncio
+import datetime
+import gzip
+import logging
+import os
+import re
+
+from sqlalchemy import func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+logger = logging.getLogger("notifications")
+
+NOTIFICATION_TABLE = "notifications"
+DEFAULT_PARTITION = "notifications_default"
+_PARTITION_NAME = re.compile(r"^notifications_p(\d{4})_(\d{2})$")
+# ATTACH/DETACH ждут блокировку за долгими чтениями и при этом задерживают все запросы, вставшие в очередь после них.
+# Поэтому ждём недолго: задача упадёт и повторится позже, а не остановит работу с уведомлениями.
+PARTITION_LOCK_TIMEOUT = "5s"
+
+
+def _month_start(value: datetime.datetime) -> datetime.datetime:
+    return value.astimezone(datetime.UTC).replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def _add_months(month: datetime.datetime, months: int) -> datetime.datetime:
+    index = month.year * 12 + month.month - 1 + months
+    return month.replace(year=index // 12, month=index % 12 + 1)
+
+
+def partition_name(month: datetime.datetime) -> str:
+    return f"notifications_p{month:%Y_%m}"
+
+
+def _partition_month(name: str) -> datetime.datetime | None:
+    match = _PARTITION_NAME.match(name)
+    if match is None:
+        return None
+    return datetime.datetime(int(match[1]), int(match[2]), 1, tzinfo=datetime.UTC)
+
+
+async def _load_partitions(*, session: AsyncSession) -> dict[str, bool]:
+    # Отсоединённые, но ещё не выгруженные секции тоже попадают в список: их дочищает следующий запуск архивации.
+    result = await session.execute(
+        text(
+            """
+            SELECT relname, relispartition
+            FROM pg_class
+            WHERE relkind = 'r'
+              AND relnamespace = current_schema()::regnamespace
+              AND relname LIKE 'notifications\\_p%'
+            """
+        )
+    )
+    return {row.relname: row.relispartition for row in result if _PARTITION_NAME.match(row.relname)}
+
+
+async def _set_partition_lock_timeout(*, session: AsyncSession) -> None:
+    await session.execute(text(f"SET LOCAL lock_timeout = '{PARTITION_LOCK_TIMEOUT}'"))
+
+
+async def _attach_month_partition(*, session: AsyncSession, month: datetime.datetime, now: datetime.datetime) -> None:
+    name = partition_name(month)
+    lower, upper = month, _add_months(month, 1)
+    attach = (
+        f"ALTER TABLE {NOTIFICATION_TABLE} ATTACH PARTITION {name} "
+        f"FOR VALUES FROM ('{lower.isoformat()}') TO ('{upper.isoformat()}')"
+    )
+    exclusion = f"{DEFAULT_PARTITION}_excludes_{month:%Y_%m}"
+    # После ATTACH диапазон отсекает сама секционная схема, а лишнее ограничение замедляло бы вставки в секцию
+    # по умолчанию.
+    drop_exclusion = f"ALTER TABLE {DEFAULT_PARTITION} DROP CONSTRAINT IF EXISTS {exclusion}"
+    await _set_partition_lock_timeout(session=session)
+    # Таблица могла остаться от прерванного запуска: тогда продолжаем с того же места.
+    await session.execute(
+        text(f"CREATE TABLE IF NOT EXISTS {name} (LIKE {NOTIFICATION_TABLE} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)")
+    )
+    has_spilled_rows = await session.scalar(
+        text(f"SELECT EXISTS (SELECT FROM {DEFAULT_PARTITION} WHERE created_at >= :lower AND created_at < :upper)"),
+        {"lower": lower, "upper": upper},
+    )
+    if lower <= now or has_spilled_rows:
+        # Задача отстала, и строки этого месяца уже лежат в секции по умолчанию. Переносим их и подключаем
+        # секцию в одной транзакции, иначе перенесённые строки пропали бы из выборок до ATTACH. Вставки этого месяца
+        # между переносом и ATTACH снова попали бы в секцию по умолчанию, и ATTACH завершился бы ошибкой, поэтому
+        # запись в неё блокируем до переноса; чтение при этом продолжается до ACCESS EXCLUSIVE самого ATTACH.
+        await session.execute(text(f"LOCK TABLE {DEFAULT_PARTITION} IN SHARE ROW EXCLUSIVE MODE"))
+        await session.execute(
+            text(
+                f"""
+                WITH moved AS (
+                    DELETE FROM {DEFAULT_PARTITION}
+                    WHERE created_at >= :lower AND created_at < :upper
+                    RETURNING *
+                )
+                INSERT INTO {name} SELECT * FROM moved
+                """
+            ),
+            {"lower": lower, "upper": upper},
+        )
+        await session.execute(text(attach))
+        await session.execute(text(drop_exclusion))
+        await session.commit()
+        return
+    # Обычный путь — месяц ещё не начался, и строк в нём нет. ATTACH всё равно берёт ACCESS EXCLUSIVE на секции по
+    # умолчанию, но не просматривает её, если её ограничение уже исключает диапазон новой секции. Ограничение
+    # добавляем как NOT VALID (без просмотра), проверяем отдельной транзакцией под SHARE UPDATE EXCLUSIVE, которая не
+    # мешает чтению и записи, и только потом подключаем секцию короткой транзакцией.
+    has_exclusion = await session.scalar(
+        text("SELECT EXISTS (SELECT FROM pg_constraint WHERE conrelid = CAST(:table AS regclass) AND conname = :name)"),
+        {"table": DEFAULT_PARTITION, "name": exclusion},
+    )
+    if not has_exclusion:
+        await session.execute(
+            text(
+                f"ALTER TABLE {DEFAULT_PARTITION} ADD CONSTRAINT {exclusion} "
+                f"CHECK (created_at < '{lower.isoformat()}' OR created_at >= '{upper.isoformat()}') NOT VALID"
+            )
+        )
+    await session.commit()
+    await session.execute(text(f"ALTER TABLE {DEFAULT_PARTITION} VALIDATE CONSTRAINT {exclusion}"))
+    await session.commit()
+    await _set_partition_lock_timeout(session=session)
+    await session.execute(text(attach))
+    await session.execute(text(drop_exclusion))
+    await session.commit()
+
+
+async def create_notification_partitions(*, session: AsyncSession, months_ahead: int) -> list[str]:
+    now = await session.scalar(select(func.now()))
+    attached = await _load_partitions(session=session)
+    current_month = _month_start(now)
+    created: list[str] = []
+    for offset in range(months_ahead + 1):
+        month = _add_months(current_month, offset)
+        if attached.get(partition_name(month)):
+            continue
+        # Каждая секция подключается своими короткими транзакциями, чтобы блокировки не копились до конца задачи.
+        await _attach_month_partition(session=session, month=month, now=now)
+        created.append(partition_name(month))
+    return created
+
+
+async def _copy_to_archive(*, session: AsyncSession, query: str, path: str) -> int:
+    partial_path = f"{path}.partial"
+    await asyncio.to_thread(os.makedirs, os.path.dirname(path), exist_ok=True)
+    connection = await session.connection()
+    raw_connection = await connection.get_raw_connection()
+    archive = await asyncio.to_thread(gzip.open, partial_path, "wb")
+    try:
+
+        async def write(chunk: bytes) -> None:
+            await asyncio.to_thread(archive.write, chunk)
+
+        status = await raw_connection.driver_connection.copy_from_query(
+            query,
+            output=write,
+            format="csv",
+            header=True,
+        )
+    finally:
+        await asyncio.to_thread(archive.close)
+    # Если транзакция дальше откатится, повтор перезапишет файл той же выгрузкой.
+    await asyncio.to_thread(os.replace, partial_path, path)
+    return int(status.split()[-1])
+
+
+async def _archive_detached_partition(*, session: AsyncSession, name: str, archive_dir: str) -> int:
+    # Секцию отсоединяют, только когда в ней не осталось непрочитанных, поэтому выгружаем её целиком.
+    archived_count = await _copy_to_archive(
+        session=session,
+        query=f"SELECT * FROM {name} ORDER BY created_at, id",
+        path=os.path.join(archive_dir, f"{name}.csv.gz"),
+    )
+    await session.execute(text(f"DROP TABLE {name}"))
+    return archived_count
+
+
+async def _detach_read_partition(*, session: AsyncSession, name: str) -> bool:
+    await _set_partition_lock_timeout(session=session)
+    await session.execute(text(f"ALTER TABLE {NOTIFICATION_TABLE} DETACH PARTITION {name}"))
+    # Проверяем уже под блокировкой DETACH: между проверкой и отсоединением уведомление могли снова сделать
+    # непрочитанным. Тогда откатываемся, и секция остаётся подключённой.
+    if await _has_unread(session=session, table=name):
+        await session.rollback()
+        return False
+    # DETACH держит эксклюзивную блокировку таблицы уведомлений до конца транзакции, поэтому фиксируем его
+    # сразу, а выгружаем уже в следующей транзакции.
+    await session.commit()
+    return True
+
+
+async def _has_unread(*, session: AsyncSession, table: str) -> bool:
+    return await session.scalar(text(f"SELECT EXISTS (SELECT FROM {table} WHERE is_read = false)"))
+
+
+async def _sweep_read_notifications(
+    *,
+    session: AsyncSession,
+    table: str,
+    before: datetime.datetime,
+    archive_dir: str,
+    swept_at: datetime.datetime,
+) -> int:
+    # Из подключённой секции прочитанные вырезаем построчно: DELETE ... RETURNING складывает их во временную
+    # таблицу, а в архив уходит уже она. Блокируются только удаляемые строки.
+    await session.execute(
+        text(f"CREATE TEMPORARY TABLE notifications_sweep (LIKE {NOTIFICATION_TABLE}) ON COMMIT DROP")
+    )
+    result = await session.execute(
+        text(
+            f"""
+            WITH swept AS (
+                DELETE FROM {table}
+                WHERE is_read = true AND created_at < :before
+                RETURNING *
+            )
+            INSERT INTO notifications_sweep SELECT * FROM swept
+            """
+        ),
+        {"before": before},
+    )
+    if result.rowcount:
+        await _copy_to_archive(
+            session=session,
+            query="SELECT * FROM notifications_sweep ORDER BY created_at, id",
+            path=os.path.join(archive_dir, f"{table}_swept_{swept_at:%Y%m%dT%H%M%S}.csv.gz"),
+        )
+    await session.commit()
+    return result.rowcount
+
+
+async def archive_notification_partitions(*, session: AsyncSession, retention_months: int, archive_dir: str) -> int:
+    now = await session.scalar(select(func.now()))
+    cutoff = _add_months(_month_start(now), -retention_months)
+    partitions = await _load_partitions(session=session)
+    archived_count = 0
+    detached: list[str] = []
+    for name in sorted(name for name, attached in partitions.items() if attached and _partition_month(name) < cutoff):
+        if not await _has_unread(session=session, table=name):
+            if await _detach_read_partition(session=session, name=name):
+                detached.append(name)
+                continue
+        # Непрочитанные остаются у пользователей, поэтому секция с ними остаётся подключённой, пока их не
+        # прочитают, а прочитанные из неё вырезаются, чтобы она не занимала место.
+        swept_count = await _sweep_read_notifications(
+            session=session,
+            table=name,
+            before=cutoff,
+            archive_dir=archive_dir,
+            swept_at=now,
+        )
+        logger.info("Archived %s read notifications from %s, unread ones stay attached", swept_count, name)
+        archived_count += swept_count
+    # Отсоединённые таблицы будущих месяцев — это секции, которые задача создания ещё не подключила.
+    leftovers = {name for name, attached in partitions.items() if not attached and _partition_month(name) < cutoff}
+    for name in sorted(leftovers | set(detached)):
+        partition_count = await _archive_detached_partition(session=session, name=name, archive_dir=archive_dir)
+        logger.info("Archived %s read notifications from %s", partition_count, name)
+        archived_count += partition_count
+    # В секцию по умолчанию попадают строки вне созданных диапазонов; её не отсоединяют, поэтому чистим построчно.
+    default_count = await _sweep_read_notifications(
+        session=session,
+        table=DEFAULT_PARTITION,
+        before=cutoff,
+        archive_dir=archive_dir,
+        swept_at=now,
+    )
+    if default_count:
+        logger.info("Archived %s read notifications from %s", default_count, DEFAULT_PARTITION)
+    return archived_count + default_count
@@ -0,0 +1,191 @@
+import asyncio
+import datetime
+import json
+import logging
+from collections.abc import AsyncIterator
+from uuid import UUID
+
+import asyncpg
+from sqlalchemy import Row, func, select
+
+from core.config import settings
+from core.database import open_session
+from schemas.auth import AccessTokenClaims
+from schemas.notifications import NotificationRecord
+from services.notifications import NOTIFICATION_CHANNEL, user_notification_items
+from services.token_revocation import revoked_tokens
+from services.utils import decode_cursor, encode_cursor
+
+
+logger = logging.getLogger("notifications")
+
+STREAM_BATCH_SIZE = 100
+# created_at — время начала транзакции, поэтому строка может закоммититься позже уже отправленной,
+# но с меньшим ключом. Окно перечитывания покрывает такие строки, а отправленные этим потоком id отсекаются.
+# После переподключения известен только последний id, и окно отправляется заново: доставка «хотя бы раз»,
+# клиент убирает повторы по id.
+STREAM_LOOKBACK = datetime.timedelta(seconds=30)
+
+
+class NotificationSubscription:
+    def __init__(self, *, user_id: UUID):
+        self.user_id = user_id
+        # Сигналы схлопываются в один флаг: медленный клиент не копит очередь, а при пробуждении
+        # сам дочитывает из БД всё, что накопилось после его курсора.
+        self.wake = asyncio.Event()
+
+
+class NotificationBroker:
+    """Слушает LISTEN-канал уведомлений и будит подписки этого процесса."""
+
+    def __init__(self):
+        self._subscriptions: dict[UUID, set[NotificationSubscription]] = {}
+
+    def subscribe(self, *, user_id: UUID) -> NotificationSubscription:
+        subscription = NotificationSubscription(user_id=user_id)
+        self._subscriptions.setdefault(user_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: NotificationSubscription) -> None:
+        subscriptions = self._subscriptions.get(subscription.user_id)
+        if subscriptions is None:
+            return
+        subscriptions.discard(subscription)
+        if not subscriptions:
+            del self._subscriptions[subscription.user_id]
+
+    def wake(self, user_id: UUID | None) -> None:
+        if user_id is None:
+            targets = [subscription for subscriptions in self._subscriptions.values() for subscription in subscriptions]
+        else:
+            targets = list(self._subscriptions.get(user_id, ()))
+        for subscription in targets:
+            subscription.wake.set()
+
+    def _handle_notify(self, _connection: asyncpg.Connection, _pid: int, _channel: str, payload: str) -> None:
+        try:
+            user_id = json.loads(payload).get("user_id")
+            self.wake(UUID(user_id) if user_id is not None else None)
+        except (ValueError, TypeError, AttributeError):
+            logger.warning("Ignoring malformed notification signal %r", payload)
+
+    async def run(self) -> None:
+        while True:
+            try:
+                connection = await asyncpg.connect(settings.listen_database_url)
+            except Exception:
+                logger.exception("Failed to connect notification listener")
+                await asyncio.sleep(settings.notification_stream_reconnect_seconds)
+                continue
+            closed = asyncio.Event()
+            connection.add_termination_listener(lambda _connection: closed.set())
+            try:
+                await connection.add_listener(NOTIFICATION_CHANNEL, self._handle_notify)
+                # Пока слушателя не было, сигналы терялись: будим всех, чтобы они дочитали пропущенное.
+                self.wake(None)
+                await closed.wait()
+                logger.warning("Notification listener connection closed, reconnecting")
+            except Exception:
+                logger.exception("Notification listener failed")
+            finally:
+                if not connection.is_closed():
+                    await connection.close()
+            await asyncio.sleep(settings.notification_stream_reconnect_seconds)
+
+
+notification_broker = NotificationBroker()
+# Широковещательный сигнал будит тысячи подписок разом; дочитывание из БД ограничиваем, чтобы не выбрать весь пул.
+stream_fetch_slots = asyncio.Semaphore(settings.notification_stream_fetch_concurrency)
+
+
+class NotificationStreamCursor:
+    def __init__(self, *, since: datetime.datetime, sent: dict[UUID, datetime.datetime]):
+        self.since = since
+        self.sent = sent
+
+    def advance(self, notifications: list[Row]) -> None:
+        for notification in notifications:
+            self.sent[notification.id] = notification.created_at
+            self.since = max(self.since, notification.created_at)
+        horizon = self.since - STREAM_LOOKBACK
+        for notification_id in [key for key, created_at in self.sent.items() if created_at < horizon]:
+            del self.sent[notification_id]
+
+
+async def open_stream_cursor(*, user_id: UUID, last_event_id: str | None) -> NotificationStreamCursor:
+    if last_event_id is not None:
+        # Что ещё клиент получил в окне перечитывания, неизвестно: отсечь всё до его ключа значило бы потерять
+        # строки, закоммиченные после обрыва с меньшим ключом, поэтому окно уходит повторно.
+        created_at, notification_id = decode_cursor(last_event_id, size=2)
+        return NotificationStreamCursor(since=created_at, sent={notification_id: created_at})
+    # Новый клиент получает только уведомления, появившиеся после подключения.
+    async with open_session() as session:
+        since = await session.scalar(select(func.now()))
+        items = user_notification_items(user_id=user_id)
+        recent = await session.execute(
+            select(items.c.id, items.c.created_at).where(items.c.created_at > since - STREAM_LOOKBACK)
+        )
+        return NotificationStreamCursor(since=since, sent={row.id: row.created_at for row in recent})
+
+
+async def _fetch_stream_batch(*, user_id: UUID, cursor: NotificationStreamCursor) -> list[Row]:
+    items = user_notification_items(user_id=user_id)
+    async with stream_fetch_slots:
+        async with open_session() as session:
+            result = await session.execute(
+                select(items)
+                .where(items.c.created_at >= cursor.since - STREAM_LOOKBACK)
+                .order_by(items.c.created_at, items.c.id)
+                .limit(STREAM_BATCH_SIZE + len(cursor.sent))
+            )
+            return [row for row in result if row.id not in cursor.sent]
+
+
+def _format_event(notification: Row) -> str:
+    record = NotificationRecord.model_validate(notification)
+    event_id = encode_cursor([notification.created_at, notification.id])
+    return f"id: {event_id}\nevent: notification\ndata: {record.model_dump_json()}\n\n"
+
+
+def _is_stream_authorized(claims: AccessTokenClaims) -> bool:
+    if revoked_tokens.is_revoked(user_id=claims.sub, token_version=claims.ver):
+        return False
+    return claims.exp > datetime.datetime.now(datetime.UTC)
+
+
+async def stream_notifications(
+    *,
+    claims: AccessTokenClaims,
+    cursor: NotificationStreamCursor,
+) -> AsyncIterator[str]:
+    user_id = claims.sub
+    subscription = notification_broker.subscribe(user_id=user_id)
+    # Первый проход дочитывает всё после Last-Event-ID, не дожидаясь сигнала.
+    subscription.wake.set()
+    try:
+        yield f"retry: {settings.notification_stream_retry_milliseconds}\n\n"
+        while True:
+            # Токен проверен только при открытии потока, поэтому поток живёт не дольше токена и обрывается при
+            # отзыве: клиент переподключится с новым токеном и дочитает пропущенное по Last-Event-ID.
+            if not _is_stream_authorized(claims):
+                return
+            expires_in = (claims.exp - datetime.datetime.now(datetime.UTC)).total_seconds()
+            try:
+                await asyncio.wait_for(
+                    subscription.wake.wait(),
+                    timeout=min(settings.notification_stream_heartbeat_seconds, expires_in),
+                )
+            except TimeoutError:
+                if _is_stream_authorized(claims):
+                    yield ": keepalive\n\n"
+                continue
+            subscription.wake.clear()
+            while True:
+                notifications = await _fetch_stream_batch(user_id=user_id, cursor=cursor)
+                cursor.advance(notifications)
+                for notification in notifications:
+                    yield _format_event(notification)
+                if len(notifications) < STREAM_BATCH_SIZE:
+                    break
+    finally:
+        notification_broker.unsubscribe(subscription)
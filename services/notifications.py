@@ -1,18 +1,37 @@
-from uuid import UUID
+import datetime
+import json
+from collections import Counter
+from collections.abc import Mapping, Sequence
+from typing import Any
+from uuid import UUID, uuid4
 
-from sqlalchemy import select
+from sqlalchemy import Row, Select, and_, delete, false, func, literal, not_, or_, select, text, true, union_all, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+from sqlalchemy.sql.elements import ColumnElement
+from sqlalchemy.sql.selectable import Subquery
 
+from core.config import settings
+from core.enums import NotificationDeliveryStatus, NotificationType
 from models.event import Event
-from models.notification import Notification
+from models.notification import BroadcastNotification, BroadcastNotificationReceipt, Notification, NotificationCounter
 from models.user import User
 from schemas.notifications import (
+    NotificationBulkPayload,
+    NotificationBulkResult,
     NotificationCreatePayload,
     NotificationListParams,
     NotificationRecord,
+    NotificationUnreadCountRecord,
     NotificationUpdatePayload,
 )
-from services.utils import load_entity
+from services.exceptions import EntityNotFoundError, InvalidStateError
+from services.telegram import TelegramClient, TelegramMessage, TelegramSendResult
+from services.utils import apply_keyset_pagination, load_entity
+
+
+NOTIFICATION_CHANNEL = "notifications"
 
 
 async def create_notification(
@@ -37,35 +56,146 @@ async def create_notification(
         related_event_id=payload.related_event_id,
     )
     session.add(notification)
+    if not notification.is_read:
+        await adjust_unread_counts(session=session, deltas={notification.user_id: 1})
+    await publish_notification_signal(session=session, user_id=notification.user_id)
     await session.commit()
     await session.refresh(notification)
     return NotificationRecord.model_validate(notification)
 
 
+async def publish_notification_signal(*, session: AsyncSession, user_id: UUID | None) -> None:
+    # NOTIFY доставляется только после коммита транзакции; user_id=None будит всех подписчиков.
+    payload = json.dumps({"user_id": str(user_id) if user_id is not None else None})
+    await session.execute(select(func.pg_notify(NOTIFICATION_CHANNEL, payload)))
+
+
 async def list_notifications(
     *,
     session: AsyncSession,
     params: NotificationListParams,
 ) -> list[NotificationRecord]:
-    query = select(Notification)
-    if params.user_id is not None:
-        query = query.where(Notification.user_id == params.user_id)
-    if params.type is not None:
-        query = query.where(Notification.type == params.type)
-    if params.is_read is not None:
-        query = query.where(Notification.is_read == params.is_read)
-    query = query.offset(params.offset).limit(params.limit)
-    result = await session.scalars(query)
-    return [NotificationRecord.model_validate(item) for item in result]
-
-
-async def get_notification(*, session: AsyncSession, notification_id: UUID) -> NotificationRecord:
-    notification = await load_entity(
-        session=session,
-        model=Notification,
-        entity_id=notification_id,
-        entity_label="Notification",
+    if params.user_id is None:
+        # Без получателя широковещательные уведомления не к кому привязать: отдаём только адресные.
+        query = select(Notification)
+        if params.type is not None:
+            query = query.where(Notification.type == params.type)
+        if params.is_read is not None:
+            query = query.where(Notification.is_read == params.is_read)
+        query = apply_keyset_pagination(
+            query,
+            model=Notification,
+            cursor=params.cursor,
+            offset=params.offset,
+            limit=params.limit,
+        )
+        result = await session.scalars(query)
+        return [NotificationRecord.model_validate(item) for item in result]
+    items = user_notification_items(user_id=params.user_id, notification_type=params.type, is_read=params.is_read)
+    query = apply_keyset_pagination(
+        select(items),
+        model=aliased(Notification, items),
+        cursor=params.cursor,
+        offset=params.offset,
+        limit=params.limit,
+    )
+    result = await session.execute(query)
+    return [NotificationRecord.model_validate(row) for row in result]
+
+
+def user_notification_items(
+    *,
+    user_id: UUID,
+    notification_type: NotificationType | None = None,
+    is_read: bool | None = None,
+) -> Subquery:
+    direct = select(
+        Notification.id,
+        Notification.user_id,
+        Notification.type,
+        Notification.title,
+        Notification.message,
+        Notification.is_read,
+        Notification.related_event_id,
+        Notification.created_at,
+        Notification.updated_at,
+        false().label("is_broadcast"),
+    ).where(Notification.user_id == user_id)
+    if notification_type is not None:
+        direct = direct.where(Notification.type == notification_type)
+    if is_read is not None:
+        direct = direct.where(Notification.is_read == is_read)
+    broadcast = _broadcast_items(user_id=user_id, notification_type=notification_type, is_read=is_read)
+    return union_all(direct, broadcast).subquery("notification_items")
+
+
+def _broadcast_items(
+    *,
+    user_id: UUID,
+    notification_type: NotificationType | None = None,
+    is_read: bool | None = None,
+) -> Select:
+    broadcast_is_read = or_(
+        func.coalesce(BroadcastNotificationReceipt.is_read, false()),
+        func.coalesce(BroadcastNotification.created_at < NotificationCounter.broadcast_read_until, false()),
     )
+    query = (
+        select(
+            BroadcastNotification.id,
+            literal(user_id, type_=Notification.user_id.type).label("user_id"),
+            BroadcastNotification.type,
+            BroadcastNotification.title,
+            BroadcastNotification.message,
+            broadcast_is_read.label("is_read"),
+            BroadcastNotification.related_event_id,
+            BroadcastNotification.created_at,
+            BroadcastNotification.updated_at,
+            true().label("is_broadcast"),
+        )
+        .select_from(BroadcastNotification)
+        # Уведомление видят пользователи роли-адресата, существовавшие на момент рассылки, — как и при копиях.
+        .join(
+            User,
+            and_(
+                User.id == user_id,
+                User.role == BroadcastNotification.audience_role,
+                User.created_at <= BroadcastNotification.created_at,
+            ),
+        )
+        .outerjoin(
+            BroadcastNotificationReceipt,
+            and_(
+                BroadcastNotificationReceipt.broadcast_id == BroadcastNotification.id,
+                BroadcastNotificationReceipt.user_id == user_id,
+            ),
+        )
+        .outerjoin(NotificationCounter, NotificationCounter.user_id == user_id)
+        .where(func.coalesce(BroadcastNotificationReceipt.is_deleted, false()) == false())
+    )
+    if notification_type is not None:
+        query = query.where(BroadcastNotification.type == notification_type)
+    if is_read:
+        query = query.where(broadcast_is_read)
+    elif is_read is not None:
+        # Отметка внутри OR индекс не сужает, поэтому повторяем её отдельным диапазоном. Границу считаем
+        # подзапросом: он вычисляется один раз до сканирования, и счётчик читает по
+        # ix_broadcast_notifications_audience_role_created_at только хвост после отметки.
+        unread_since = (
+            select(func.greatest(User.created_at, NotificationCounter.broadcast_read_until))
+            .outerjoin(NotificationCounter, NotificationCounter.user_id == User.id)
+            .where(User.id == user_id)
+            .scalar_subquery()
+        )
+        query = query.where(not_(broadcast_is_read), BroadcastNotification.created_at >= unread_since)
+    return query
+
+
+async def get_notification(*, session: AsyncSession, notification_id: UUID, user_id: UUID) -> NotificationRecord:
+    notification = await session.get(Notification, notification_id)
+    if notification is None:
+        return NotificationRecord.model_validate(
+            await _load_broadcast_item(session=session, notification_id=notification_id, user_id=user_id)
+        )
     return NotificationRecord.model_validate(notification)
 
 
@@ -73,14 +203,18 @@ async def update_notification(
     *,
     session: AsyncSession,
     notification_id: UUID,
+    user_id: UUID,
     payload: NotificationUpdatePayload,
 ) -> NotificationRecord:
-    notification = await load_entity(
-        session=session,
-        model=Notification,
-        entity_id=notification_id,
-        entity_label="Notification",
-    )
+    # Блокировка строки: иначе параллельные PUT прочитают одно и то же is_read и дважды сдвинут счётчик.
+    notification = await session.get(Notification, notification_id, with_for_update=True)
+    if notification is None:
+        return await _update_broadcast_item(
+            session=session,
+            notification_id=notification_id,
+            user_id=user_id,
+            payload=payload,
+        )
     update_data = payload.model_dump(exclude_unset=True)
     if "related_event_id" in update_data and update_data["related_event_id"] is not None:
         await load_entity(
@@ -89,22 +223,613 @@ async def update_notification(
             entity_id=update_data["related_event_id"],
             entity_label="Event",
         )
+    was_unread = not notification.is_read
     for attribute, value in update_data.items():
         setattr(notification, attribute, value)
+    await adjust_unread_counts(
+        session=session,
+        deltas={notification.user_id: int(not notification.is_read) - int(was_unread)},
+    )
     await session.commit()
     await session.refresh(notification)
     return NotificationRecord.model_validate(notification)
 
 
-async def delete_notification(*, session: AsyncSession, notification_id: UUID) -> NotificationRecord:
-    notification = await load_entity(
-        session=session,
-        model=Notification,
-        entity_id=notification_id,
-        entity_label="Notification",
-    )
+async def delete_notification(*, session: AsyncSession, notification_id: UUID, user_id: UUID) -> NotificationRecord:
+    notification = await session.get(Notification, notification_id, with_for_update=True)
+    if notification is None:
+        item = await _load_broadcast_item(session=session, notification_id=notification_id, user_id=user_id)
+        await _store_broadcast_receipts(session=session, user_id=user_id, broadcast_ids=[item.id], is_deleted=True)
+        await session.commit()
+        return NotificationRecord.model_validate(item)
     record = NotificationRecord.model_validate(notification)
     await session.delete(notification)
+    if not notification.is_read:
+        await adjust_unread_counts(session=session, deltas={notification.user_id: -1})
     await session.commit()
     return record
 
+
+async def _load_broadcast_item(*, session: AsyncSession, notification_id: UUID, user_id: UUID) -> Row:
+    # Широковещательное уведомление общее для роли, поэтому по id отдаём его только в представлении адресата.
+    item = (
+        await session.execute(_broadcast_items(user_id=user_id).where(BroadcastNotification.id == notification_id))
+    ).one_or_none()
+    if item is None:
+        raise EntityNotFoundError("Notification")
+    return item
+
+
+async def _update_broadcast_item(
+    *,
+    session: AsyncSession,
+    notification_id: UUID,
+    user_id: UUID,
+    payload: NotificationUpdatePayload,
+) -> NotificationRecord:
+    item = await _load_broadcast_item(session=session, notification_id=notification_id, user_id=user_id)
+    update_data = payload.model_dump(exclude_unset=True)
+    # Текст рассылки общий для всех адресатов; у получателя своё только состояние прочтения.
+    if set(update_data) - {"is_read"}:
+        raise InvalidStateError("Only is_read can be changed on a broadcast notification")
+    if update_data.get("is_read") is False:
+        raise InvalidStateError("Broadcast notifications cannot be marked unread")
+    if update_data.get("is_read") and not item.is_read:
+        await _store_broadcast_receipts(session=session, user_id=user_id, broadcast_ids=[item.id], is_read=True)
+        await session.commit()
+        item = await _load_broadcast_item(session=session, notification_id=notification_id, user_id=user_id)
+    return NotificationRecord.model_validate(item)
+
+
+async def mark_notifications_read(
+    *,
+    session: AsyncSession,
+    payload: NotificationBulkPayload,
+    caller_id: UUID,
+) -> NotificationBulkResult:
+    rows = (
+        await session.execute(
+            update(Notification)
+            .where(*_bulk_notification_filters(payload), Notification.is_read == false())
+            .values(is_read=True, updated_at=func.now())
+            .returning(Notification.id, Notification.user_id)
+            .execution_options(synchronize_session=False)
+        )
+    ).all()
+    read_counts = Counter(row.user_id for row in rows)
+    await adjust_unread_counts(session=session, deltas={user_id: -count for user_id, count in read_counts.items()})
+    notification_ids = [row.id for row in rows]
+    notification_ids.extend(
+        await _mark_broadcasts_read(session=session, payload=payload, user_id=_broadcast_user_id(payload, caller_id))
+    )
+    await session.commit()
+    return NotificationBulkResult(affected_count=len(notification_ids), notification_ids=notification_ids)
+
+
+async def delete_notifications(
+    *,
+    session: AsyncSession,
+    payload: NotificationBulkPayload,
+    caller_id: UUID,
+) -> NotificationBulkResult:
+    rows = (
+        await session.execute(
+            delete(Notification)
+            .where(*_bulk_notification_filters(payload))
+            .returning(Notification.id, Notification.user_id, Notification.is_read)
+            .execution_options(synchronize_session=False)
+        )
+    ).all()
+    unread_deleted = Counter(row.user_id for row in rows if not row.is_read)
+    await adjust_unread_counts(session=session, deltas={user_id: -count for user_id, count in unread_deleted.items()})
+    notification_ids = [row.id for row in rows]
+    broadcast_user_id = _broadcast_user_id(payload, caller_id)
+    broadcast_ids = await _select_broadcast_ids(session=session, payload=payload, user_id=broadcast_user_id)
+    await _store_broadcast_receipts(
+        session=session,
+        user_id=broadcast_user_id,
+        broadcast_ids=broadcast_ids,
+        is_deleted=True,
+    )
+    notification_ids.extend(broadcast_ids)
+    await session.commit()
+    return NotificationBulkResult(affected_count=len(notification_ids), notification_ids=notification_ids)
+
+
+def _bulk_notification_filters(payload: NotificationBulkPayload) -> list[ColumnElement[bool]]:
+    # Без ids или user_id фильтр задел бы уведомления всех пользователей разом.
+    if not payload.ids and payload.user_id is None:
+        raise InvalidStateError("Either ids or user_id must be provided")
+    filters = []
+    if payload.ids:
+        filters.append(Notification.id.in_(payload.ids))
+    if payload.user_id is not None:
+        filters.append(Notification.user_id == payload.user_id)
+    if payload.type is not None:
+        filters.append(Notification.type == payload.type)
+    if payload.before is not None:
+        filters.append(Notification.created_at < payload.before)
+    return filters
+
+
+def _broadcast_user_id(payload: NotificationBulkPayload, caller_id: UUID) -> UUID:
+    # Состояние рассылки хранится на получателя; если получатель не указан, id рассылок относятся к вызывающему.
+    return payload.user_id if payload.user_id is not None else caller_id
+
+
+async def _select_broadcast_ids(
+    *,
+    session: AsyncSession,
+    payload: NotificationBulkPayload,
+    user_id: UUID,
+    is_read: bool | None = None,
+) -> list[UUID]:
+    items = _broadcast_items(user_id=user_id, notification_type=payload.type, is_read=is_read).subquery()
+    query = select(items.c.id)
+    if payload.ids:
+        query = query.where(items.c.id.in_(payload.ids))
+    if payload.before is not None:
+        query = query.where(items.c.created_at < payload.before)
+    return list(await session.scalars(query))
+
+
+async def _mark_broadcasts_read(
+    *,
+    session: AsyncSession,
+    payload: NotificationBulkPayload,
+    user_id: UUID,
+) -> list[UUID]:
+    broadcast_ids = await _select_broadcast_ids(session=session, payload=payload, user_id=user_id, is_read=False)
+    if payload.ids or payload.type is not None:
+        await _store_broadcast_receipts(session=session, user_id=user_id, broadcast_ids=broadcast_ids, is_read=True)
+        return broadcast_ids
+    # «Прочитать всё» сдвигает отметку вместо строки на каждое уведомление; строки, которые она покрыла, удаляем.
+    read_until = func.least(payload.before, func.now()) if payload.before is not None else func.now()
+    statement = pg_insert(NotificationCounter).values(id=uuid4(), user_id=user_id, broadcast_read_until=read_until)
+    await session.execute(
+        statement.on_conflict_do_update(
+            index_elements=[NotificationCounter.user_id],
+            set_={
+                "broadcast_read_until": func.greatest(
+                    NotificationCounter.broadcast_read_until,
+                    statement.excluded.broadcast_read_until,
+                ),
+                "updated_at": func.now(),
+            },
+        )
+    )
+    await session.execute(
+        delete(BroadcastNotificationReceipt)
+        .where(
+            BroadcastNotificationReceipt.user_id == user_id,
+            BroadcastNotificationReceipt.is_deleted == false(),
+            BroadcastNotificationReceipt.delivery_status.is_(None),
+            BroadcastNotificationReceipt.broadcast_id.in_(
+                select(BroadcastNotification.id)
+                .join(NotificationCounter, NotificationCounter.user_id == user_id)
+                .where(BroadcastNotification.created_at < NotificationCounter.broadcast_read_until)
+            ),
+        )
+        .execution_options(synchronize_session=False)
+    )
+    return broadcast_ids
+
+
+async def _store_broadcast_receipts(
+    *,
+    session: AsyncSession,
+    user_id: UUID,
+    broadcast_ids: Sequence[UUID],
+    **state: Any,
+) -> None:
+    if not broadcast_ids:
+        return
+    statement = pg_insert(BroadcastNotificationReceipt).values(
+        [
+            {"id": uuid4(), "broadcast_id": broadcast_id, "user_id": user_id, **state}
+            for broadcast_id in sorted(broadcast_ids)
+        ]
+    )
+    await session.execute(
+        statement.on_conflict_do_update(
+            index_elements=[BroadcastNotificationReceipt.broadcast_id, BroadcastNotificationReceipt.user_id],
+            set_={**{attribute: statement.excluded[attribute] for attribute in state}, "updated_at": func.now()},
+        )
+    )
+
+
+async def get_unread_count(*, session: AsyncSession, user_id: UUID) -> NotificationUnreadCountRecord:
+    # Адресные уведомления берутся из счётчика, широковещательных на пользователя немного — их считаем по индексу.
+    direct_count = (
+        select(NotificationCounter.unread_count).where(NotificationCounter.user_id == user_id).scalar_subquery()
+    )
+    broadcast_count = (
+        select(func.count()).select_from(_broadcast_items(user_id=user_id, is_read=False).subquery()).scalar_subquery()
+    )
+    unread_count = await session.scalar(select(func.coalesce(direct_count, 0) + broadcast_count))
+    return NotificationUnreadCountRecord(user_id=user_id, unread_count=unread_count or 0)
+
+
+async def adjust_unread_counts(*, session: AsyncSession, deltas: Mapping[UUID, int]) -> None:
+    rows = [
+        {"id": uuid4(), "user_id": user_id, "unread_count": delta}
+        # Строки счётчиков блокируются в порядке user_id, чтобы параллельные пакеты не взаимоблокировались.
+        for user_id, delta in sorted(deltas.items())
+        if delta
+    ]
+    if not rows:
+        return
+    statement = pg_insert(NotificationCounter).values(rows)
+    await session.execute(
+        statement.on_conflict_do_update(
+            index_elements=[NotificationCounter.user_id],
+            set_={
+                "unread_count": NotificationCounter.unread_count + statement.excluded.unread_count,
+                "updated_at": func.now(),
+            },
+        )
+    )
+
+
+async def reconcile_notification_counters(*, session: AsyncSession) -> int:
+    actual_count = (
+        select(func.count(Notification.id))
+        .where(Notification.user_id == NotificationCounter.user_id, Notification.is_read == false())
+        .correlate(NotificationCounter)
+        .scalar_subquery()
+    )
+    drifted_ids = list(
+        await session.scalars(
+            select(NotificationCounter.id)
+            .where(NotificationCounter.unread_count != actual_count)
+            .order_by(NotificationCounter.user_id)
+            .with_for_update()
+        )
+    )
+    if drifted_ids:
+        await session.execute(
+            update(NotificationCounter)
+            .where(NotificationCounter.id.in_(drifted_ids))
+            .values(unread_count=actual_count, updated_at=func.now())
+            .execution_options(synchronize_session=False)
+        )
+    # Пользователи с непрочитанными, но без строки счётчика: параллельная вставка выиграет конфликт
+    # и досчитает своё уведомление сама, поэтому здесь достаточно DO NOTHING.
+    missing_counts = (
+        select(func.gen_random_uuid(), Notification.user_id, func.count(Notification.id))
+        .where(
+            Notification.is_read == false(),
+            ~select(NotificationCounter.id).where(NotificationCounter.user_id == Notification.user_id).exists(),
+        )
+        .group_by(Notification.user_id)
+    )
+    created = await session.execute(
+        pg_insert(NotificationCounter)
+        .from_select(["id", "user_id", "unread_count"], missing_counts)
+        .on_conflict_do_nothing(index_elements=[NotificationCounter.user_id])
+        .returning(NotificationCounter.id)
+    )
+    return len(drifted_ids) + len(created.all())
+
+
+
+async def deliver_pending_notifications(
+    *,
+    session: AsyncSession,
+    client: TelegramClient,
+    batch_size: int,
+) -> int:
+    query = (
+        select(Notification, User.telegram_chat_id)
+        .join(User, User.id == Notification.user_id)
+        # Литерал вместо bind-параметра: так планировщик использует частичный индекс ix_notifications_pending_delivery.
+        .where(text("notifications.delivery_status = 'PENDING'"), Notification.next_attempt_at <= func.now())
+        .order_by(Notification.next_attempt_at)
+        .limit(batch_size)
+        .with_for_update(of=Notification, skip_locked=True)
+    )
+    rows = (await session.execute(query)).all()
+    if not rows:
+        return 0
+    candidates = [(notification.id, notification.delivery_attempts, chat_id) for notification, chat_id in rows]
+    claimed_ids = await _claim_deliveries(session=session, model=Notification, candidates=candidates)
+    deliverable = [(notification, chat_id) for notification, chat_id in rows if notification.id in claimed_ids]
+    results = await client.send_batch(
+        [
+            TelegramMessage(chat_id=chat_id, text=_build_telegram_text(notification=notification))
+            for notification, chat_id in deliverable
+        ]
+    )
+    sent_ids, failed_ids, retry_ids = _split_delivery_results(
+        attempts=[(entity_id, attempts) for entity_id, attempts, _chat_id in candidates if entity_id in claimed_ids],
+        results=results,
+    )
+    await _set_delivery_state(
+        session=session,
+        model=Notification,
+        entity_ids=sent_ids,
+        status=NotificationDeliveryStatus.SENT,
+        delivered_at=func.now(),
+    )
+    await _set_delivery_state(
+        session=session,
+        model=Notification,
+        entity_ids=failed_ids,
+        status=NotificationDeliveryStatus.FAILED,
+    )
+    await _set_delivery_state(
+        session=session,
+        model=Notification,
+        entity_ids=retry_ids,
+        status=NotificationDeliveryStatus.PENDING,
+        next_attempt_at=_retry_at(Notification.delivery_attempts),
+    )
+    await session.commit()
+    return len(rows)
+
+
+async def deliver_pending_broadcasts(
+    *,
+    session: AsyncSession,
+    client: TelegramClient,
+    batch_size: int,
+) -> int:
+    processed = await _deliver_broadcast_batch(session=session, client=client, batch_size=batch_size)
+    processed += await _retry_broadcast_receipts(session=session, client=client, batch_size=batch_size)
+    return processed
+
+
+async def _deliver_broadcast_batch(
+    *,
+    session: AsyncSession,
+    client: TelegramClient,
+    batch_size: int,
+) -> int:
+    claimable_ids = (
+        select(BroadcastNotification.id)
+        .where(
+            text("broadcast_notifications.delivery_status = 'PENDING'"),
+            BroadcastNotification.next_attempt_at <= func.now(),
+        )
+        .order_by(BroadcastNotification.next_attempt_at)
+        .limit(1)
+        .with_for_update(skip_locked=True)
+    )
+    # Рассылку арендуем, а не держим под блокировкой: другой процесс не возьмёт ту же пачку получателей,
+    # пока эта отправляется, а после падения процесса пачка повторится по истечении аренды.
+    broadcast = await session.scalar(
+        update(BroadcastNotification)
+        .where(BroadcastNotification.id.in_(claimable_ids.scalar_subquery()))
+        .values(next_attempt_at=_lease_until())
+        .returning(BroadcastNotification)
+    )
+    if broadcast is None:
+        await session.commit()
+        return 0
+    query = (
+        select(User.id, User.telegram_chat_id)
+        .where(
+            User.role == broadcast.audience_role,
+            User.created_at <= broadcast.created_at,
+            # Получателям без чата слать нечего, и строку состояния для них не заводим.
+            User.telegram_chat_id.is_not(None),
+            User.telegram_chat_id != "",
+        )
+        .order_by(User.id)
+        .limit(batch_size)
+    )
+    if broadcast.delivery_cursor is not None:
+        query = query.where(User.id > broadcast.delivery_cursor)
+    recipients = (await session.execute(query)).all()
+    await session.commit()
+    results = await client.send_batch(
+        [
+            TelegramMessage(chat_id=chat_id, text=_build_telegram_text(notification=broadcast))
+            for _user_id, chat_id in recipients
+        ]
+    )
+    _sent_ids, failed_ids, retry_ids = _split_delivery_results(
+        attempts=[(user_id, 0) for user_id, _chat_id in recipients],
+        results=results,
+    )
+    # Неудачи уходят в строки состояния получателя, чтобы обход аудитории не задерживался на повторах.
+    await _store_broadcast_delivery_receipts(
+        session=session,
+        broadcast_id=broadcast.id,
+        user_ids=failed_ids,
+        status=NotificationDeliveryStatus.FAILED,
+    )
+    await _store_broadcast_delivery_receipts(
+        session=session,
+        broadcast_id=broadcast.id,
+        user_ids=retry_ids,
+        status=NotificationDeliveryStatus.PENDING,
+    )
+    if recipients:
+        broadcast.delivery_cursor = recipients[-1].id
+    broadcast.next_attempt_at = func.now()
+    if len(recipients) < batch_size:
+        broadcast.delivery_status = NotificationDeliveryStatus.SENT
+        broadcast.delivered_at = func.now()
+    await session.commit()
+    return len(recipients)
+
+
+async def _store_broadcast_delivery_receipts(
+    *,
+    session: AsyncSession,
+    broadcast_id: UUID,
+    user_ids: list[UUID],
+    status: NotificationDeliveryStatus,
+) -> None:
+    if not user_ids:
+        return
+    statement = pg_insert(BroadcastNotificationReceipt).values(
+        [
+            {
+                "id": uuid4(),
+                "broadcast_id": broadcast_id,
+                "user_id": user_id,
+                "delivery_status": status,
+                "delivery_attempts": 1,
+                "next_attempt_at": _retry_at(1),
+            }
+            for user_id in sorted(user_ids)
+        ]
+    )
+    await session.execute(
+        statement.on_conflict_do_update(
+            index_elements=[BroadcastNotificationReceipt.broadcast_id, BroadcastNotificationReceipt.user_id],
+            set_={
+                "delivery_status": status,
+                "delivery_attempts": 1,
+                "next_attempt_at": statement.excluded.next_attempt_at,
+                "updated_at": func.now(),
+            },
+        )
+    )
+
+
+async def _retry_broadcast_receipts(*, session: AsyncSession, client: TelegramClient, batch_size: int) -> int:
+    rows = (
+        await session.execute(
+            select(BroadcastNotificationReceipt, BroadcastNotification, User.telegram_chat_id)
+            .join(BroadcastNotification, BroadcastNotification.id == BroadcastNotificationReceipt.broadcast_id)
+            .join(User, User.id == BroadcastNotificationReceipt.user_id)
+            .where(
+                text("broadcast_notification_receipts.delivery_status = 'PENDING'"),
+                BroadcastNotificationReceipt.next_attempt_at <= func.now(),
+            )
+            .order_by(BroadcastNotificationReceipt.next_attempt_at)
+            .limit(batch_size)
+            .with_for_update(of=BroadcastNotificationReceipt, skip_locked=True)
+        )
+    ).all()
+    if not rows:
+        return 0
+    candidates = [(receipt.id, receipt.delivery_attempts, chat_id) for receipt, _broadcast, chat_id in rows]
+    claimed_ids = await _claim_deliveries(session=session, model=BroadcastNotificationReceipt, candidates=candidates)
+    deliverable = [(receipt, broadcast, chat_id) for receipt, broadcast, chat_id in rows if receipt.id in claimed_ids]
+    results = await client.send_batch(
+        [
+            TelegramMessage(chat_id=chat_id, text=_build_telegram_text(notification=broadcast))
+            for _receipt, broadcast, chat_id in deliverable
+        ]
+    )
+    sent_ids, failed_ids, retry_ids = _split_delivery_results(
+        attempts=[(entity_id, attempts) for entity_id, attempts, _chat_id in candidates if entity_id in claimed_ids],
+        results=results,
+    )
+    for entity_ids, status, values in (
+        (sent_ids, NotificationDeliveryStatus.SENT, {}),
+        (failed_ids, NotificationDeliveryStatus.FAILED, {}),
+        (
+            retry_ids,
+            NotificationDeliveryStatus.PENDING,
+            {"next_attempt_at": _retry_at(BroadcastNotificationReceipt.delivery_attempts)},
+        ),
+    ):
+        await _set_delivery_state(
+            session=session,
+            model=BroadcastNotificationReceipt,
+            entity_ids=entity_ids,
+            status=status,
+            **values,
+        )
+    await session.commit()
+    return len(rows)
+
+
+async def _claim_deliveries(
+    *,
+    session: AsyncSession,
+    model: type[Notification] | type[BroadcastNotificationReceipt],
+    candidates: list[tuple[UUID, int, str | None]],
+) -> set[UUID]:
+    skipped_ids = [entity_id for entity_id, _attempts, chat_id in candidates if not chat_id]
+    # Попытка засчитывается при захвате: строка, на отправке которой процесс падал, не будет повторяться бесконечно.
+    exhausted_ids = [
+        entity_id
+        for entity_id, attempts, chat_id in candidates
+        if chat_id and attempts >= settings.telegram_max_delivery_attempts
+    ]
+    claimed_ids = [
+        entity_id
+        for entity_id, attempts, chat_id in candidates
+        if chat_id and attempts < settings.telegram_max_delivery_attempts
+    ]
+    await _set_delivery_state(
+        session=session,
+        model=model,
+        entity_ids=skipped_ids,
+        status=NotificationDeliveryStatus.SKIPPED,
+    )
+    await _set_delivery_state(
+        session=session,
+        model=model,
+        entity_ids=exhausted_ids,
+        status=NotificationDeliveryStatus.FAILED,
+    )
+    if claimed_ids:
+        await session.execute(
+            update(model)
+            .where(model.id.in_(claimed_ids))
+            .values(delivery_attempts=model.delivery_attempts + 1, next_attempt_at=_lease_until())
+            .execution_options(synchronize_session=False)
+        )
+    # Захват фиксируется до отправки: пока идут запросы к Telegram, не держим ни блокировки строк, ни транзакцию.
+    await session.commit()
+    return set(claimed_ids)
+
+
+def _lease_until() -> ColumnElement[datetime.datetime]:
+    return func.now() + datetime.timedelta(seconds=settings.telegram_delivery_lease_seconds)
+
+
+def _retry_at(attempts: ColumnElement[int] | int) -> ColumnElement[datetime.datetime]:
+    # attempts уже учитывает неудачную попытку; пауза удваивается с каждой следующей, как у повторов задач воркера.
+    delay_seconds = func.least(
+        settings.telegram_retry_base_seconds * func.power(2, attempts - 1),
+        settings.telegram_retry_max_seconds,
+    )
+    return func.now() + func.make_interval(0, 0, 0, 0, 0, 0, delay_seconds)
+
+
+def _split_delivery_results(
+    *,
+    attempts: list[tuple[UUID, int]],
+    results: list[TelegramSendResult],
+) -> tuple[list[UUID], list[UUID], list[UUID]]:
+    sent_ids = []
+    failed_ids = []
+    retry_ids = []
+    for (entity_id, delivery_attempts), result in zip(attempts, results):
+        if result["ok"]:
+            sent_ids.append(entity_id)
+        elif result["retryable"] and delivery_attempts + 1 < settings.telegram_max_delivery_attempts:
+            retry_ids.append(entity_id)
+        else:
+            failed_ids.append(entity_id)
+    return sent_ids, failed_ids, retry_ids
+
+
+async def _set_delivery_state(
+    *,
+    session: AsyncSession,
+    model: type[Notification] | type[BroadcastNotificationReceipt],
+    entity_ids: list[UUID],
+    status: NotificationDeliveryStatus,
+    **values: Any,
+) -> None:
+    if not entity_ids:
+        return
+    await session.execute(
+        update(model)
+        .where(model.id.in_(entity_ids))
+        .values(delivery_status=status, **values)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def _build_telegram_text(*, notification: Notification | BroadcastNotification) -> str:
+    return f"{notification.title}\n\n{notification.message}"
@@ -1,12 +1,24 @@
+import datetime
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import Select, bindparam, select
+from sqlalchemy.dialects.postgresql import Range
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from core.enums import EventStatus
+from models.event import Event
 from models.room import Room
 from services.exceptions import EntityConflictError, InvalidStateError
-from services.utils import load_entity
+from services.utils import (
+    ResourceVersion,
+    apply_fuzzy_search,
+    apply_keyset_pagination,
+    collect_ranked,
+    load_entity,
+    load_resource_version,
+)
 from schemas.rooms import (
+    RoomAvailabilityParams,
     RoomCreatePayload,
     RoomListParams,
     RoomRecord,
@@ -33,11 +45,73 @@ async def create_room(*, session: AsyncSession, payload: RoomCreatePayload) -> R
     return RoomRecord.model_validate(room)
 
 
-async def list_rooms(*, session: AsyncSession, params: RoomListParams) -> list[RoomRecord]:
+def _build_room_list_query(params: RoomListParams) -> tuple[Select, bool]:
     query = select(Room)
+    leading_columns = []
+    if params.name:
+        query, search_rank = apply_fuzzy_search(query, column=Room.name, term=params.name)
+        leading_columns.append(search_rank)
     if params.is_available is not None:
         query = query.where(Room.is_available == params.is_available)
-    query = query.offset(params.offset).limit(params.limit)
+    query = apply_keyset_pagination(
+        query,
+        model=Room,
+        cursor=params.cursor,
+        offset=params.offset,
+        limit=params.limit,
+        leading_columns=leading_columns,
+    )
+    return query, bool(leading_columns)
+
+
+async def list_rooms(*, session: AsyncSession, params: RoomListParams) -> list[RoomRecord]:
+    query, is_ranked = _build_room_list_query(params)
+    if is_ranked:
+        rooms = collect_ranked(await session.execute(query))
+    else:
+        rooms = list(await session.scalars(query))
+    return [RoomRecord.model_validate(item) for item in rooms]
+
+
+async def get_room_list_version(*, session: AsyncSession, params: RoomListParams) -> ResourceVersion:
+    query, _is_ranked = _build_room_list_query(params)
+    return await load_resource_version(session=session, query=query, model=Room, scope=params)
+
+
+async def list_available_rooms(*, session: AsyncSession, params: RoomAvailabilityParams) -> list[RoomRecord]:
+    if params.end <= params.start:
+        raise InvalidStateError("end must be later than start")
+    requested_slot = Range(
+        datetime.datetime.combine(params.date, params.start),
+        datetime.datetime.combine(params.date, params.end),
+        bounds="[)",
+    )
+    # Статусы подставляются литералами: так условие совпадает с предикатом exclusion-ограничения
+    # и проверка занятости идёт по его GiST-индексу (room_id, booked_during).
+    overlapping_event = select(Event.id).where(
+        Event.room_id == Room.id,
+        Event.booked_during.overlaps(requested_slot),
+        Event.status.not_in(
+            bindparam(
+                "released_statuses",
+                [EventStatus.REJECTED, EventStatus.CANCELLED],
+                expanding=True,
+                literal_execute=True,
+            )
+        ),
+    )
+    query = select(Room).where(Room.is_available.is_(True), ~overlapping_event.exists())
+    if params.min_capacity is not None:
+        query = query.where(Room.capacity >= params.min_capacity)
+    if params.equipment:
+        query = query.where(Room.equipment.contains({item: True for item in params.equipment}))
+    query = apply_keyset_pagination(
+        query,
+        model=Room,
+        cursor=params.cursor,
+        offset=params.offset,
+        limit=params.limit,
+    )
     result = await session.scalars(query)
     return [RoomRecord.model_validate(item) for item in result]
 
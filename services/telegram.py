@@ -0,0 +1,143 @@
+import asyncio
+import itertools
+import json
+import time
+from collections import deque
+from typing import TypedDict
+
+import httpx
+
+from core.config import settings
+from core.rate_limit import KeyedTokenBucket, TokenBucket
+
+
+MAX_RATE_LIMIT_RETRIES = 3
+
+
+class TelegramMessage(TypedDict):
+    chat_id: str
+    text: str
+
+
+class TelegramSendResult(TypedDict):
+    ok: bool
+    retryable: bool
+    error: str | None
+
+
+class TelegramClient:
+    def __init__(
+        self,
+        *,
+        token: str,
+        api_url: str = settings.telegram_api_url,
+        pool_size: int = settings.telegram_pool_size,
+        timeout_seconds: float = settings.telegram_request_timeout_seconds,
+        global_rate: float = settings.telegram_global_rate_per_second,
+        per_chat_rate: float = settings.telegram_per_chat_rate_per_second,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ):
+        self._http = httpx.AsyncClient(
+            base_url=f"{api_url.rstrip('/')}/bot{token}",
+            timeout=timeout_seconds,
+            limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size),
+            transport=transport,
+        )
+        self._concurrency = asyncio.Semaphore(pool_size)
+        self._global_bucket = TokenBucket(rate=global_rate, capacity=1)
+        self._chat_buckets = KeyedTokenBucket(rate=per_chat_rate, capacity=1)
+
+    async def send_message(self, message: TelegramMessage) -> TelegramSendResult:
+        chat_bucket = self._chat_buckets.bucket(message["chat_id"])
+        for _ in range(MAX_RATE_LIMIT_RETRIES + 1):
+            # Чатовый токен берём последним, чтобы между ним и запросом не было ожидания глобального лимита.
+            await self._global_bucket.acquire()
+            await chat_bucket.acquire()
+            async with self._concurrency:
+                try:
+                    response = await self._http.post(
+                        "/sendMessage",
+                        json={"chat_id": message["chat_id"], "text": message["text"]},
+                    )
+                except httpx.HTTPError as exc:
+                    return {"ok": False, "retryable": True, "error": repr(exc)}
+            if response.status_code == httpx.codes.TOO_MANY_REQUESTS:
+                chat_bucket.penalize(_parse_retry_after(response))
+                continue
+            if response.is_success:
+                return {"ok": True, "retryable": False, "error": None}
+            # 5xx — временная проблема на стороне Telegram, 4xx (чат не найден, бот заблокирован) — окончательная.
+            return {
+                "ok": False,
+                "retryable": response.is_server_error,
+                "error": f"{response.status_code}: {response.text[:500]}",
+            }
+        return {"ok": False, "retryable": True, "error": "rate limited"}
+
+    async def send_batch(self, messages: list[TelegramMessage]) -> list[TelegramSendResult]:
+        return list(await asyncio.gather(*(self.send_message(message) for message in messages)))
+
+    async def aclose(self) -> None:
+        await self._http.aclose()
+
+
+def _parse_retry_after(response: httpx.Response) -> float:
+    try:
+        return float(response.json()["parameters"]["retry_after"])
+    except (ValueError, KeyError, TypeError):
+        return 1.0
+
+
+class FakeTelegramServer:
+    """In-process эмуляция Bot API: задержка ответа и лимиты Telegram, без сети."""
+
+    def __init__(
+        self,
+        *,
+        latency_seconds: float = 0.05,
+        global_rate: float = settings.telegram_global_rate_per_second,
+        per_chat_rate: float = settings.telegram_per_chat_rate_per_second,
+    ):
+        self.latency_seconds = latency_seconds
+        self.global_rate = global_rate
+        self.per_chat_interval = 1 / per_chat_rate
+        self.delivered: list[TelegramMessage] = []
+        self.rejected_count = 0
+        self._message_ids = itertools.count(1)
+        self._recent_sends: deque[float] = deque()
+        self._last_send_by_chat: dict[str, float] = {}
+        self.transport = httpx.MockTransport(self.handle)
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(self.latency_seconds)
+        body = json.loads(request.content)
+        chat_id = str(body["chat_id"])
+        if chat_id.startswith("blocked"):
+            return httpx.Response(
+                httpx.codes.FORBIDDEN,
+                json={"ok": False, "error_code": 403, "description": "Forbidden: bot was blocked by the user"},
+            )
+        now = time.monotonic()
+        while self._recent_sends and now - self._recent_sends[0] >= 1:
+            self._recent_sends.popleft()
+        last_chat_send = self._last_send_by_chat.get(chat_id)
+        # Небольшой допуск на дрожание таймеров, как у настоящего API.
+        chat_limited = last_chat_send is not None and now - last_chat_send < self.per_chat_interval * 0.9
+        if chat_limited or len(self._recent_sends) >= self.global_rate * 1.1:
+            self.rejected_count += 1
+            return httpx.Response(
+                httpx.codes.TOO_MANY_REQUESTS,
+                json={
+                    "ok": False,
+                    "error_code": 429,
+                    "description": "Too Many Requests: retry after 1",
+                    "parameters": {"retry_after": 1},
+                },
+            )
+        self._recent_sends.append(now)
+        self._last_send_by_chat[chat_id] = now
+        self.delivered.append({"chat_id": chat_id, "text": body["text"]})
+        return httpx.Response(
+            httpx.codes.OK,
+            json={"ok": True, "result": {"message_id": next(self._message_ids), "chat": {"id": chat_id}}},
+        )
@@ -0,0 +1,62 @@
+import asyncio
+import datetime
+import logging
+from uuid import UUID
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.config import settings
+from core.database import open_session
+from models.token import TokenRevocation
+
+
+logger = logging.getLogger("auth")
+
+
+class TokenRevocationSet:
+    """Компактный снимок отзывов в памяти процесса: проверка access-токена не ходит в БД."""
+
+    def __init__(self):
+        self._min_versions: dict[UUID, int] = {}
+
+    def is_revoked(self, *, user_id: UUID, token_version: int) -> bool:
+        return token_version < self._min_versions.get(user_id, 0)
+
+    def add(self, *, user_id: UUID, min_token_version: int) -> None:
+        self._min_versions[user_id] = max(self._min_versions.get(user_id, 0), min_token_version)
+
+    def replace(self, min_versions: dict[UUID, int]) -> None:
+        self._min_versions = min_versions
+
+    def __len__(self) -> int:
+        return len(self._min_versions)
+
+
+revoked_tokens = TokenRevocationSet()
+
+
+def revocation_expires_at() -> datetime.datetime:
+    # Отзыв нужен, пока может жить выпущенный до него access-токен.
+    return datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(minutes=settings.jwt_expiration_minutes)
+
+
+async def sync_token_revocations(*, session: AsyncSession) -> int:
+    result = await session.execute(
+        select(TokenRevocation.user_id, TokenRevocation.min_token_version).where(
+            TokenRevocation.expires_at > func.now()
+        )
+    )
+    revoked_tokens.replace({row.user_id: row.min_token_version for row in result})
+    return len(revoked_tokens)
+
+
+async def run_token_revocation_sync() -> None:
+    while True:
+        try:
+            async with open_session() as session:
+                await sync_token_revocations(session=session)
+        except Exception:
+            # При недоступной БД продолжаем проверять по последнему снимку.
+            logger.exception("Failed to sync token revocations")
+        await asyncio.sleep(settings.token_revocation_sync_interval_seconds)
@@ -0,0 +1,27 @@
+from uuid import UUID
+
+from core.cache import create_cache_backend
+from core.config import settings
+from schemas.users import UserRecord
+
+
+user_cache = create_cache_backend(url=settings.user_cache_url, max_entries=settings.user_cache_max_entries)
+
+
+def _cache_key(user_id: UUID) -> str:
+    return f"user:{user_id}"
+
+
+async def get_cached_user(*, user_id: UUID) -> UserRecord | None:
+    cached = await user_cache.get(_cache_key(user_id))
+    if cached is None:
+        return None
+    return UserRecord.model_validate_json(cached)
+
+
+async def store_cached_user(*, record: UserRecord) -> None:
+    await user_cache.set(_cache_key(record.id), record.model_dump_json(), settings.user_cache_ttl_seconds)
+
+
+async def invalidate_cached_user(*, user_id: UUID) -> None:
+    await user_cache.delete(_cache_key(user_id))
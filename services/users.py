@@ -4,8 +4,10 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from models.user import User, UserProfile
+from services.auth import revoke_deleted_user_tokens, revoke_user_tokens
 from services.exceptions import EntityConflictError, EntityNotFoundError
-from services.utils import load_entity, list_entities
+from services.user_cache import invalidate_cached_user
+from services.utils import apply_fuzzy_search, apply_keyset_pagination, collect_ranked, list_entities, load_entity
 from schemas.users import (
     UserCreatePayload,
     UserListParams,
@@ -37,11 +39,25 @@ async def create_user(*, session: AsyncSession, payload: UserCreatePayload) -> U
 
 async def list_users(*, session: AsyncSession, params: UserListParams) -> list[UserRecord]:
     query = select(User)
+    leading_columns = []
+    if params.login:
+        query, search_rank = apply_fuzzy_search(query, column=User.login, term=params.login)
+        leading_columns.append(search_rank)
     if params.role is not None:
         query = query.where(User.role == params.role)
-    query = query.offset(params.offset).limit(params.limit)
-    result = await session.scalars(query)
-    return [UserRecord.model_validate(item) for item in result]
+    query = apply_keyset_pagination(
+        query,
+        model=User,
+        cursor=params.cursor,
+        offset=params.offset,
+        limit=params.limit,
+        leading_columns=leading_columns,
+    )
+    if leading_columns:
+        users = collect_ranked(await session.execute(query))
+    else:
+        users = list(await session.scalars(query))
+    return [UserRecord.model_validate(item) for item in users]
 
 
 async def get_user(*, session: AsyncSession, user_id: UUID) -> UserRecord:
@@ -59,9 +75,14 @@ async def update_user(*, session: AsyncSession, user_id: UUID, payload: UserUpda
         )
         if login_conflict is not None:
             raise EntityConflictError("User login")
+    role_changed = "role" in update_data and update_data["role"] != user.role
+    password_changed = "password_hash" in update_data and update_data["password_hash"] != user.password_hash
     for attribute, value in update_data.items():
         setattr(user, attribute, value)
+    if role_changed or password_changed:
+        await revoke_user_tokens(session=session, user=user, revoke_refresh_tokens=password_changed)
     await session.commit()
+    await invalidate_cached_user(user_id=user_id)
     await session.refresh(user)
     return UserRecord.model_validate(user)
 
@@ -69,8 +90,10 @@ async def update_user(*, session: AsyncSession, user_id: UUID, payload: UserUpda
 async def delete_user(*, session: AsyncSession, user_id: UUID) -> UserRecord:
     user = await load_entity(session=session, model=User, entity_id=user_id, entity_label="User")
     record = UserRecord.model_validate(user)
+    await revoke_deleted_user_tokens(session=session, user=user)
     await session.delete(user)
     await session.commit()
+    await invalidate_cached_user(user_id=user_id)
     return record
 
 
@@ -115,6 +138,7 @@ async def list_user_profiles(
         model=UserProfile,
         offset=params.offset,
         limit=params.limit,
+        cursor=params.cursor,
     )
     return [UserProfileRecord.model_validate(item) for item in profiles]
 
@@ -1,15 +1,35 @@
-from typing import TypeVar
+import base64
+import binascii
+import datetime
+import hashlib
+import json
+from collections.abc import Iterable, Sequence
+from typing import Any, TypedDict, TypeVar
 from uuid import UUID
 
-from sqlalchemy import select
+from pydantic import BaseModel
+from sqlalchemy import Row, Select, func, or_, select, tuple_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm.interfaces import ORMOption
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.elements import ColumnElement
 
 from core.table import Base
-from services.exceptions import EntityNotFoundError
+from services.exceptions import EntityNotFoundError, InvalidStateError
 
 
 ModelType = TypeVar("ModelType", bound=Base)
 
+UNIQUE_VIOLATION = "23505"
+EXCLUSION_VIOLATION = "23P01"
+SEARCH_RANK_LABEL = "search_rank"
+
+
+class ResourceVersion(TypedDict):
+    etag: str
+    last_modified: datetime.datetime | None
+    row_count: int
+
 
 async def load_entity(
     *,
@@ -17,21 +37,155 @@ async def load_entity(
     model: type[ModelType],
     entity_id: UUID,
     entity_label: str | None = None,
+    options: Sequence[ORMOption] = (),
 ) -> ModelType:
-    instance = await session.get(model, entity_id)
+    instance = await session.get(model, entity_id, options=options)
     if instance is None:
         label = entity_label or model.__name__
         raise EntityNotFoundError(label)
     return instance
 
 
+def is_constraint_violation(exc: IntegrityError, *, sqlstate: str) -> bool:
+    return getattr(exc.orig, "sqlstate", None) == sqlstate
+
+
 async def list_entities(
     *,
     session: AsyncSession,
     model: type[ModelType],
     offset: int,
     limit: int,
+    cursor: str | None = None,
 ) -> list[ModelType]:
-    result = await session.scalars(select(model).offset(offset).limit(limit))
+    query = apply_keyset_pagination(
+        select(model),
+        model=model,
+        cursor=cursor,
+        offset=offset,
+        limit=limit,
+    )
+    result = await session.scalars(query)
     return list(result)
 
+
+def apply_fuzzy_search(
+    query: Select,
+    *,
+    column: ColumnElement[str],
+    term: str,
+) -> tuple[Select, ColumnElement[float]]:
+    # Подстроку (ILIKE) и опечатки (оператор % из pg_trgm) обслуживает один GIN-индекс gin_trgm_ops.
+    similarity = func.similarity(column, term)
+    query = query.add_columns(similarity.label(SEARCH_RANK_LABEL)).where(
+        or_(column.ilike(f"%{escape_like(term)}%", escape="\\"), column.op("%")(term))
+    )
+    return query, similarity
+
+
+def escape_like(term: str) -> str:
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def collect_ranked(rows: Iterable[Row[Any]]) -> list[Any]:
+    entities = []
+    for entity, search_rank in rows:
+        setattr(entity, SEARCH_RANK_LABEL, search_rank)
+        entities.append(entity)
+    return entities
+
+
+def apply_keyset_pagination(
+    query: Select,
+    *,
+    model: type[Base],
+    cursor: str | None,
+    offset: int,
+    limit: int,
+    leading_columns: Sequence[ColumnElement[Any]] = (),
+) -> Select:
+    # Страницы идут от новых к старым по (created_at, id); курсор — ключ последней строки предыдущей страницы.
+    sort_columns = [*leading_columns, model.created_at, model.id]
+    if cursor is not None:
+        cursor_values = decode_cursor(cursor, size=len(sort_columns))
+        query = query.where(tuple_(*sort_columns) < tuple_(*cursor_values))
+        if not leading_columns:
+            # Дублирует сравнение кортежей, но в отличие от него понятно отсечению секций по created_at.
+            query = query.where(model.created_at <= cursor_values[-2])
+    return query.order_by(*(column.desc() for column in sort_columns)).offset(offset).limit(limit)
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    serialized = [
+        value.isoformat() if isinstance(value, datetime.datetime) else str(value) if isinstance(value, UUID) else value
+        for value in values
+    ]
+    raw = json.dumps(serialized, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, *, size: int) -> list[Any]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        if not isinstance(values, list) or len(values) != size:
+            raise ValueError("cursor size mismatch")
+        *leading_values, created_at, entity_id = values
+        return [
+            *(float(value) for value in leading_values),
+            datetime.datetime.fromisoformat(created_at),
+            UUID(entity_id),
+        ]
+    except (ValueError, TypeError, UnicodeError, binascii.Error) as exc:
+        raise InvalidStateError("Invalid cursor") from exc
+
+
+def build_next_cursor(
+    items: Sequence[Any],
+    *,
+    limit: int,
+    leading_attributes: Sequence[str] = (),
+) -> str | None:
+    if len(items) < limit:
+        return None
+    last_item = items[-1]
+    leading_values = [getattr(last_item, attribute) for attribute in leading_attributes]
+    return encode_cursor([*leading_values, last_item.created_at, last_item.id])
+
+
+def row_version(*models: type[Base]) -> ColumnElement[str]:
+    return func.concat_ws(
+        ":",
+        *(part for model in models for part in (model.id, func.coalesce(model.updated_at, model.created_at))),
+    )
+
+
+def version_checksum(version: ColumnElement[str]) -> ColumnElement[int]:
+    # xor хэшей не зависит от порядка строк и меняется при вставке, удалении или правке любой из них.
+    # Одного max(updated_at) мало: updated_at — время начала транзакции, и долгая транзакция может
+    # закоммитить правку со временем меньше уже отданного максимума.
+    return func.coalesce(func.bit_xor(func.hashtextextended(version, 0)), 0)
+
+
+async def load_resource_version(
+    *,
+    session: AsyncSession,
+    query: Select,
+    model: type[Base],
+    scope: BaseModel,
+    dependencies: Sequence[ColumnElement[Any]] = (),
+) -> ResourceVersion:
+    # Тот же запрос с теми же фильтрами и пагинацией, но вместо строк — только их версии, без загрузки связей.
+    modified_at = func.coalesce(model.updated_at, model.created_at)
+    versions = query.with_only_columns(
+        func.concat_ws(":", row_version(model), *dependencies).label("version"),
+        modified_at.label("modified_at"),
+    ).subquery()
+    row_count, last_modified, checksum = (
+        await session.execute(
+            select(func.count(), func.max(versions.c.modified_at), version_checksum(versions.c.version))
+        )
+    ).one()
+    fingerprint = f"{type(scope).__name__}:{scope.model_dump_json()}:{row_count}:{last_modified}:{checksum}"
+    digest = hashlib.blake2b(fingerprint.encode("utf-8"), digest_size=16).hexdigest()
+    return {"etag": f'W/"{digest}"', "last_modified": last_modified, "row_count": row_count}
@@ -0,0 +1,228 @@
+import argparse
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.config import settings
+from core.database import sessionmanager
+from core.enums import JobKind
+from models.job import Job
+from services.auth import prune_auth_tokens
+from services.events import notify_students_about_event, reconcile_registered_counts
+from services.jobs import claim_jobs, complete_job, enqueue_unique_job, fail_job, start_job
+from services.notification_partitions import archive_notification_partitions, create_notification_partitions
+from services.notifications import (
+    deliver_pending_broadcasts,
+    deliver_pending_notifications,
+    reconcile_notification_counters,
+)
+from services.telegram import TelegramClient
+
+
+logger = logging.getLogger("worker")
+
+JobHandler = Callable[[AsyncSession, dict[str, Any]], Awaitable[None]]
+
+
+async def handle_new_event_notifications(session: AsyncSession, payload: dict[str, Any]) -> None:
+    await notify_students_about_event(session=session, event_id=UUID(payload["event_id"]))
+
+
+async def handle_reconcile_registered_counts(session: AsyncSession, payload: dict[str, Any]) -> None:
+    repaired_count = await reconcile_registered_counts(session=session)
+    if repaired_count:
+        logger.warning("Repaired registered_count drift on %s events", repaired_count)
+
+
+async def handle_prune_auth_tokens(session: AsyncSession, payload: dict[str, Any]) -> None:
+    pruned_count = await prune_auth_tokens(session=session)
+    logger.info("Pruned %s expired refresh tokens and revocations", pruned_count)
+
+
+async def handle_reconcile_notification_counters(session: AsyncSession, payload: dict[str, Any]) -> None:
+    repaired_count = await reconcile_notification_counters(session=session)
+    if repaired_count:
+        logger.warning("Repaired unread counter drift for %s users", repaired_count)
+
+
+async def handle_create_notification_partitions(session: AsyncSession, payload: dict[str, Any]) -> None:
+    created = await create_notification_partitions(
+        session=session,
+        months_ahead=settings.notification_partition_months_ahead,
+    )
+    if created:
+        logger.info("Created notification partitions %s", ", ".join(created))
+
+
+async def handle_archive_notification_partitions(session: AsyncSession, payload: dict[str, Any]) -> None:
+    archived_count = await archive_notification_partitions(
+        session=session,
+        retention_months=settings.notification_retention_months,
+        archive_dir=settings.notification_archive_dir,
+    )
+    if archived_count:
+        logger.info("Archived %s read notifications past retention", archived_count)
+
+
+JOB_HANDLERS: dict[JobKind, JobHandler] = {
+    JobKind.NEW_EVENT_NOTIFICATIONS: handle_new_event_notifications,
+    JobKind.RECONCILE_REGISTERED_COUNTS: handle_reconcile_registered_counts,
+    JobKind.PRUNE_AUTH_TOKENS: handle_prune_auth_tokens,
+    JobKind.RECONCILE_NOTIFICATION_COUNTERS: handle_reconcile_notification_counters,
+    JobKind.CREATE_NOTIFICATION_PARTITIONS: handle_create_notification_partitions,
+    JobKind.ARCHIVE_NOTIFICATION_PARTITIONS: handle_archive_notification_partitions,
+}
+
+PERIODIC_JOBS: dict[JobKind, float] = {
+    JobKind.RECONCILE_REGISTERED_COUNTS: settings.registered_count_reconcile_interval_seconds,
+    JobKind.PRUNE_AUTH_TOKENS: settings.auth_token_prune_interval_seconds,
+    JobKind.RECONCILE_NOTIFICATION_COUNTERS: settings.notification_counter_reconcile_interval_seconds,
+    JobKind.CREATE_NOTIFICATION_PARTITIONS: settings.notification_partition_interval_seconds,
+    JobKind.ARCHIVE_NOTIFICATION_PARTITIONS: settings.notification_archive_interval_seconds,
+}
+
+
+async def run_job(job: Job) -> None:
+    if sessionmanager.session_maker is None:
+        raise RuntimeError("Database sessionmaker is not initialized")
+    handler = JOB_HANDLERS.get(job.kind)
+    async with sessionmanager.session_maker() as session:
+        if not await start_job(session=session, job=job):
+            logger.warning("Job %s (%s) was reclaimed by another worker, skipping", job.id, job.kind.value)
+            return
+        try:
+            if handler is None:
+                raise RuntimeError(f"No handler registered for job kind {job.kind.value}")
+            # Записи обработчика и отметка о выполнении коммитятся одной транзакцией. Если блокировка истекла и задачу
+            # перехватили, отметка не совпадёт с владельцем, и записи этого запуска откатываются.
+            await handler(session, job.payload)
+            if not await complete_job(session=session, job=job):
+                await session.rollback()
+                logger.warning("Job %s (%s) was reclaimed while running, discarding result", job.id, job.kind.value)
+                return
+            await session.commit()
+        except Exception as exc:
+            await session.rollback()
+            logger.exception("Job %s (%s) failed on attempt %s", job.id, job.kind.value, job.attempts)
+            await fail_job(session=session, job=job, error=repr(exc))
+
+
+async def run_worker_loop(*, worker_index: int, batch_size: int, poll_interval: float, stop: asyncio.Event) -> None:
+    if sessionmanager.session_maker is None:
+        raise RuntimeError("Database sessionmaker is not initialized")
+    while not stop.is_set():
+        try:
+            async with sessionmanager.session_maker() as session:
+                jobs = await claim_jobs(session=session, batch_size=batch_size)
+        except Exception:
+            logger.exception("Worker %s failed to claim jobs", worker_index)
+            jobs = []
+        for job in jobs:
+            await run_job(job)
+        if len(jobs) < batch_size:
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+
+async def run_scheduler_loop(*, stop: asyncio.Event) -> None:
+    if sessionmanager.session_maker is None:
+        raise RuntimeError("Database sessionmaker is not initialized")
+    loop = asyncio.get_running_loop()
+    next_run_at = {kind: loop.time() for kind in PERIODIC_JOBS}
+    while not stop.is_set():
+        now = loop.time()
+        due_kinds = [kind for kind, run_at in next_run_at.items() if run_at <= now]
+        if due_kinds:
+            try:
+                async with sessionmanager.session_maker() as session:
+                    for kind in due_kinds:
+                        await enqueue_unique_job(session=session, kind=kind, payload={})
+                    await session.commit()
+            except Exception:
+                logger.exception("Failed to schedule periodic jobs")
+            for kind in due_kinds:
+                next_run_at[kind] = now + PERIODIC_JOBS[kind]
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=max(min(next_run_at.values()) - loop.time(), 0))
+        except asyncio.TimeoutError:
+            pass
+
+
+async def run_telegram_delivery_loop(*, client: TelegramClient, stop: asyncio.Event) -> None:
+    if sessionmanager.session_maker is None:
+        raise RuntimeError("Database sessionmaker is not initialized")
+    while not stop.is_set():
+        try:
+            async with sessionmanager.session_maker() as session:
+                processed = await deliver_pending_notifications(
+                    session=session,
+                    client=client,
+                    batch_size=settings.telegram_batch_size,
+                )
+                processed += await deliver_pending_broadcasts(
+                    session=session,
+                    client=client,
+                    batch_size=settings.telegram_batch_size,
+                )
+        except Exception:
+            logger.exception("Telegram delivery batch failed")
+            processed = 0
+        if processed < settings.telegram_batch_size:
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=settings.telegram_poll_interval_seconds)
+            except asyncio.TimeoutError:
+                pass
+
+
+async def main_async(*, concurrency: int, batch_size: int, poll_interval: float) -> None:
+    stop = asyncio.Event()
+    logger.info("Starting %s worker loops", concurrency)
+    loops = [
+        run_worker_loop(
+            worker_index=index,
+            batch_size=batch_size,
+            poll_interval=poll_interval,
+            stop=stop,
+        )
+        for index in range(concurrency)
+    ]
+    loops.append(run_scheduler_loop(stop=stop))
+    telegram_client = None
+    if settings.telegram_bot_token:
+        telegram_client = TelegramClient(token=settings.telegram_bot_token)
+        loops.append(run_telegram_delivery_loop(client=telegram_client, stop=stop))
+    else:
+        logger.info("TELEGRAM_BOT_TOKEN is not set, Telegram delivery is disabled")
+    try:
+        await asyncio.gather(*loops)
+    finally:
+        stop.set()
+        if telegram_client is not None:
+            await telegram_client.aclose()
+        await sessionmanager.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run background job workers.")
+    parser.add_argument("--concurrency", type=int, default=settings.worker_concurrency)
+    parser.add_argument("--batch-size", type=int, default=settings.worker_batch_size)
+    parser.add_argument("--poll-interval", type=float, default=settings.worker_poll_interval_seconds)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s [%(name)s] %(message)s")
+    asyncio.run(
+        main_async(
+            concurrency=args.concurrency,
+            batch_size=args.batch_size,
+            poll_interval=args.poll_interval,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()